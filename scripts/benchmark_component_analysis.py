@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+单文件组件分析性能测试脚本
+生成若干典型的 Vue2 / Vue3 <script setup> / TSX 组件文件，
+测量 ComponentFinder._analyze_component_file 的单文件耗时；
+指定 --baseline 时同时加载某个 git 版本的实现进行对比
+"""
+
+import sys
+import time
+import types
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from frontend_dev_assistant.component_finder import ComponentFinder
+
+FINDER_SOURCE = "src/frontend_dev_assistant/component_finder.py"
+
+VUE2_TEMPLATE = """<template>
+  <div class="user-table">
+    <!-- 用户列表表格，支持分页和批量选择 -->
+    <el-table :data="rows" @selection-change="onSelect">
+{rows}
+    </el-table>
+    <el-pagination :total="total" @current-change="$emit('page-change', $event)" />
+    <slot name="footer"></slot>
+    <slot></slot>
+  </div>
+</template>
+
+<script>
+/**
+ * 用户列表表格组件，支持分页、排序和批量操作
+ */
+export default {{
+  name: 'UserTable',
+  props: {{
+    rows: {{ type: Array, required: true }},
+    total: {{ type: Number, default: 0 }},
+    loading: Boolean,
+    title: {{ type: String, default: '用户列表' }}
+  }},
+  emits: ['select', 'page-change'],
+  data() {{
+    return {{ selected: [] }}
+  }},
+  computed: {{
+    hasSelection() {{ return this.selected.length > 0 }}
+  }},
+  watch: {{
+    rows() {{ this.selected = [] }}
+  }},
+  methods: {{
+{methods}
+    onSelect(items) {{
+      this.selected = items
+      this.$emit('select', items)
+    }}
+  }}
+}}
+</script>
+
+<style scoped>
+.user-table {{ position: relative; }}
+{styles}
+</style>
+"""
+
+VUE3_SETUP = """<template>
+  <el-dialog v-model="visible" :title="title" @close="emit('close')">
+    <el-form :model="form">
+{fields}
+    </el-form>
+    <template #footer>
+      <el-button @click="emit('cancel')">取消</el-button>
+      <el-button type="primary" @click="submit">确定</el-button>
+    </template>
+  </el-dialog>
+</template>
+
+<script setup lang="ts">
+import {{ ref, computed, watch }} from 'vue'
+
+interface FormState {{
+  name: string
+  email: string
+}}
+
+const props = defineProps({{
+  modelValue: {{ type: Boolean, required: true }},
+  title: {{ type: String, default: '编辑' }},
+  record: Object
+}})
+const emit = defineEmits(['update:modelValue', 'close', 'cancel', 'submit'])
+
+const visible = computed({{
+  get: () => props.modelValue,
+  set: (v: boolean) => emit('update:modelValue', v)
+}})
+const form = ref<FormState>({{ name: '', email: '' }})
+
+{functions}
+
+async function submit() {{
+  await Promise.resolve()
+  emit('submit', form.value)
+}}
+</script>
+
+<style scoped lang="scss">
+.dialog {{ z-index: 2000; }}
+{styles}
+</style>
+"""
+
+TSX_COMPONENT = """import React, {{ useState }} from 'react'
+
+// 通用的下拉选择组件，支持搜索与多选
+interface SelectProps {{
+  options: string[]
+  value?: string
+  onChange?: (value: string) => void
+}}
+
+{helpers}
+
+export default function SearchSelect(props: SelectProps) {{
+  const [query, setQuery] = useState('')
+  return <div className="search-select">
+    <input value={{query}} onChange={{e => setQuery(e.target.value)}} />
+    <ul>{{props.options.map(o => <li key={{o}} onClick={{() => props.onChange?.(o)}}>{{o}}</li>)}}</ul>
+  </div>
+}}
+"""
+
+
+def generate_samples(root: Path, size: int):
+    """生成不同风格的示例组件，size 控制文件长度"""
+    comp_dir = root / "src" / "components"
+    comp_dir.mkdir(parents=True)
+
+    rows = "\n".join(
+        f'      <el-table-column prop="field{i}" label="字段{i}" sortable />' for i in range(size)
+    )
+    methods = "\n".join(
+        f"    handle{i}(value) {{ return this.rows.filter(r => r.field{i} === value) }}," for i in range(size)
+    )
+    styles = "\n".join(f".col-{i} {{ width: {i + 10}px; }}" for i in range(size))
+    fields = "\n".join(
+        f'      <el-form-item label="字段{i}"><el-input v-model="form.field{i}" /></el-form-item>'
+        for i in range(size)
+    )
+    functions = "\n".join(
+        f"function validate{i}(value: string): boolean {{ return value.length > {i} }}" for i in range(size)
+    )
+    helpers = "\n".join(
+        f"const format{i} = (value: string) => value.trim().slice(0, {i + 1})" for i in range(size)
+    )
+
+    files = []
+    samples = {
+        "UserTable.vue": VUE2_TEMPLATE.format(rows=rows, methods=methods, styles=styles),
+        "EditDialog.vue": VUE3_SETUP.format(fields=fields, functions=functions, styles=styles),
+        "SearchSelect.tsx": TSX_COMPONENT.format(helpers=helpers),
+    }
+    for name, source in samples.items():
+        file_path = comp_dir / name
+        file_path.write_text(source, encoding="utf-8")
+        files.append(file_path)
+    return files
+
+
+def load_baseline(revision: str):
+    """从 git 历史中加载指定版本的 ComponentFinder"""
+    source = subprocess.run(
+        ["git", "show", f"{revision}:{FINDER_SOURCE}"],
+        cwd=project_root, capture_output=True, text=True, check=True
+    ).stdout
+
+    module = types.ModuleType("frontend_dev_assistant._baseline_component_finder")
+    module.__package__ = "frontend_dev_assistant"
+    exec(compile(source, f"{revision}:{FINDER_SOURCE}", "exec"), module.__dict__)
+    return module.ComponentFinder
+
+
+def make_finder(finder_cls):
+    """兼容不同版本的构造参数"""
+    try:
+        return finder_cls(data_dir=Path(tempfile.gettempdir()), use_index=False)
+    except TypeError:
+        return finder_cls()
+
+
+def as_dict(component) -> dict:
+    """统一转换为字典比较（新版本返回组件记录，旧版本返回字典）"""
+    if component is None:
+        return {}
+    return component.to_dict() if hasattr(component, "to_dict") else component
+
+
+def time_analysis(finder, files, iterations: int) -> float:
+    """返回单文件平均耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for file_path in files:
+            finder._analyze_component_file(file_path)
+    return (time.perf_counter() - start) / (iterations * len(files)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="单文件组件分析性能测试")
+    parser.add_argument("--size", type=int, default=40, help="示例组件的规模（行数量级）")
+    parser.add_argument("--iterations", type=int, default=200, help="重复次数")
+    parser.add_argument("--baseline", help="对比的 git 版本（如 HEAD~1 或提交哈希）")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="fda-analysis-"))
+    try:
+        files = generate_samples(root, args.size)
+        total_bytes = sum(f.stat().st_size for f in files)
+        print(f"📄 示例文件: {len(files)} 个, 平均 {total_bytes // len(files)} 字节")
+
+        current = make_finder(ComponentFinder)
+        current_us = time_analysis(current, files, args.iterations)
+        print(f"   当前实现:   {current_us:8.1f} µs/文件")
+
+        if args.baseline:
+            baseline = make_finder(load_baseline(args.baseline))
+            baseline_us = time_analysis(baseline, files, args.iterations)
+            print(f"   {args.baseline}: {baseline_us:8.1f} µs/文件")
+            print(f"   提速:       {baseline_us / current_us:8.1f}x")
+
+            for file_path in files:
+                before = as_dict(baseline._analyze_component_file(file_path))
+                after = as_dict(current._analyze_component_file(file_path))
+                changed = sorted(
+                    key for key in set(before) | set(after)
+                    if before.get(key) != after.get(key) and key != "modified_time"
+                )
+                if changed:
+                    print(f"   ℹ️  {file_path.name} 提取结果有变化的字段: {', '.join(changed)}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+组件查找全流程性能基准
+生成包含 Vue2、Vue3 <script setup> 和 TSX 组件的模拟 monorepo（带 node_modules、dist 等噪声目录），
+分别计时 find_reusable_components 的各个阶段：文件发现、读取、分析、打分、格式化，
+并测量冷/热索引下的端到端耗时。结果写入 JSON，便于在不同提交之间对比
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from pathlib import Path
+from datetime import datetime
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from frontend_dev_assistant.component_finder import ComponentFinder
+from frontend_dev_assistant.component_search import ComponentSearchIndex
+
+STYLES = ("vue2", "vue3", "tsx")
+
+# 各个包使用的组件风格
+PACKAGES = {
+    "legacy-admin": "vue2",
+    "web-app": "vue3",
+    "design-system": "vue3",
+    "react-widgets": "tsx",
+}
+
+DOMAINS = ["User", "Order", "Product", "Invoice", "Report", "Account", "Payment", "Message",
+           "Project", "Task", "Team", "Customer", "Coupon", "Address", "Article", "Comment"]
+KINDS = ["Table", "Form", "Dialog", "Card", "Button", "Nav", "List", "Select", "Panel", "Upload",
+         "Filter", "Editor", "Viewer", "Tabs", "Menu", "Badge"]
+
+# 打分阶段使用的查询：(组件类型, 关键词)
+QUERIES = [
+    ("table", None),
+    (None, ["user"]),
+    ("form", ["order", "edit"]),
+    (None, ["dialgo"]),
+    ("modal", ["payment", "confirm"]),
+]
+
+VUE2_SOURCE = """<template>
+  <div class="{kebab}">
+    <!-- {domain}{kind}：{domain_lower} 相关的{kind_lower}组件 -->
+    <el-table v-if="mode === 'table'" :data="items" @row-click="$emit('select', $event)">
+      <el-table-column v-for="col in columns" :key="col.prop" :prop="col.prop" :label="col.label" />
+    </el-table>
+    <el-form v-else :model="form" @submit.native.prevent="submit">
+      <el-form-item label="名称"><el-input v-model="form.name" /></el-form-item>
+    </el-form>
+    <slot name="footer"></slot>
+  </div>
+</template>
+
+<script>
+export default {{
+  name: '{name}',
+  props: {{
+    items: {{ type: Array, default: () => [] }},
+    mode: {{ type: String, default: 'table' }},
+    {domain_lower}Id: {{ type: Number, required: true }},
+    disabled: Boolean
+  }},
+  data() {{
+    return {{ form: {{ name: '' }}, columns: [] }}
+  }},
+  computed: {{
+    isEmpty() {{ return this.items.length === 0 }}
+  }},
+  methods: {{
+    submit() {{
+      this.$emit('submit', this.form)
+    }}
+  }}
+}}
+</script>
+
+<style scoped>
+.{kebab} {{ padding: 16px; }}
+</style>
+"""
+
+VUE3_SOURCE = """<template>
+  <el-dialog v-model="visible" :title="title" @close="emit('close')">
+    <el-form :model="form">
+      <el-form-item label="{domain}"><el-input v-model="form.name" /></el-form-item>
+    </el-form>
+    <template #footer>
+      <el-button @click="emit('cancel')">取消</el-button>
+      <el-button type="primary" @click="submit">确定</el-button>
+    </template>
+  </el-dialog>
+</template>
+
+<script setup lang="ts">
+/**
+ * {domain}{kind} 组件，用于{domain_lower}的{kind_lower}场景
+ */
+import {{ ref, computed }} from 'vue'
+
+const props = defineProps({{
+  modelValue: {{ type: Boolean, required: true }},
+  title: {{ type: String, default: '{domain}' }},
+  {domain_lower}: Object
+}})
+const emit = defineEmits(['update:modelValue', 'close', 'cancel', 'submit'])
+
+const visible = computed({{
+  get: () => props.modelValue,
+  set: (v: boolean) => emit('update:modelValue', v)
+}})
+const form = ref({{ name: '' }})
+
+async function submit() {{
+  await Promise.resolve()
+  emit('submit', form.value)
+}}
+</script>
+
+<style scoped lang="scss">
+.dialog {{ z-index: 2000; }}
+</style>
+"""
+
+TSX_SOURCE = """import React, {{ useState }} from 'react'
+
+// {domain}{kind}：{domain_lower} 相关的{kind_lower}组件
+interface {name}Props {{
+  items: string[]
+  onSelect?: (value: string) => void
+}}
+
+export default function {name}(props: {name}Props) {{
+  const [query, setQuery] = useState('')
+  return <div className="{kebab}">
+    <input value={{query}} onChange={{e => setQuery(e.target.value)}} />
+    <ul>{{props.items.map(item => <li key={{item}} onClick={{() => props.onSelect?.(item)}}>{{item}}</li>)}}</ul>
+  </div>
+}}
+"""
+
+NOISE_VUE = "<template><div class=\"vendor\"><slot /></div></template>\n<script>export default {}</script>\n"
+NOISE_JS = "module.exports = function noop() { return null }\n"
+
+
+def render_component(style: str, domain: str, kind: str, name: str) -> str:
+    """生成单个组件源码"""
+    values = {
+        "name": name,
+        "domain": domain,
+        "kind": kind,
+        "domain_lower": domain.lower(),
+        "kind_lower": kind.lower(),
+        "kebab": f"{domain.lower()}-{kind.lower()}",
+    }
+    if style == "vue2":
+        return VUE2_SOURCE.format(**values)
+    if style == "vue3":
+        return VUE3_SOURCE.format(**values)
+    return TSX_SOURCE.format(**values)
+
+
+def generate_monorepo(root: Path, components: int, noise_ratio: float, seed: int) -> dict:
+    """
+    生成模拟 monorepo：packages/<包>/src/components 下的组件，
+    外加根目录与各包的 node_modules、dist 噪声文件
+
+    Returns:
+        各风格组件数与噪声文件数
+    """
+    rng = random.Random(seed)
+    packages = list(PACKAGES.items())
+    counts = {style: 0 for style in STYLES}
+
+    for i in range(components):
+        package, style = packages[i % len(packages)]
+        domain = rng.choice(DOMAINS)
+        kind = rng.choice(KINDS)
+        name = f"{domain}{kind}{i}"
+        ext = ".tsx" if style == "tsx" else ".vue"
+
+        comp_dir = root / "packages" / package / "src" / "components" / domain.lower()
+        comp_dir.mkdir(parents=True, exist_ok=True)
+        (comp_dir / f"{name}{ext}").write_text(render_component(style, domain, kind, name), encoding="utf-8")
+        counts[style] += 1
+
+        # 组件目录下的非组件脚本（会被发现并分析，但不是UI组件）
+        if i % 5 == 0:
+            (comp_dir / f"use{name}.ts").write_text(f"export const use{name} = () => null\n", encoding="utf-8")
+
+    # node_modules 与构建产物噪声（其中也包含 .vue 文件，必须被排除）
+    noise_files = int(components * noise_ratio)
+    noise_dirs = [root / "node_modules"] + [root / "packages" / package / "node_modules" for package in PACKAGES]
+    for n in range(noise_files):
+        base = noise_dirs[n % len(noise_dirs)]
+        pkg_dir = base / f"vendor-lib{n % 97}" / "lib" / "components"
+        pkg_dir.mkdir(parents=True, exist_ok=True)
+        if n % 3 == 0:
+            (pkg_dir / f"Vendor{n}.vue").write_text(NOISE_VUE, encoding="utf-8")
+        else:
+            (pkg_dir / f"vendor{n}.js").write_text(NOISE_JS, encoding="utf-8")
+
+    for package in PACKAGES:
+        dist_dir = root / "packages" / package / "dist" / "components"
+        dist_dir.mkdir(parents=True, exist_ok=True)
+        for n in range(max(1, components // 100)):
+            (dist_dir / f"Bundle{n}.vue").write_text(NOISE_VUE, encoding="utf-8")
+
+    return {"components": counts, "noise_files": noise_files}
+
+
+def timed(func, *args, **kwargs):
+    """执行并返回 (结果, 耗时秒)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_phases(finder: ComponentFinder, root: Path) -> dict:
+    """分阶段计时一次完整的组件查找"""
+    phases = {}
+
+    # 1. 文件发现
+    files, phases["discovery"] = timed(finder._find_component_files, root)
+
+    # 2. 读取（stat + 读取文件内容）
+    def read_all():
+        contents = []
+        total_bytes = 0
+        for file_path in files:
+            try:
+                file_stat = file_path.stat()
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            total_bytes += file_stat.st_size
+            contents.append((file_path, content, file_stat))
+        return contents, total_bytes
+
+    (contents, total_bytes), phases["read"] = timed(read_all)
+
+    # 3. 分析（只计提取，不含读取）
+    def analyze_all():
+        per_style = {}
+        components = []
+        for file_path, content, file_stat in contents:
+            start = time.perf_counter()
+            component = finder._analyze_component_content(file_path, content, file_stat)
+            elapsed = time.perf_counter() - start
+            style = "tsx" if file_path.suffix == ".tsx" else ("vue3" if "setup" in content[:2048] else "vue2")
+            if file_path.suffix in (".js", ".ts"):
+                style = "script"
+            bucket = per_style.setdefault(style, {"files": 0, "seconds": 0.0})
+            bucket["files"] += 1
+            bucket["seconds"] += elapsed
+            if component:
+                components.append(component)
+        return components, per_style
+
+    (components, per_style), phases["analysis"] = timed(analyze_all)
+
+    # 4. 打分（建立倒排索引 + 逐个查询）
+    search_index, index_seconds = timed(ComponentSearchIndex, components)
+    query_results = []
+    query_seconds = 0.0
+    for component_type, keywords in QUERIES:
+        (page, total), elapsed = timed(
+            finder._intelligent_component_filter, components, component_type, keywords, search_index
+        )
+        query_seconds += elapsed
+        query_results.append({
+            "component_type": component_type,
+            "keywords": keywords,
+            "matches": total,
+            "seconds": round(elapsed, 6),
+        })
+        last_page = page
+    phases["scoring"] = index_seconds + query_seconds
+
+    # 5. 格式化（最后一个查询的结果页）
+    _, phases["formatting"] = timed(
+        finder._format_component_suggestions, last_page or [(component, 0.0) for component in components[:8]]
+    )
+
+    return {
+        "phases": {name: round(seconds, 6) for name, seconds in phases.items()},
+        "counts": {
+            "files_discovered": len(files),
+            "files_read": len(contents),
+            "bytes_read": total_bytes,
+            "components": len(components),
+        },
+        "analysis_by_style": {
+            style: {
+                "files": bucket["files"],
+                "us_per_file": round(bucket["seconds"] / bucket["files"] * 1e6, 1),
+            }
+            for style, bucket in sorted(per_style.items())
+        },
+        "scoring_detail": {
+            "search_index_build": round(index_seconds, 6),
+            "queries": query_results,
+        },
+    }
+
+
+def run_end_to_end(root: Path, data_dir: Path) -> dict:
+    """
+    端到端耗时：首次查询（冷索引，完整分析）与再次查询（热索引），
+    以及开启两阶段分析时的首次查询（只完整分析预筛选出的候选文件）
+    """
+    finder = ComponentFinder(data_dir=data_dir / "full", lazy_analysis=False)
+    try:
+        _, cold = timed(asyncio.run, finder.find_reusable_components(str(root), "table", ["user"]))
+        _, warm = timed(asyncio.run, finder.find_reusable_components(str(root), "table", ["user"]))
+        _, browse = timed(asyncio.run, finder.find_reusable_components(str(root)))
+    finally:
+        finder.shutdown()
+
+    lazy_finder = ComponentFinder(data_dir=data_dir / "lazy", lazy_analysis=True)
+    try:
+        _, cold_lazy = timed(asyncio.run, lazy_finder.find_reusable_components(str(root), "table", ["user"]))
+    finally:
+        # 等后台补全组件索引结束再关闭，避免删除模拟项目时仍在分析
+        lazy_finder._get_scan_executor().shutdown(wait=True)
+        lazy_finder.shutdown()
+    return {
+        "cold_index": round(cold, 6),
+        "warm_index": round(warm, 6),
+        "browse_first_page": round(browse, 6),
+        "cold_lazy": round(cold_lazy, 6)
+    }
+
+
+def git_revision() -> str:
+    """当前提交（不在 git 仓库中时返回 unknown）"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(previous: dict, current: dict) -> None:
+    """打印与上一次结果的各阶段耗时对比"""
+    previous_runs = {run["size"]: run for run in previous.get("runs", [])}
+    print(f"\n📊 与 {previous.get('revision', '?')} 对比（>1 表示变慢）")
+    for run in current["runs"]:
+        before = previous_runs.get(run["size"])
+        if not before:
+            continue
+        ratios = []
+        for section in ("phases", "end_to_end"):
+            for name, seconds in run[section].items():
+                old = before.get(section, {}).get(name)
+                if old:
+                    ratios.append(f"{name} {seconds / old:.2f}x")
+        print(f"   {run['size']:>6} 组件: " + ", ".join(ratios))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="组件查找全流程性能基准")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="组件数量，逗号分隔")
+    parser.add_argument("--noise", type=float, default=2.0, help="node_modules 噪声文件数与组件数之比")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--output", help="结果 JSON 路径（默认 benchmark-<提交>.json）")
+    parser.add_argument("--compare", help="上一次的结果 JSON，打印各阶段耗时比值")
+    parser.add_argument("--work-dir", help="生成模拟项目的目录（默认系统临时目录）")
+    parser.add_argument("--keep", action="store_true", help="保留生成的模拟项目")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    revision = git_revision()
+    report = {
+        "revision": revision,
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "runs": [],
+    }
+
+    if args.work_dir:
+        Path(args.work_dir).mkdir(parents=True, exist_ok=True)
+    work_dir = Path(tempfile.mkdtemp(prefix="fda-bench-", dir=args.work_dir))
+    try:
+        for size in sizes:
+            root = work_dir / f"monorepo-{size}"
+            print(f"🏗️  生成 {size} 个组件的模拟 monorepo ...")
+            layout, generate_seconds = timed(generate_monorepo, root, size, args.noise, args.seed)
+
+            finder = ComponentFinder(data_dir=work_dir / f"data-{size}", use_index=False)
+            try:
+                run = run_phases(finder, root)
+            finally:
+                finder.shutdown()
+            run["end_to_end"] = run_end_to_end(root, work_dir / f"data-e2e-{size}")
+            run.update({"size": size, "layout": layout, "generate_seconds": round(generate_seconds, 3)})
+            report["runs"].append(run)
+
+            phases = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in run["phases"].items())
+            e2e = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in run["end_to_end"].items())
+            print(f"   阶段: {phases}")
+            print(f"   端到端: {e2e}")
+
+            if not args.keep:
+                shutil.rmtree(root, ignore_errors=True)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        else:
+            print(f"📁 模拟项目保留在 {work_dir}")
+
+    output = Path(args.output or f"benchmark-{revision}.json")
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n💾 结果已写入 {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
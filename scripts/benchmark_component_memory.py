@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+组件记录内存占用对比脚本
+按提取器的输出格式构造大量组件，分别保存为原来的组件字典和紧凑的组件记录，
+用 tracemalloc 对比两种表示常驻内存时的占用
+"""
+
+import gc
+import sys
+import random
+import argparse
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from frontend_dev_assistant.component_record import ComponentRecord
+
+TYPES = ["form", "table", "modal", "button", "input", "select", "upload", "chart", "component"]
+FEATURES = ["表单验证", "数据表格", "弹窗对话框", "文件上传", "分页功能", "搜索功能", "选择器", "组合式API"]
+PROP_TYPES = ["string", "number", "boolean", "array", "object", "any"]
+EVENTS = ["change", "update:modelValue", "submit", "close", "select", "page-change"]
+SLOTS = ["default", "footer", "header", "actions"]
+
+
+def fresh(text: str) -> str:
+    """构造一个新的字符串对象，模拟每个文件各自解析出的文本"""
+    return "".join(list(text))
+
+
+def generate_extractions(count: int, seed: int):
+    """生成提取器输出：(名称, 路径, 类型, 描述, props, events, slots, features, 大小, 修改时间)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        name = f"Component{i}"
+        props = [
+            {
+                "name": f"field{p}",
+                "type": fresh(rng.choice(PROP_TYPES)),
+                "required": rng.random() < 0.3,
+                "default": fresh("''") if rng.random() < 0.5 else None
+            }
+            for p in range(rng.randint(0, 8))
+        ]
+        yield (
+            name,
+            f"/workspace/packages/pkg{i % 200}/src/components/{name}.vue",
+            fresh(rng.choice(TYPES)),
+            f"{name} 组件",
+            props,
+            [fresh(event) for event in rng.sample(EVENTS, rng.randint(0, 3))],
+            [fresh(slot) for slot in rng.sample(SLOTS, rng.randint(0, 2))],
+            [fresh(feature) for feature in rng.sample(FEATURES, rng.randint(0, 4))],
+            rng.randint(500, 20000),
+            1700000000.0 + i
+        )
+
+
+def as_legacy_dict(extraction) -> dict:
+    """原来的组件字典格式"""
+    name, file_path, component_type, description, props, events, slots, features, size, mtime = extraction
+    return {
+        "name": name,
+        "file_path": file_path,
+        "relative_path": file_path.lstrip("/"),
+        "type": component_type,
+        "description": description,
+        "props": props,
+        "events": events,
+        "slots": slots,
+        "features": features,
+        "file_size": size,
+        "modified_time": datetime.fromtimestamp(mtime).isoformat()
+    }
+
+
+def as_record(extraction) -> ComponentRecord:
+    """紧凑的组件记录"""
+    name, file_path, component_type, description, props, events, slots, features, size, mtime = extraction
+    return ComponentRecord.create(
+        name=name,
+        file_path=file_path,
+        component_type=component_type,
+        description=description,
+        props=props,
+        events=events,
+        slots=slots,
+        features=features,
+        file_size=size,
+        mtime=mtime
+    )
+
+
+def measure(build, count: int, seed: int) -> int:
+    """构建组件列表并返回其常驻内存（字节），提取器的临时输出不计入"""
+    gc.collect()
+    tracemalloc.start()
+    components = []
+    for extraction in generate_extractions(count, seed):
+        components.append(build(extraction))
+        del extraction
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del components
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="组件记录内存占用对比")
+    parser.add_argument("--components", type=int, default=50000, help="组件数量")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+
+    print(f"🧮 构造 {args.components} 个组件...")
+    legacy_bytes = measure(as_legacy_dict, args.components, args.seed)
+    record_bytes = measure(as_record, args.components, args.seed)
+
+    print("\n📊 结果")
+    print(f"   组件字典:  {legacy_bytes / 1024 / 1024:8.1f} MB  ({legacy_bytes / args.components:6.0f} B/组件)")
+    print(f"   组件记录:  {record_bytes / 1024 / 1024:8.1f} MB  ({record_bytes / args.components:6.0f} B/组件)")
+    if record_bytes > 0:
+        print(f"   节省:      {1 - record_bytes / legacy_bytes:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+组件文件发现性能对比脚本
+生成一个带有大量 node_modules 文件的模拟项目，
+对比原来的五次 glob 扫描与单次剪枝遍历的耗时
+"""
+
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from frontend_dev_assistant.component_scanner import walk_component_files
+
+LEGACY_PATTERNS = [
+    "**/*.vue",
+    "**/components/**/*.js",
+    "**/components/**/*.ts",
+    "**/components/**/*.jsx",
+    "**/components/**/*.tsx"
+]
+
+LEGACY_EXCLUDES = [
+    "node_modules", ".git", "dist", "build", ".nuxt",
+    ".next", "coverage", ".cache", "tmp", "temp",
+    "__pycache__", ".pytest_cache"
+]
+
+
+def legacy_find_component_files(project_dir: Path):
+    """原实现：五次 glob，事后按子串排除（这里对相对路径判断，避免临时目录名干扰）"""
+    files = set()
+    for pattern in LEGACY_PATTERNS:
+        for file_path in project_dir.glob(pattern):
+            rel = str(file_path.relative_to(project_dir)).lower()
+            if file_path.is_file() and not any(p in rel for p in LEGACY_EXCLUDES):
+                files.add(file_path)
+    return sorted(files)
+
+
+def generate_project(root: Path, components: int, packages: int, files_per_package: int):
+    """生成模拟项目：src 下的组件 + node_modules 噪声"""
+    vue_source = "<template><div/></template>\n<script>export default {}</script>\n"
+
+    for i in range(components):
+        comp_dir = root / "src" / "components" / f"group{i % 50}"
+        comp_dir.mkdir(parents=True, exist_ok=True)
+        (comp_dir / f"Comp{i}.vue").write_text(vue_source, encoding="utf-8")
+        if i % 4 == 0:
+            (comp_dir / f"helper{i}.ts").write_text("export const x = 1\n", encoding="utf-8")
+
+    for p in range(packages):
+        pkg_dir = root / "node_modules" / f"pkg{p}"
+        for f in range(files_per_package):
+            sub = pkg_dir / ("components" if f % 3 == 0 else "lib") / f"d{f % 5}"
+            sub.mkdir(parents=True, exist_ok=True)
+            ext = ".vue" if f % 7 == 0 else ".js"
+            (sub / f"file{f}{ext}").write_text("module.exports = {}\n", encoding="utf-8")
+
+    (root / "dist" / "components").mkdir(parents=True, exist_ok=True)
+    for i in range(min(components, 200)):
+        (root / "dist" / "components" / f"Comp{i}.js").write_text("render()\n", encoding="utf-8")
+
+
+def time_call(func, *args, repeat: int = 3):
+    """返回最短耗时（秒）和结果"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="组件文件发现性能对比")
+    parser.add_argument("--components", type=int, default=1000, help="src 下的组件数量")
+    parser.add_argument("--packages", type=int, default=300, help="node_modules 包数量")
+    parser.add_argument("--files-per-package", type=int, default=60, help="每个包的文件数量")
+    parser.add_argument("--repeat", type=int, default=3, help="每种实现重复次数（取最短）")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="fda-discovery-"))
+    try:
+        print("🏗️  生成模拟项目...")
+        generate_project(root, args.components, args.packages, args.files_per_package)
+        noise = args.packages * args.files_per_package
+        print(f"   组件: {args.components}, node_modules 文件: {noise}")
+
+        legacy_time, legacy_files = time_call(legacy_find_component_files, root, repeat=args.repeat)
+        walker_time, walker_files = time_call(walk_component_files, root, repeat=args.repeat)
+
+        print("\n📊 结果")
+        print(f"   五次 glob:  {legacy_time * 1000:8.1f} ms  ({len(legacy_files)} 个文件)")
+        print(f"   单次遍历:   {walker_time * 1000:8.1f} ms  ({len(walker_files)} 个文件)")
+        if walker_time > 0:
+            print(f"   提速:       {legacy_time / walker_time:8.1f}x")
+        if legacy_files != walker_files:
+            print("⚠️  两种实现找到的文件不一致")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+使用统计性能对比脚本
+向临时数据目录写入大量工具调用记录（默认100万条），
+对比逐条读取全部记录重新统计与合并写入时累加的每日计数的耗时
+"""
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / "src"))
+
+from frontend_dev_assistant.usage_tracker import UsageTracker, RANGE_DAYS
+
+DATE_RANGES = ["today", "week", "month", "all"]
+
+
+def generate_calls(count: int, days: int, tools: int, users: int):
+    """按时间顺序生成调用记录，均匀分布在最近 days 天内"""
+    now = datetime.now()
+    step = timedelta(days=days) / count
+    start = now - step * count
+    for i in range(count):
+        timestamp = start + step * (i + 1)
+        yield {
+            "id": str(i),
+            "tool_name": f"tool{i % tools}",
+            "timestamp": timestamp.isoformat(),
+            "date": timestamp.strftime('%Y-%m-%d'),
+            "arguments": {},
+            "user_id": f"user{i % users}"
+        }
+
+
+def write_calls(tracker: UsageTracker, args) -> None:
+    """按写入队列的批量方式写入记录（写入时累加计数）"""
+    batch = []
+    for event in generate_calls(args.calls, args.days, args.tools, args.users):
+        batch.append(event)
+        if len(batch) >= args.batch:
+            tracker._write_calls(batch)
+            batch = []
+    if batch:
+        tracker._write_calls(batch)
+
+
+def legacy_summary(tracker: UsageTracker, date_range: str):
+    """原实现：读取全部记录，逐条解析时间后过滤并统计"""
+    now = datetime.now()
+    if date_range == "today":
+        since = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    elif date_range in RANGE_DAYS:
+        since = now - timedelta(days=RANGE_DAYS[date_range])
+    else:
+        since = None
+
+    if tracker.store is not None:
+        rows = tracker.store._query("SELECT tool_name, user_id, timestamp FROM usage_logs")
+        events = ({"tool_name": row[0], "user_id": row[1], "timestamp": row[2]} for row in rows)
+    else:
+        events = tracker.event_log.iter_events()
+
+    tool_counts, user_activity = {}, {}
+    for event in events:
+        if since is not None and datetime.fromisoformat(event["timestamp"]) < since:
+            continue
+        tool_counts[event["tool_name"]] = tool_counts.get(event["tool_name"], 0) + 1
+        user_activity[event["user_id"]] = user_activity.get(event["user_id"], 0) + 1
+    return tool_counts, user_activity
+
+
+def time_call(func, *args, repeat: int = 3):
+    """返回最短耗时（秒）和结果"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="使用统计性能对比")
+    parser.add_argument("--calls", type=int, default=1_000_000, help="写入的调用记录数量")
+    parser.add_argument("--days", type=int, default=365, help="记录分布的天数")
+    parser.add_argument("--tools", type=int, default=12, help="工具数量")
+    parser.add_argument("--users", type=int, default=20, help="用户数量")
+    parser.add_argument("--batch", type=int, default=100, help="每批写入的记录数（与写入队列一致）")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json", help="存储后端")
+    parser.add_argument("--repeat", type=int, default=3, help="每种实现重复次数（取最短）")
+    args = parser.parse_args()
+
+    data_dir = Path(tempfile.mkdtemp(prefix="fda-usage-"))
+    os.environ["FRONTEND_DEV_ASSISTANT_DATA_DIR"] = str(data_dir)
+    tracker = UsageTracker(backend=args.backend, retention_days=0)
+    try:
+        print(f"🏗️  写入 {args.calls} 条调用记录（{args.days} 天，{args.backend}）...")
+        write_time, _ = time_call(write_calls, tracker, args, repeat=1)
+        print(f"   写入耗时: {write_time:.1f} s（{write_time / args.calls * 1e6:.1f} µs/条）")
+
+        print("\n📊 结果")
+        print(f"   {'范围':<8}{'逐条统计':>14}{'每日计数':>14}{'提速':>10}")
+        for date_range in DATE_RANGES:
+            legacy_time, _ = time_call(legacy_summary, tracker, date_range, repeat=args.repeat)
+            stats_time, _ = time_call(
+                lambda: asyncio.run(tracker.get_stats(date_range)), repeat=args.repeat
+            )
+            speedup = legacy_time / stats_time if stats_time > 0 else float("inf")
+            print(f"   {date_range:<8}{legacy_time * 1000:>11.1f} ms{stats_time * 1000:>11.1f} ms{speedup:>9.1f}x")
+        print("   （逐条统计只计算调用次数和用户活跃度，每日计数为完整的 get_stats 报告）")
+    finally:
+        tracker.close()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
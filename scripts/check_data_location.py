@@ -55,12 +55,10 @@ def check_data_locations():
             file_size = usage_file.stat().st_size
             print(f"📊 文件大小: {file_size} 字节")
             
-            # 读取并显示基本统计
-            import json
+            # 读取并显示基本统计（调用记录在事件日志中）
             try:
-                with open(usage_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
+                data = tracker._load_usage_data()
+                
                 total_logs = len(data.get('usage_logs', []))
                 total_feedback = len(data.get('user_feedback', []))
                 tools_used = len(data.get('tool_usage', {}))
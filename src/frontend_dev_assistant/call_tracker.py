@@ -15,6 +15,9 @@ from datetime import datetime
 from typing import Dict, Any, Optional, List
 from functools import wraps
 
+from .usage_event_log import archive_by_month
+from .write_behind import WriteBehindQueue
+
 class MCPCallTracker:
     def __init__(self, data_dir: Optional[Path] = None):
         """初始化MCP调用追踪器"""
@@ -26,6 +29,11 @@ class MCPCallTracker:
         self.data_dir.mkdir(exist_ok=True)
         self.calls_file = self.data_dir / "mcp_calls.json"
         self._init_calls_file()
+        
+        # 调用记录由后台线程批量写入，工具调用不等待整个文件的读写
+        self._writer = WriteBehindQueue(
+            "mcp-calls", self._write_calls, spill_path=self.data_dir / "mcp_calls.spill.jsonl"
+        )
     
     def _determine_data_directory(self) -> Path:
         """确定数据保存目录"""
@@ -85,11 +93,11 @@ class MCPCallTracker:
         execution_time: float = 0,
         success: bool = True,
         error_message: Optional[str] = None,
-        result_size: int = 0
+        result_size: int = 0,
+        diagnostics: Optional[Dict[str, Any]] = None
     ):
-        """记录MCP工具调用"""
+        """记录MCP工具调用（diagnostics 为工具自身记录的各阶段耗时和计数，可选；由后台线程批量写入）"""
         try:
-            data = self._load_calls_data()
             timestamp = datetime.now().isoformat()
             today = datetime.now().strftime('%Y-%m-%d')
             hour = datetime.now().hour
@@ -108,100 +116,132 @@ class MCPCallTracker:
                 "result_size_bytes": result_size,
                 "user_agent": "cursor-mcp"  # 可以后续优化识别调用来源
             }
+            if diagnostics:
+                call_record["diagnostics"] = diagnostics
             
-            # 添加到调用列表
-            data["calls"].append(call_record)
-            
-            # 更新每日统计
-            if today not in data["daily_stats"]:
-                data["daily_stats"][today] = {
-                    "total_calls": 0,
-                    "successful_calls": 0,
-                    "failed_calls": 0,
-                    "total_execution_time_ms": 0,
-                    "avg_execution_time_ms": 0,
-                    "tool_breakdown": {},
-                    "hourly_distribution": {str(h): 0 for h in range(24)}
-                }
-            
-            daily_stat = data["daily_stats"][today]
-            daily_stat["total_calls"] += 1
-            daily_stat["total_execution_time_ms"] += call_record["execution_time_ms"]
-            daily_stat["avg_execution_time_ms"] = daily_stat["total_execution_time_ms"] / daily_stat["total_calls"]
-            daily_stat["hourly_distribution"][str(hour)] += 1
-            
-            if success:
-                daily_stat["successful_calls"] += 1
-            else:
-                daily_stat["failed_calls"] += 1
-            
-            if tool_name not in daily_stat["tool_breakdown"]:
-                daily_stat["tool_breakdown"][tool_name] = 0
-            daily_stat["tool_breakdown"][tool_name] += 1
-            
-            # 更新工具统计
-            if tool_name not in data["tool_stats"]:
-                data["tool_stats"][tool_name] = {
-                    "total_calls": 0,
-                    "successful_calls": 0,
-                    "failed_calls": 0,
-                    "first_used": timestamp,
-                    "last_used": timestamp,
-                    "avg_execution_time_ms": 0,
-                    "total_execution_time_ms": 0,
-                    "common_arguments": {},
-                    "error_patterns": []
-                }
-            
-            tool_stat = data["tool_stats"][tool_name]
-            tool_stat["total_calls"] += 1
-            tool_stat["last_used"] = timestamp
-            tool_stat["total_execution_time_ms"] += call_record["execution_time_ms"]
-            tool_stat["avg_execution_time_ms"] = tool_stat["total_execution_time_ms"] / tool_stat["total_calls"]
-            
-            if success:
-                tool_stat["successful_calls"] += 1
-            else:
-                tool_stat["failed_calls"] += 1
-                if error_message and len(tool_stat["error_patterns"]) < 10:  # 限制错误记录数量
-                    tool_stat["error_patterns"].append({
-                        "error": error_message,
-                        "timestamp": timestamp,
-                        "arguments": arguments
-                    })
-            
-            # 分析常用参数（只保留前5个最常用的）
-            if arguments:
-                for key, value in arguments.items():
-                    if key not in tool_stat["common_arguments"]:
-                        tool_stat["common_arguments"][key] = {}
-                    
-                    value_str = str(value)[:50]  # 限制长度
-                    if value_str not in tool_stat["common_arguments"][key]:
-                        tool_stat["common_arguments"][key][value_str] = 0
-                    tool_stat["common_arguments"][key][value_str] += 1
-                    
-                    # 只保留使用频率最高的5个值
-                    if len(tool_stat["common_arguments"][key]) > 5:
-                        sorted_items = sorted(
-                            tool_stat["common_arguments"][key].items(), 
-                            key=lambda x: x[1], 
-                            reverse=True
-                        )[:5]
-                        tool_stat["common_arguments"][key] = dict(sorted_items)
-            
-            # 限制调用记录数量，避免文件过大
-            if len(data["calls"]) > 1000:
-                # 保留最近的1000条记录
-                data["calls"] = data["calls"][-1000:]
-            
-            # 保存数据
-            self._save_calls_data(data)
+            await self._writer.put_async(call_record)
             
         except Exception as e:
             # 静默失败，不影响MCP工具正常使用
             print(f"⚠️ 记录MCP调用失败: {e}")
     
+    def _write_calls(self, call_records: List[Dict[str, Any]]) -> None:
+        """写入一批调用记录：整个文件只读写一次"""
+        data = self._load_calls_data()
+        for call_record in call_records:
+            self._apply_call(data, call_record)
+        
+        # 限制调用记录数量，避免文件过大
+        if len(data["calls"]) > 1000:
+            # 保留最近的1000条记录，更早的记录追加到按月的 gzip 归档文件
+            try:
+                archive_by_month(self.data_dir / "usage_archive", "mcp_calls", data["calls"][:-1000])
+            except OSError as e:
+                print(f"⚠️ 归档MCP调用记录失败: {e}")
+            data["calls"] = data["calls"][-1000:]
+        
+        # 保存数据
+        self._save_calls_data(data)
+    
+    def _apply_call(self, data: Dict[str, Any], call_record: Dict[str, Any]) -> None:
+        """把一条调用记录加入调用列表并更新统计"""
+        tool_name = call_record["tool_name"]
+        timestamp = call_record["timestamp"]
+        today = call_record["date"]
+        hour = call_record["hour"]
+        arguments = call_record["arguments"]
+        success = call_record["success"]
+        error_message = call_record["error_message"]
+        
+        # 添加到调用列表
+        data["calls"].append(call_record)
+        
+        # 更新每日统计
+        if today not in data["daily_stats"]:
+            data["daily_stats"][today] = {
+                "total_calls": 0,
+                "successful_calls": 0,
+                "failed_calls": 0,
+                "total_execution_time_ms": 0,
+                "avg_execution_time_ms": 0,
+                "tool_breakdown": {},
+                "hourly_distribution": {str(h): 0 for h in range(24)}
+            }
+        
+        daily_stat = data["daily_stats"][today]
+        daily_stat["total_calls"] += 1
+        daily_stat["total_execution_time_ms"] += call_record["execution_time_ms"]
+        daily_stat["avg_execution_time_ms"] = daily_stat["total_execution_time_ms"] / daily_stat["total_calls"]
+        daily_stat["hourly_distribution"][str(hour)] += 1
+        
+        if success:
+            daily_stat["successful_calls"] += 1
+        else:
+            daily_stat["failed_calls"] += 1
+        
+        if tool_name not in daily_stat["tool_breakdown"]:
+            daily_stat["tool_breakdown"][tool_name] = 0
+        daily_stat["tool_breakdown"][tool_name] += 1
+        
+        # 更新工具统计
+        if tool_name not in data["tool_stats"]:
+            data["tool_stats"][tool_name] = {
+                "total_calls": 0,
+                "successful_calls": 0,
+                "failed_calls": 0,
+                "first_used": timestamp,
+                "last_used": timestamp,
+                "avg_execution_time_ms": 0,
+                "total_execution_time_ms": 0,
+                "common_arguments": {},
+                "error_patterns": []
+            }
+        
+        tool_stat = data["tool_stats"][tool_name]
+        tool_stat["total_calls"] += 1
+        tool_stat["last_used"] = timestamp
+        tool_stat["total_execution_time_ms"] += call_record["execution_time_ms"]
+        tool_stat["avg_execution_time_ms"] = tool_stat["total_execution_time_ms"] / tool_stat["total_calls"]
+        
+        if success:
+            tool_stat["successful_calls"] += 1
+        else:
+            tool_stat["failed_calls"] += 1
+            if error_message and len(tool_stat["error_patterns"]) < 10:  # 限制错误记录数量
+                tool_stat["error_patterns"].append({
+                    "error": error_message,
+                    "timestamp": timestamp,
+                    "arguments": arguments
+                })
+        
+        # 分析常用参数（只保留前5个最常用的）
+        if arguments:
+            for key, value in arguments.items():
+                if key not in tool_stat["common_arguments"]:
+                    tool_stat["common_arguments"][key] = {}
+                
+                value_str = str(value)[:50]  # 限制长度
+                if value_str not in tool_stat["common_arguments"][key]:
+                    tool_stat["common_arguments"][key][value_str] = 0
+                tool_stat["common_arguments"][key][value_str] += 1
+                
+                # 只保留使用频率最高的5个值
+                if len(tool_stat["common_arguments"][key]) > 5:
+                    sorted_items = sorted(
+                        tool_stat["common_arguments"][key].items(), 
+                        key=lambda x: x[1], 
+                        reverse=True
+                    )[:5]
+                    tool_stat["common_arguments"][key] = dict(sorted_items)
+    
+    def flush(self) -> None:
+        """等待队列中的调用记录全部写入"""
+        self._writer.wait_idle()
+    
+    def close(self) -> None:
+        """写完队列中剩余的调用记录（服务退出时调用）"""
+        self._writer.close()
+    
     def create_call_wrapper(self):
         """创建调用包装器装饰器"""
         def call_wrapper(func):
@@ -260,6 +300,7 @@ class MCPCallTracker:
     def get_stats_summary(self, days: int = 7) -> Dict[str, Any]:
         """获取统计摘要"""
         try:
+            self.flush()
             data = self._load_calls_data()
             
             # 计算时间范围
@@ -6,24 +6,281 @@ Vue组件查找器模块
 import os
 import re
 import json
+import math
+import time
+import heapq
+import asyncio
+import hashlib
 import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from functools import partial
+from operator import attrgetter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
+from .component_index import ComponentIndex, WorkspaceIndex
+from .component_reader import DEFAULT_MAX_FILE_BYTES, read_component_bytes, read_component_header
+from .component_record import ComponentRecord
+from .component_search import ComponentSearchIndex
+from .component_usage import UsageGraph, is_local_import, tag_key
+from .component_scanner import (
+    walk_component_files, git_component_files, is_candidate_path, is_under_components_dir,
+    is_excluded_dir
+)
+from .component_watcher import ComponentWatcher
+from .scan_diagnostics import ScanDiagnostics
+from .sfc_splitter import SfcBlocks, split_sfc, whole_file_blocks
+from .workspaces import (
+    WorkspacePackage, detect_workspace_packages, select_packages, walk_workspace_files
+)
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 并行分析的进程数（"auto" 表示CPU核数，未设置或为1时串行分析）
+WORKERS_ENV = 'FRONTEND_DEV_ASSISTANT_WORKERS'
+
+# 待分析文件少于该数量时不启用进程池（进程启动开销大于收益）
+PARALLEL_MIN_FILES = 64
+
+# 每个分块的最大文件数
+PARALLEL_MAX_CHUNK = 64
+
+# 文件监听模式（"1"/"inotify" 优先使用inotify，"poll" 强制轮询，未设置则不监听）
+WATCH_ENV = 'FRONTEND_DEV_ASSISTANT_WATCH'
+
+# 是否用 git ls-files 枚举组件文件（"1" 开启；非 git 仓库自动回退到目录遍历）
+GIT_FILES_ENV = 'FRONTEND_DEV_ASSISTANT_GIT_FILES'
+
+# 单文件大小上限（KB，"0" 表示不限制），超过的文件不分析
+MAX_FILE_KB_ENV = 'FRONTEND_DEV_ASSISTANT_MAX_FILE_KB'
+
+# 每页返回的组件数：有过滤条件时默认8个，浏览全部组件时默认10个，最多50个
+DEFAULT_RESULT_LIMIT = 8
+DEFAULT_BROWSE_LIMIT = 10
+MAX_RESULT_LIMIT = 50
+
+# 浏览全部组件时每批分析的最少文件数（凑够一页即停止分析）
+BROWSE_BATCH_SIZE = 16
+
+# 冷启动查询是否两阶段分析（默认开启，设为 0 时始终完整分析全部文件）
+LAZY_ANALYSIS_ENV = 'FRONTEND_DEV_ASSISTANT_LAZY_ANALYSIS'
+
+# 两阶段分析：文件数达到该值且索引中不到一半的文件时视为冷启动
+LAZY_MIN_FILES = 200
+
+# 两阶段分析完整分析的候选数：(offset + limit) * 倍数 + 余量
+LAZY_CANDIDATE_FACTOR = 4
+LAZY_CANDIDATE_MARGIN = 32
+
+# 预筛选的得分：关键词出现在文件名、路径、文件开头，以及类型的名称和内容线索
+PREFILTER_NAME_SCORE = 3.0
+PREFILTER_PATH_SCORE = 2.0
+PREFILTER_HEADER_SCORE = 1.0
+
+# 查询结果缓存的最大条数
+RESULT_CACHE_SIZE = 64
+
+# 执行扫描的后台线程数（扫描不在事件循环上运行，避免阻塞其他工具调用）
+SCAN_THREADS = 2
+
+# 组件分析使用的正则（模块加载时预编译，各提取器只在相关的SFC块上匹配）
+# JS/TS 文件的UI组件特征（在转成小写的内容上匹配，逐个检查比一个不区分大小写的大分支正则快得多）
+_UI_INDICATOR_WORDS = ('jsx', 'tsx')
+# export default { 之后出现 template（原来的 DOTALL 正则 export\s+default\s*{.*template 会回溯到文件末尾）
+_EXPORT_DEFAULT_OBJECT = re.compile(r'export\s+default\s*{')
+_UI_INDICATORS = (
+    re.compile(r'render\s*\('),
+    re.compile(r'createelement\s*\('),
+    re.compile(r'h\s*\('),
+    re.compile(r'return\s+react\.createelement'),
+    re.compile(r'return\s+<\w+')
+)
+_NAME_SEPARATORS = re.compile(r'[-_\s.]+')
+_DEFINE_PROPS = re.compile(r'defineProps\s*\(\s*({.*?}|\[.*?\])', re.DOTALL)
+_PROPS_OPTION = re.compile(r'props\s*:\s*({.*?}|\[.*?\])', re.DOTALL)
+_QUOTED_WORD = re.compile(r'["\'](\w+)["\']')
+_QUOTED_STRING = re.compile(r'["\']([^"\']+)["\']')
+_PROP_ENTRY = re.compile(r'(\w+)\s*:\s*({[^}]*}|\w+)')
+_PROP_DEFAULT = re.compile(r'default\s*:\s*([^,}]+)')
+_EMIT_CALL = re.compile(r'\$emit\s*\(\s*["\']([^"\']+)["\']')
+_DEFINE_EMITS = re.compile(r'defineEmits\s*\(\s*\[([^\]]+)\]')
+_EMITS_OPTION = re.compile(r'emits\s*:\s*\[([^\]]+)\]')
+_NAMED_SLOT = re.compile(r'<slot\s+name=["\']([^"\']+)["\']')
+_COMMENT_PATTERNS = (
+    re.compile(r'/\*\*\s*\n?\s*\*\s*([^\n*]+)'),  # JSDoc注释
+    re.compile(r'//\s*([^\n]+)'),  # 单行注释
+    re.compile(r'<!--\s*([^-]+)\s*-->')  # HTML注释
+)
+
+# 纯字面量的特征直接用子串判断
+_TEMPLATE_FEATURES = (
+    (('<form', '@submit'), "表单"),
+    (('<table', '<thead', '<tbody'), "表格"),
+    (('v-for', ':key'), "列表"),
+    (('<input', '<select', '<textarea'), "输入"),
+    (('<button', '@click'), "交互"),
+    (('<img', 'image'), "图片")
+)
+_EMIT_USAGE = ('$emit', 'defineEmits')
+_REACTIVE_USAGE = ('watch', 'computed')
+_ASYNC_USAGE = ('async', 'await', 'Promise')
+_TYPESCRIPT_USAGE = ('ts', 'interface')  # 'ts' 已覆盖 'typescript'
+_TYPE_NAME_KEYWORDS = {
+    "table": ["table", "grid", "list", "data"],
+    "form": ["form", "input", "field", "edit"],
+    "modal": ["modal", "dialog", "popup", "overlay"],
+    "card": ["card", "panel", "item"],
+    "button": ["button", "btn", "action"],
+    "navigation": ["nav", "menu", "header", "sidebar"],
+    "layout": ["layout", "container", "wrapper"],
+    "display": ["show", "display", "view", "preview"]
+}
+_TABLE_MARKUP = ('<table', '<thead', '<tbody', '<tr', '<td')
+_FORM_MARKUP = ('<form', '<input', '<select', '<textarea')
+_NAV_MARKUP = ('<nav', '<menu', 'router-link')
+_V_IF_MODAL = re.compile(r'v-if.*modal')
+_POSITION_FIXED = re.compile(r'position.*fixed')
+_CLICK_BUTTON = re.compile(r'@click.*button')
+# 引用关系：import/export ... from、副作用导入和动态 import() 的路径，模板中的 PascalCase 或 kebab-case 组件标签
+# （都以字面量开头，能利用正则引擎的前缀快速查找；以 \b 或后行断言开头的写法要慢一个数量级）
+_FROM_IMPORT = re.compile(r'from\s*["\']([^"\'\n]+)["\']')
+_BARE_IMPORT = re.compile(r'import\s*\(?\s*["\']([^"\'\n]+)["\']')
+_COMPONENT_TAG = re.compile(r'<([A-Z]\w*|[a-z][a-z0-9]*-[\w-]*)')
+_KEBAB_FIRST = re.compile(r'(.)([A-Z][a-z]+)')
+_KEBAB_SECOND = re.compile(r'([a-z0-9])([A-Z])')
+
+
+def _contains_any(text: str, needles: Tuple[str, ...]) -> bool:
+    """text 是否包含任意一个子串"""
+    return any(needle in text for needle in needles)
+
+
+# 单个文件的分析结果：(组件记录, 读取耗时, 提取耗时)
+TimedAnalysis = Tuple[Optional[ComponentRecord], float, float]
+
+# 打分后的组件：(组件记录, 相似度)
+ScoredComponent = Tuple[ComponentRecord, float]
+
+# 一批文件内按内容去重的缓存：(内容哈希, 扩展名) -> (组件记录, 基于内容推测的类型)
+ContentCache = Dict[Tuple[str, str], Tuple[Optional[ComponentRecord], str]]
+
+# 结果中每个组件最多列出的其他相同位置数
+MAX_DUPLICATE_LOCATIONS = 5
+
+# 查找组件引用时每个组件最多列出的引用文件数
+MAX_USAGE_FILES = 50
+
+# 引用数对排序的加权：排序分 = 相似度 * (1 + USAGE_BOOST * ln(1 + 引用数))，显示的相似度不变
+USAGE_BOOST = 0.1
+
+# 工作进程内复用的分析器实例
+_worker_finder = None
+
+def _analyze_chunk(chunk: List[Tuple[Path, os.stat_result]], max_file_bytes: int) -> List[TimedAnalysis]:
+    """进程池工作函数：按输入顺序分析一组文件（块内内容相同的文件只提取一次）"""
+    global _worker_finder
+    if _worker_finder is None:
+        _worker_finder = ComponentFinder(use_index=False)
+    _worker_finder.max_file_bytes = max_file_bytes
+    seen: ContentCache = {}
+    return [_worker_finder._analyze_component_file_timed(path, stat, seen) for path, stat in chunk]
+
 class ComponentFinder:
-    def __init__(self):
-        """初始化组件查找器"""
-        pass
+    def __init__(
+        self, 
+        data_dir: Optional[Path] = None, 
+        use_index: bool = True,
+        watch: Optional[str] = None,
+        use_git: Optional[bool] = None,
+        max_file_bytes: Optional[int] = None,
+        use_workspaces: bool = True,
+        lazy_analysis: Optional[bool] = None
+    ):
+        """
+        初始化组件查找器
+        
+        Args:
+            data_dir: 数据目录，组件索引保存在其下的 component_index 目录
+            use_index: 是否使用持久化组件索引（关闭后每次查询都完整分析）
+            watch: 文件监听模式（"inotify"/"poll"，默认读取环境变量，未设置则不监听）；
+                   开启后查询过的项目会被持续监听，之后的查询直接使用内存中的索引
+            use_git: 是否用 git ls-files 枚举组件文件（默认读取环境变量），
+                     可跳过 .gitignore 中忽略的构建产物等目录
+            max_file_bytes: 单文件大小上限（默认读取环境变量，未设置时 512KB，0 表示不限制）；
+                            超过上限的文件以及压缩、二进制文件都不分析
+            use_workspaces: 是否识别 monorepo 的 workspace 包（pnpm/yarn/npm/lerna），
+                            识别到时各包并发扫描，组件索引按包分片
+            lazy_analysis: 冷启动查询是否两阶段分析（默认读取环境变量，未设置时开启）：
+                           组件索引中还没有大部分文件时，先按名称、路径和文件开头给文件粗略打分，
+                           只完整分析排名靠前的候选文件
+        """
+        if data_dir is None:
+            data_dir = self._determine_data_directory()
+        
+        self.data_dir = data_dir
+        self.index_dir = self.data_dir / "component_index"
+        self.use_index = use_index
+        self.use_git = self._resolve_use_git(use_git)
+        self.max_file_bytes = self._resolve_max_file_bytes(max_file_bytes)
+        self.use_workspaces = use_workspaces
+        self.lazy_analysis = self._resolve_lazy_analysis(lazy_analysis)
+        
+        # 项目路径 -> 组件索引（进程内常驻，避免每次查询重新加载；monorepo 为分片索引）
+        self._indexes: Dict[str, Any] = {}
+        # 项目路径 -> 最近一次识别到的 workspace 包（不是 monorepo 时为空列表）
+        self._workspaces: Dict[str, List[WorkspacePackage]] = {}
+        # 格式化好的查询结果（LRU），键中包含组件索引的 generation，索引变化后自然失效
+        self._result_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        # 正在后台补全组件索引的项目
+        self._warming: set = set()
+        
+        # 并行分析用的进程池：进程数 -> 进程池（按需创建；并发的扫描可能使用不同的进程数，
+        # 各自的进程池互不影响，直到 shutdown 才关闭）
+        self._pools: Dict[int, ProcessPoolExecutor] = {}
+        
+        # 扫描线程池与锁：同一项目的扫描串行执行，不同项目可以并发
+        self._scan_executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._project_locks: Dict[str, threading.Lock] = {}
+        
+        # 文件监听器（需要组件索引）
+        self._watcher: Optional[ComponentWatcher] = None
+        watch_mode = self._resolve_watch_mode(watch)
+        if watch_mode and use_index:
+            self._watcher = ComponentWatcher(
+                self._apply_watch_changes, use_inotify=(watch_mode != 'poll')
+            )
+    
+    def _determine_data_directory(self) -> Path:
+        """确定数据保存目录（与调用追踪器保持一致）"""
+        # 1. 环境变量
+        env_data_dir = os.environ.get('FRONTEND_DEV_ASSISTANT_DATA_DIR')
+        if env_data_dir:
+            return Path(env_data_dir)
+        
+        # 2. 开发模式：项目目录
+        project_data_dir = Path(__file__).parent.parent / "data"
+        if project_data_dir.exists():
+            return project_data_dir
+        
+        # 3. 用户主目录
+        return Path.home() / ".frontend-dev-assistant"
     
     async def find_reusable_components(
         self, 
         project_path: str, 
         component_type: Optional[str] = None,
-        search_keywords: List[str] = None
+        search_keywords: List[str] = None,
+        workers: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        packages: Optional[List[str]] = None,
+        diagnostics: Optional[ScanDiagnostics] = None
     ) -> str:
         """
         在项目中查找可复用的组件
@@ -32,41 +289,169 @@ class ComponentFinder:
             project_path: 项目根目录路径
             component_type: 组件类型过滤（可选）
             search_keywords: 搜索关键词列表（可选）
+            workers: 并行分析的进程数（可选，默认读取环境变量，未设置则串行）
+            limit: 每页返回的组件数（可选，默认有过滤条件时8个、否则10个）
+            offset: 跳过前多少个结果（可选）
+            cursor: 上一页结果给出的翻页游标（可选，优先于 offset）
+            packages: monorepo 中只查询这些 workspace 包（包名或相对路径，支持通配符；可选）
+            diagnostics: 传入时记录本次查找各阶段的耗时和计数（可选）
         
         Returns:
             格式化的组件查找结果
         """
-        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_scan_executor(),
+            partial(
+                self._find_components_blocking,
+                project_path, component_type, search_keywords, workers,
+                limit, offset, cursor, packages, diagnostics
+            )
+        )
+    
+    def _find_components_blocking(
+        self,
+        project_path: str,
+        component_type: Optional[str] = None,
+        search_keywords: List[str] = None,
+        workers: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        packages: Optional[List[str]] = None,
+        diagnostics: Optional[ScanDiagnostics] = None
+    ) -> str:
+        """查找组件的同步实现（在扫描线程中执行）"""
+        if diagnostics is None:
+            diagnostics = ScanDiagnostics()
         try:
             project_dir = Path(project_path)
             if not project_dir.exists():
                 return f"❌ 项目路径不存在: {project_path}"
             
-            # 查找所有组件文件
-            component_files = self._find_component_files(project_dir)
+            # 统一使用绝对路径，保证扫描和文件监听得到的索引键一致
+            project_dir = project_dir.resolve()
             
-            if not component_files:
-                return f"📂 在项目 {project_path} 中未找到任何Vue组件文件"
+            hot = self._watcher is not None and self._watcher.is_hot(project_dir)
+            
+            # monorepo：识别 workspace 包，按需只查询部分包（监听中的项目使用上次识别的结果）
+            workspace = self._cached_workspace(project_dir) if hot else self._detect_workspace(project_dir)
+            scope = None
+            if packages:
+                if not workspace:
+                    return f"❌ 项目 {project_path} 不是 monorepo（未找到 workspace 配置），无法按包查询"
+                scope, unknown = select_packages(workspace, packages)
+                if unknown:
+                    available = "、".join(package.name for package in workspace[:20])
+                    return f"❌ 未找到 workspace 包: {', '.join(unknown)}\n\n可用的包：{available}"
+            
+            has_filter = bool(component_type or search_keywords)
+            query_key = self._query_key(project_dir, component_type, search_keywords, packages)
+            limit = self._resolve_limit(limit, has_filter)
+            if cursor:
+                offset = self._decode_cursor(cursor, query_key)
+                if offset is None:
+                    return f"❌ 无效的翻页游标: {cursor}（游标只能用于生成它的同一查询）"
+            offset = max(int(offset or 0), 0)
             
-            # 分析组件
-            components = []
-            for file_path in component_files:
-                component_info = self._analyze_component_file(file_path)
-                if component_info:
-                    components.append(component_info)
+            if not has_filter and not hot:
+                # 不过滤时只需要按路径顺序凑够一页，分析到足够的组件即停止
+                diagnostics.source = "browse"
+                return self._browse_components(
+                    project_dir, project_path, self._resolve_workers(workers),
+                    limit, offset, query_key, diagnostics, workspace, scope
+                )
+            
+            component_files = None
+            if not hot and self.lazy_analysis:
+                # 冷启动的大项目：先按名称、路径和文件开头预筛选，只完整分析排名靠前的候选文件
+                component_files = self._find_component_files(project_dir, diagnostics, workspace, scope)
+                if self._is_cold(project_dir, component_files):
+                    result = self._search_lazy(
+                        project_dir, component_files, component_type, search_keywords,
+                        self._resolve_workers(workers), limit, offset, query_key, diagnostics
+                    )
+                    if result is not None:
+                        self._schedule_warm_up(project_dir, component_files, self._resolve_workers(workers))
+                        return result
+                    # 候选文件中没有匹配的组件：回退到完整分析
+                    diagnostics.source = "scan"
+            
+            file_count, components = self._load_components(
+                project_dir, self._resolve_workers(workers), diagnostics, workspace, scope, hot,
+                component_files
+            )
+            
+            if not file_count:
+                return f"📂 在项目 {project_path} 中未找到任何Vue组件文件"
             
             if not components:
-                return f"📂 在项目中找到 {len(component_files)} 个文件，但没有识别到有效的Vue组件"
+                return f"📂 在项目中找到 {file_count} 个文件，但没有识别到有效的Vue组件"
+            
+            diagnostics.count("components", len(components))
+            usage = self._get_usage_graph(project_dir, components, workspace)
+            
+            # 相同查询在索引没有变化时直接返回上次格式化好的结果
+            result_key = self._result_key(
+                project_dir, project_path, components, component_type, search_keywords,
+                packages, scope, limit, offset
+            )
+            cached = self._cached_result(result_key)
+            if cached is not None:
+                diagnostics.count("result_cache_hits", 1)
+                return cached
             
-            # 智能过滤
-            filtered_components = self._intelligent_component_filter(
-                components, component_type, search_keywords
+            result = self._search_components(
+                project_dir, project_path, components, component_type, search_keywords,
+                limit, offset, query_key, diagnostics, usage, scope
             )
+            self._store_result(result_key, result)
+            return result
             
-            # 生成结果
-            if not filtered_components:
-                suggestions = self._generate_search_suggestions(components, search_keywords)
-                return f"""
+        except Exception as e:
+            logger.error(f"查找组件时出错: {str(e)}")
+            return f"❌ 查找组件时出错: {str(e)}"
+        finally:
+            diagnostics.finish()
+    
+    def _search_components(
+        self,
+        project_dir: Path,
+        project_path: str,
+        components: List[ComponentRecord],
+        component_type: Optional[str],
+        search_keywords: Optional[List[str]],
+        limit: int,
+        offset: int,
+        query_key: str,
+        diagnostics: ScanDiagnostics,
+        usage: UsageGraph,
+        scope: Optional[List[WorkspacePackage]] = None
+    ) -> str:
+        """在已加载的组件中过滤并格式化一页结果（没有过滤条件时按路径顺序）"""
+        if not component_type and not search_keywords:
+            page = [(component, 0.0) for component in components[offset:offset + limit]]
+            with diagnostics.phase("formatting"):
+                return self._format_page(
+                    page, offset, len(components), query_key, len(components), usage=usage
+                )
+        
+        # 智能过滤（基于倒排索引，内容相同的组件合并为一个结果，被引用多的组件排名靠前）
+        with diagnostics.phase("scoring"):
+            search_index = self._get_search_index(project_dir, components, scope)
+            filtered_components, total = self._intelligent_component_filter(
+                components, component_type, search_keywords, search_index,
+                limit=limit, offset=offset, usage=usage
+            )
+        diagnostics.count("matches", total)
+        
+        # 生成结果
+        if total and not filtered_components:
+            return f"📄 共 {total} 个匹配的组件，offset={offset} 之后没有更多结果"
+        
+        if not filtered_components:
+            suggestions = self._generate_search_suggestions(components, search_keywords)
+            return f"""
 ## 🔍 组件搜索结果
 
 未找到匹配的组件。
@@ -80,112 +465,1130 @@ class ComponentFinder:
 
 {suggestions}
 """
+        
+        with diagnostics.phase("formatting"):
+            return self._format_page(
+                filtered_components, offset, total, query_key,
+                duplicates=search_index.duplicates, usage=usage
+            )
+    
+    def _is_cold(self, project_dir: Path, component_files: List[Path]) -> bool:
+        """文件足够多，且组件索引中还没有大部分文件的分析结果"""
+        if len(component_files) < LAZY_MIN_FILES:
+            return False
+        if not self.use_index:
+            return True
+        
+        index = self._get_index(project_dir)
+        with self._get_project_lock(project_dir):
+            index.load()
+            entries = index.entries
+            indexed = sum(1 for file_path in component_files if str(file_path) in entries)
+        return indexed * 2 < len(component_files)
+    
+    def _schedule_warm_up(self, project_dir: Path, component_files: List[Path], workers: int) -> None:
+        """两阶段查找返回后，在后台线程中补全组件索引（之后的查询不再是冷启动）"""
+        if not self.use_index:
+            return
+        key = str(project_dir)
+        with self._lock:
+            if key in self._warming:
+                return
+            self._warming.add(key)
+        
+        def warm_up():
+            try:
+                self._collect_components(project_dir, component_files, workers)
+                if self._watcher is not None:
+                    self._watcher.watch(project_dir)
+            except Exception as e:
+                logger.warning(f"后台补全组件索引失败 {project_dir}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._warming.discard(key)
+        
+        self._get_scan_executor().submit(warm_up)
+    
+    def _search_lazy(
+        self,
+        project_dir: Path,
+        component_files: List[Path],
+        component_type: Optional[str],
+        search_keywords: Optional[List[str]],
+        workers: int,
+        limit: int,
+        offset: int,
+        query_key: str,
+        diagnostics: ScanDiagnostics
+    ) -> Optional[str]:
+        """
+        两阶段查找：预筛选出候选文件，只完整分析候选文件，再在其中按 BM25 打分
+        
+        关键词只出现在文件开头之后的内容里（如靠后的 prop 名）的组件可能不会成为候选；
+        候选中没有匹配的组件时返回 None，由调用方回退到完整分析
+        """
+        diagnostics.source = "lazy"
+        count = (offset + limit) * LAZY_CANDIDATE_FACTOR + LAZY_CANDIDATE_MARGIN
+        while True:
+            with diagnostics.phase("prefilter"):
+                candidate_files, truncated = self._prefilter_files(
+                    project_dir, component_files, component_type, search_keywords, count
+                )
+            components, usage = self._analyze_candidates(project_dir, candidate_files, workers, diagnostics)
+            if not components:
+                return None
+            
+            with diagnostics.phase("scoring"):
+                search_index = ComponentSearchIndex(components)
+                filtered_components, total = self._intelligent_component_filter(
+                    components, component_type, search_keywords, search_index,
+                    limit=limit, offset=offset, usage=usage
+                )
+            # 候选中的无效组件和相同副本可能让结果凑不够一页：扩大候选范围重试
+            if len(filtered_components) >= limit or not truncated:
+                break
+            count *= LAZY_CANDIDATE_FACTOR
+        
+        diagnostics.count("components", len(components))
+        diagnostics.count("matches", total)
+        if not filtered_components:
+            return None
+        
+        with diagnostics.phase("formatting"):
+            if not truncated:
+                return self._format_page(
+                    filtered_components, offset, total, query_key,
+                    duplicates=search_index.duplicates, usage=usage
+                )
+            # 还有未完整分析的文件，总数未知
+            return self._format_page(
+                filtered_components, offset, None, query_key, len(component_files),
+                has_more=True, duplicates=search_index.duplicates, usage=usage
+            )
+    
+    def _analyze_candidates(
+        self,
+        project_dir: Path,
+        candidate_files: List[Path],
+        workers: int,
+        diagnostics: ScanDiagnostics
+    ) -> Tuple[List[ComponentRecord], Optional[UsageGraph]]:
+        """
+        完整分析候选文件（启用组件索引时结果同样写入索引，之后的查询直接复用）
+        
+        Returns:
+            (按路径排序的有效组件, 组件引用图；不使用组件索引时为 None)
+        """
+        start = time.perf_counter()
+        candidates = []
+        for file_path in candidate_files:
+            try:
+                candidates.append((file_path, file_path.stat()))
+            except OSError:
+                continue
+        diagnostics.count("candidates", len(candidates))
+        
+        if self.use_index:
+            index = self._get_index(project_dir)
+            with self._get_project_lock(project_dir):
+                counts = index.apply_changes(
+                    candidates, [], lambda batch: self._analyze_files(batch, workers, diagnostics)
+                )
+                results = [index.component(file_path) for file_path, _ in candidates]
+            if counts["analyzed"]:
+                self._invalidate_results(project_dir)
+            diagnostics.count("cache_hits", counts["hits"])
+            usage = index.usage
+        else:
+            results = self._analyze_files(candidates, workers, diagnostics)
+            usage = None
+        diagnostics.add_time("refresh", time.perf_counter() - start)
+        
+        components = sorted((component for component in results if component), key=attrgetter("file_path"))
+        return components, usage
+    
+    def _prefilter_files(
+        self,
+        project_dir: Path,
+        component_files: List[Path],
+        component_type: Optional[str],
+        keywords: Optional[List[str]],
+        count: int
+    ) -> Tuple[List[Path], bool]:
+        """
+        按文件名、相对路径和文件开头粗略打分，选出得分最高的 count 个文件
+        
+        先只用文件名和路径打分（不读文件），再按"可能的最高分"从高到低读取文件开头；
+        一旦剩余文件即使开头全部命中也进不了前 count 名就停止，不再读取
+        
+        Returns:
+            (按路径排序的候选文件, 是否还有可能匹配的文件未被选中)
+        """
+        terms = [keyword.strip().lower() for keyword in keywords or [] if keyword.strip()]
+        target_type = (component_type or '').strip().lower()
+        type_words = _TYPE_NAME_KEYWORDS.get(target_type, [target_type]) if target_type else []
+        # 文件开头最多能加的分
+        header_bonus = PREFILTER_HEADER_SCORE * (len(terms) + (1 if target_type else 0))
+        
+        # 与 _guess_type_from_name 相同的顺序：第一个名称关键词命中的类型，及其与目标类型的相似度；
+        # 最后一个相似度大于0的类型之后的规则不影响得分，直接去掉
+        type_rules = [
+            (re.compile('|'.join(map(re.escape, keywords_of_type))),
+             self._calculate_type_similarity(comp_type, target_type))
+            for comp_type, keywords_of_type in _TYPE_NAME_KEYWORDS.items()
+        ] if target_type else []
+        while type_rules and type_rules[-1][1] <= 0:
+            type_rules.pop()
+        
+        # 第一阶段：文件名和路径（纯字符串操作，不构造 Path）
+        root_prefix = str(project_dir).rstrip(os.sep) + os.sep
+        path_scores = []
+        for position, file_path in enumerate(component_files):
+            path_text = str(file_path)
+            rel_path = (path_text[len(root_prefix):] if path_text.startswith(root_prefix) else path_text).lower()
+            directory, file_name = os.path.split(rel_path)
+            stem = os.path.splitext(file_name)[0]
+            if stem in ('index', 'main'):
+                stem = os.path.basename(directory)
+            
+            score = 0.0
+            missing = []  # 文件名和路径中都没有的关键词，留给文件开头匹配
+            for term in terms:
+                if term in stem:
+                    score += PREFILTER_NAME_SCORE
+                elif term in rel_path:
+                    score += PREFILTER_PATH_SCORE
+                else:
+                    missing.append(term)
+            if type_rules:
+                name = _NAME_SEPARATORS.sub('', stem)
+                for pattern, similarity in type_rules:
+                    if pattern.search(name):
+                        score += PREFILTER_PATH_SCORE * similarity
+                        break
+            path_scores.append((score, position, missing))
+        
+        # 第二阶段：按可能的最高分从高到低读取文件开头
+        path_scores.sort(key=lambda item: (-item[0], item[1]))
+        top: List[Tuple[float, int]] = []  # 小顶堆：(得分, -位置)，同分时保留靠前的文件
+        pending = 0  # 没有读取开头、但可能有分的文件数
+        for index, (score, position, missing) in enumerate(path_scores):
+            if len(top) >= count and score + header_bonus <= top[0][0]:
+                pending = sum(
+                    1 for remaining, _, _ in path_scores[index:] if remaining + header_bonus > 0
+                )
+                break
+            if header_bonus:
+                file_path = component_files[position]
+                header = read_component_header(file_path, self.max_file_bytes)
+                if header is None:
+                    continue
+                score += PREFILTER_HEADER_SCORE * sum(1 for term in missing if term in header)
+                if target_type and any(word in header for word in type_words):
+                    score += PREFILTER_HEADER_SCORE
+            if score <= 0:
+                continue
+            if len(top) < count:
+                heapq.heappush(top, (score, -position))
+            elif (score, -position) > top[0]:
+                heapq.heapreplace(top, (score, -position))
+                pending += 1
+            else:
+                pending += 1
+        
+        candidates = [component_files[-negative] for _, negative in top]
+        candidates.sort(key=str)
+        return candidates, pending > 0
+    
+    def _load_components(
+        self,
+        project_dir: Path,
+        workers: int,
+        diagnostics: ScanDiagnostics,
+        workspace: List[WorkspacePackage],
+        scope: Optional[List[WorkspacePackage]],
+        hot: bool,
+        component_files: Optional[List[Path]] = None
+    ) -> Tuple[int, List[ComponentRecord]]:
+        """
+        同步并返回项目的全部组件（component_files 为已经查找到的文件列表时不再重新查找）
+        
+        Returns:
+            (组件文件数, 组件列表)
+        """
+        if hot:
+            # 监听中的项目：先应用尚未处理的变化，再直接使用内存中的索引
+            diagnostics.source = "watcher"
+            with diagnostics.phase("refresh"):
+                self._watcher.flush(project_dir)
+                index = self._get_index(project_dir)
+                with self._get_project_lock(project_dir):
+                    file_count = len(index.entries)
+                    components = index.components(scope) if scope else index.components()
+            diagnostics.count("cache_hits", file_count)
+            return file_count, components
+        
+        # 查找所有组件文件
+        if component_files is None:
+            component_files = self._find_component_files(project_dir, diagnostics, workspace, scope)
+        
+        # 分析组件（命中索引的文件直接复用上次的分析结果）
+        components = self._collect_components(project_dir, component_files, workers, diagnostics, scope)
+        
+        if self._watcher is not None:
+            self._watcher.watch(project_dir)
+        return len(component_files), components
+    
+    def _get_usage_graph(
+        self,
+        project_dir: Path,
+        components: List[ComponentRecord],
+        workspace: Optional[List[WorkspacePackage]] = None
+    ) -> UsageGraph:
+        """获取项目的组件引用图：启用组件索引时随索引增量维护，否则由组件列表建立"""
+        if self.use_index:
+            index = self._get_index(project_dir)
+            if isinstance(index, WorkspaceIndex):
+                # 只查询部分包时其他包的分片可能还未加载，其中的引用也要统计
+                with self._get_project_lock(project_dir):
+                    index.load()
+            return index.usage
+        roots = [str(project_dir), *(str(package.path) for package in workspace or [])]
+        return UsageGraph.build(components, roots)
+    
+    async def find_component_usages(
+        self,
+        project_path: str,
+        component: str,
+        packages: Optional[List[str]] = None
+    ) -> str:
+        """
+        查找使用了某个组件的文件（通过 import 语句或模板中的组件标签）
+        
+        Args:
+            project_path: 项目根目录路径
+            component: 组件名（如 UserCard、user-card）或组件文件路径（可以只写结尾部分）
+            packages: monorepo 中只在这些 workspace 包里查找该组件（引用方不受限制；可选）
+        
+        Returns:
+            格式化的引用列表
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_scan_executor(),
+            partial(self._find_usages_blocking, project_path, component, packages)
+        )
+    
+    def _find_usages_blocking(
+        self,
+        project_path: str,
+        component: str,
+        packages: Optional[List[str]] = None
+    ) -> str:
+        """查找组件引用的同步实现（在扫描线程中执行）"""
+        diagnostics = ScanDiagnostics()
+        try:
+            project_dir = Path(project_path)
+            if not project_dir.exists():
+                return f"❌ 项目路径不存在: {project_path}"
+            project_dir = project_dir.resolve()
             
-            return self._format_component_suggestions(filtered_components)
+            hot = self._watcher is not None and self._watcher.is_hot(project_dir)
+            workspace = self._cached_workspace(project_dir) if hot else self._detect_workspace(project_dir)
+            scope = None
+            if packages:
+                if not workspace:
+                    return f"❌ 项目 {project_path} 不是 monorepo（未找到 workspace 配置），无法按包查询"
+                scope, unknown = select_packages(workspace, packages)
+                if unknown:
+                    available = "、".join(package.name for package in workspace[:20])
+                    return f"❌ 未找到 workspace 包: {', '.join(unknown)}\n\n可用的包：{available}"
             
+            # 引用方可能在任何包中，始终同步整个项目
+            _, components = self._load_components(
+                project_dir, self._resolve_workers(None), diagnostics, workspace, None, hot
+            )
+            usage = self._get_usage_graph(project_dir, components, workspace)
+            
+            matches = self._match_components(components, component, project_dir)
+            if scope is not None:
+                prefixes = tuple(str(package.path) + os.sep for package in scope)
+                matches = [match for match in matches if match.file_path.startswith(prefixes)]
+            if not matches:
+                return f"❌ 未找到组件: {component}"
+            
+            return self._format_usages(matches, usage, project_dir)
+        
         except Exception as e:
-            logger.error(f"查找组件时出错: {str(e)}")
-            return f"❌ 查找组件时出错: {str(e)}"
+            logger.error(f"查找组件引用时出错: {str(e)}")
+            return f"❌ 查找组件引用时出错: {str(e)}"
+        finally:
+            diagnostics.finish()
     
-    def _find_component_files(self, project_dir: Path) -> List[Path]:
-        """查找项目中的组件文件"""
-        component_files = []
+    def _match_components(
+        self, components: List[ComponentRecord], query: str, project_dir: Path
+    ) -> List[ComponentRecord]:
+        """按组件名（不区分大小写和 kebab-case）或文件路径结尾匹配组件"""
+        query = query.strip()
+        if '/' in query or '\\' in query or '.' in query:
+            suffix = query.replace('\\', '/').lstrip('./')
+            return [
+                component for component in components
+                if Path(component.file_path).relative_to(project_dir).as_posix().endswith(suffix)
+            ] if suffix else []
+        
+        key = tag_key(query)
+        return [component for component in components if tag_key(component.name) == key]
+    
+    def _format_usages(
+        self, matches: List[ComponentRecord], usage: UsageGraph, project_dir: Path
+    ) -> str:
+        """格式化组件的引用列表"""
+        result = [f"## 🔗 组件引用（{len(matches)} 个组件）\n"]
+        for component in matches[:MAX_RESULT_LIMIT]:
+            users = usage.users(component.file_path)
+            result.append(f"### {component.name}")
+            result.append(f"**路径：** `{Path(component.file_path).relative_to(project_dir).as_posix()}`")
+            if not users:
+                result.append("**引用：** 未发现其他组件文件引用该组件")
+                result.append("")
+                continue
+            
+            result.append(f"**引用：** 被 {len(users)} 个文件引用")
+            for user in users[:MAX_USAGE_FILES]:
+                result.append(f"- `{Path(user).relative_to(project_dir).as_posix()}`")
+            if len(users) > MAX_USAGE_FILES:
+                result.append(f"- ... 还有 {len(users) - MAX_USAGE_FILES} 个文件")
+            result.append("")
         
-        # 搜索模式
-        patterns = [
-            "**/*.vue",
-            "**/components/**/*.js",
-            "**/components/**/*.ts",
-            "**/components/**/*.jsx",
-            "**/components/**/*.tsx"
-        ]
+        if len(matches) > MAX_RESULT_LIMIT:
+            result.append(f"（另有 {len(matches) - MAX_RESULT_LIMIT} 个同名组件未列出）")
+        result.append("---")
+        result.append("💡 **提示：** 只统计组件文件之间的引用（import 语句和模板中的组件标签），"
+                      "同名组件有多个时标签引用不计入")
+        return "\n".join(result)
+    
+    def _browse_components(
+        self,
+        project_dir: Path,
+        project_path: str,
+        workers: int,
+        limit: int,
+        offset: int,
+        query_key: str,
+        diagnostics: Optional[ScanDiagnostics] = None,
+        workspace: Optional[List[WorkspacePackage]] = None,
+        scope: Optional[List[WorkspacePackage]] = None
+    ) -> str:
+        """不带过滤条件时按路径顺序返回一页组件，凑够一页即停止分析"""
+        if diagnostics is None:
+            diagnostics = ScanDiagnostics()
+        
+        # 与组件索引一致按路径字符串排序，保证翻页顺序稳定
+        component_files = sorted(
+            self._find_component_files(project_dir, diagnostics, workspace, scope), key=str
+        )
+        if not component_files:
+            return f"📂 在项目 {project_path} 中未找到任何Vue组件文件"
+        
+        components, exhausted = self._collect_first_components(
+            project_dir, component_files, offset + limit + 1, workers, diagnostics
+        )
+        diagnostics.count("components", len(components))
+        page = [(component, 0.0) for component in components[offset:offset + limit]]
+        with diagnostics.phase("formatting"):
+            if exhausted:
+                if not components:
+                    return f"📂 在项目中找到 {len(component_files)} 个文件，但没有识别到有效的Vue组件"
+                if not page:
+                    return f"📄 共 {len(components)} 个组件，offset={offset} 之后没有更多结果"
+                return self._format_page(page, offset, len(components), query_key, len(components))
+            
+            # 多分析了一个组件，用来判断是否还有下一页；总数未知时给出文件数
+            return self._format_page(page, offset, None, query_key, len(component_files), has_more=True)
+    
+    def _collect_first_components(
+        self,
+        project_dir: Path,
+        component_files: List[Path],
+        count: int,
+        workers: int,
+        diagnostics: Optional[ScanDiagnostics] = None
+    ) -> Tuple[List[ComponentRecord], bool]:
+        """
+        按顺序分析文件，直到得到 count 个有效组件
         
-        def should_exclude_path(path: Path) -> bool:
-            """判断是否应该排除该路径"""
-            exclude_patterns = [
-                "node_modules", ".git", "dist", "build", ".nuxt", 
-                ".next", "coverage", ".cache", "tmp", "temp",
-                "__pycache__", ".pytest_cache"
-            ]
+        Returns:
+            (组件列表, 是否已分析完全部文件)
+        """
+        components: List[ComponentRecord] = []
+        position = 0
+        refresh_start = time.perf_counter()
+        while position < len(component_files) and len(components) < count:
+            batch_size = max(count - len(components), BROWSE_BATCH_SIZE)
+            batch = []
+            for file_path in component_files[position:position + batch_size]:
+                try:
+                    batch.append((file_path, file_path.stat()))
+                except OSError:
+                    continue
+            position += batch_size
             
-            path_str = str(path).lower()
-            return any(pattern in path_str for pattern in exclude_patterns)
+            if self.use_index:
+                index = self._get_index(project_dir)
+                with self._get_project_lock(project_dir):
+                    counts = index.apply_changes(
+                        batch, [], lambda stale: self._analyze_files(stale, workers, diagnostics)
+                    )
+                    results = [index.component(file_path) for file_path, _ in batch]
+                if diagnostics is not None:
+                    diagnostics.count("cache_hits", counts["hits"])
+            else:
+                results = self._analyze_files(batch, workers, diagnostics)
+            
+            for component in results:
+                if component:
+                    components.append(component)
+                    if len(components) >= count:
+                        break
+        
+        if diagnostics is not None:
+            diagnostics.add_time("refresh", time.perf_counter() - refresh_start)
+        
+        exhausted = position >= len(component_files) and len(components) < count
+        return components, exhausted
+    
+    def _resolve_limit(self, limit: Optional[int], has_filter: bool) -> int:
+        """确定每页返回的组件数"""
+        if limit is None:
+            return DEFAULT_RESULT_LIMIT if has_filter else DEFAULT_BROWSE_LIMIT
+        return min(max(int(limit), 1), MAX_RESULT_LIMIT)
+    
+    def _query_key(
+        self,
+        project_dir: Path,
+        component_type: Optional[str],
+        keywords: Optional[List[str]],
+        packages: Optional[List[str]] = None
+    ) -> str:
+        """查询条件的指纹，写入翻页游标，防止游标用于其他查询"""
+        normalized = json.dumps(
+            [str(project_dir), (component_type or '').lower(), [k.lower() for k in keywords or []],
+             sorted(packages or [])],
+            ensure_ascii=False
+        )
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:8]
+    
+    def _encode_cursor(self, offset: int, query_key: str) -> str:
+        """生成翻页游标"""
+        return f"{offset}-{query_key}"
+    
+    def _decode_cursor(self, cursor: str, query_key: str) -> Optional[int]:
+        """解析翻页游标，与当前查询不匹配时返回 None"""
+        offset_text, _, key = str(cursor).strip().partition('-')
+        if key != query_key or not offset_text.isdigit():
+            return None
+        return int(offset_text)
+    
+    def _result_key(
+        self,
+        project_dir: Path,
+        project_path: str,
+        components: List[ComponentRecord],
+        component_type: Optional[str],
+        keywords: Optional[List[str]],
+        packages: Optional[List[str]],
+        scope: Optional[List[WorkspacePackage]],
+        limit: int,
+        offset: int
+    ) -> Optional[tuple]:
+        """
+        结果缓存的键：规范化的查询条件 + 组件索引的 generation
+        
+        不使用组件索引，或组件列表已不是索引当前的列表（查询期间索引被并发更新）时返回 None，不缓存
+        """
+        if not self.use_index:
+            return None
+        
+        index = self._get_index(project_dir)
+        with self._get_project_lock(project_dir):
+            current = index.components(scope) if scope else index.components()
+            generation = index.generation
+        if current is not components:
+            return None
+        
+        return (
+            str(project_dir),
+            project_path,  # 出现在"未找到"的结果文本中
+            (component_type or '').strip().lower(),
+            tuple(keyword.strip().lower() for keyword in keywords or []),
+            tuple(sorted(packages or [])),
+            limit,
+            offset,
+            generation
+        )
+    
+    def _cached_result(self, key: Optional[tuple]) -> Optional[str]:
+        """取出缓存的结果（命中时移到最近使用的位置）"""
+        if key is None:
+            return None
+        with self._lock:
+            result = self._result_cache.get(key)
+            if result is not None:
+                self._result_cache.move_to_end(key)
+            return result
+    
+    def _store_result(self, key: Optional[tuple], result: str) -> None:
+        """缓存格式化好的结果，超出容量时淘汰最久未使用的结果"""
+        if key is None or result.startswith("❌"):
+            return
+        with self._lock:
+            # 同一项目旧 generation 的结果不会再命中，一并移除
+            for stale in [
+                cached for cached in self._result_cache
+                if cached[0] == key[0] and cached[-1] != key[-1]
+            ]:
+                del self._result_cache[stale]
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
+    def _invalidate_results(self, project_dir: Path) -> None:
+        """组件索引变化后丢弃该项目缓存的结果"""
+        project_key = str(project_dir)
+        with self._lock:
+            for key in [key for key in self._result_cache if key[0] == project_key]:
+                del self._result_cache[key]
+    
+    def _format_page(
+        self,
+        components: List[ScoredComponent],
+        offset: int,
+        total: Optional[int],
+        query_key: str,
+        file_count: Optional[int] = None,
+        has_more: Optional[bool] = None,
+        duplicates: Optional[Dict[str, List[ComponentRecord]]] = None,
+        usage: Optional[UsageGraph] = None
+    ) -> str:
+        """格式化一页结果，并附上分页信息"""
+        result = self._format_component_suggestions(components, duplicates, usage)
+        
+        end = offset + len(components)
+        if has_more is None:
+            has_more = total is not None and end < total
+        if total is not None:
+            page_info = f"📄 第 {offset + 1}-{end} 个，共 {total} 个"
+        else:
+            page_info = f"📄 第 {offset + 1}-{end} 个（项目中共 {file_count} 个组件文件）"
+        if has_more:
+            page_info += f"；下一页：`cursor=\"{self._encode_cursor(end, query_key)}\"`"
+        elif offset == 0:
+            # 单页即是全部结果时不附加分页信息
+            return result
+        
+        return f"{result}\n{page_info}"
+    
+    def _find_component_files(
+        self,
+        project_dir: Path,
+        diagnostics: Optional[ScanDiagnostics] = None,
+        workspace: Optional[List[WorkspacePackage]] = None,
+        scope: Optional[List[WorkspacePackage]] = None
+    ) -> List[Path]:
+        """
+        查找项目中的组件文件（git ls-files 或单次遍历，排除目录在进入前剪枝）
+        
+        workspace 为 monorepo 的包列表时各包并发遍历；scope 指定时只查找这些包中的文件
+        """
+        component_files = []
+        stats: Dict[str, int] = {}
+        start = time.perf_counter()
         
         try:
-            for pattern in patterns:
-                for file_path in project_dir.glob(pattern):
-                    if file_path.is_file() and not should_exclude_path(file_path):
-                        component_files.append(file_path)
+            # git ls-files 的计数单独累加，回退到目录遍历时不重复计数
+            git_stats: Dict[str, int] = {}
+            git_files = git_component_files(project_dir, git_stats) if self.use_git else None
+            if git_files and scope is not None:
+                prefixes = tuple(str(package.path) + os.sep for package in scope)
+                git_files = [file_path for file_path in git_files if str(file_path).startswith(prefixes)]
             
-            # 去重并排序
-            component_files = sorted(list(set(component_files)))
+            # 不是 git 仓库，或项目目录本身被忽略时回退到目录遍历
+            if git_files:
+                component_files = git_files
+                stats.update(git_stats)
+            elif workspace:
+                component_files = walk_workspace_files(project_dir, workspace, scope, stats=stats)
+            else:
+                component_files = walk_component_files(project_dir, stats=stats)
+            if workspace:
+                stats["packages"] = len(scope if scope is not None else workspace)
             logger.info(f"找到 {len(component_files)} 个组件文件")
             
         except Exception as e:
             logger.error(f"搜索组件文件时出错: {str(e)}")
         
+        if diagnostics is not None:
+            diagnostics.add_time("discovery", time.perf_counter() - start)
+            for name, value in stats.items():
+                diagnostics.count(name, value)
+        
         return component_files
     
-    def _analyze_component_file(self, file_path: Path) -> Optional[Dict]:
+    def _get_scan_executor(self) -> ThreadPoolExecutor:
+        """获取扫描线程池"""
+        with self._lock:
+            if self._scan_executor is None:
+                self._scan_executor = ThreadPoolExecutor(
+                    max_workers=SCAN_THREADS, thread_name_prefix="component-scan"
+                )
+            return self._scan_executor
+    
+    def _get_project_lock(self, project_dir: Path) -> threading.Lock:
+        """获取项目对应的扫描锁"""
+        key = str(project_dir.resolve())
+        with self._lock:
+            if key not in self._project_locks:
+                self._project_locks[key] = threading.Lock()
+            return self._project_locks[key]
+    
+    def _get_index(self, project_dir: Path):
+        """获取（必要时创建）项目对应的组件索引：monorepo 为按包分片的 WorkspaceIndex，否则为 ComponentIndex"""
+        key = str(project_dir.resolve())
+        with self._lock:
+            if key not in self._indexes:
+                workspace = self._workspaces.get(key)
+                if workspace:
+                    self._indexes[key] = WorkspaceIndex(self.index_dir, project_dir, workspace)
+                else:
+                    self._indexes[key] = ComponentIndex(self.index_dir, project_dir)
+            return self._indexes[key]
+    
+    def _detect_workspace(self, project_dir: Path) -> List[WorkspacePackage]:
+        """重新识别项目的 workspace 包，并同步到已有的组件索引"""
+        packages = detect_workspace_packages(project_dir) if self.use_workspaces else []
+        key = str(project_dir.resolve())
+        with self._lock:
+            self._workspaces[key] = packages
+            index = self._indexes.get(key)
+        
+        if isinstance(index, WorkspaceIndex) and packages:
+            with self._get_project_lock(project_dir):
+                index.set_packages(packages)
+        elif index is not None and isinstance(index, WorkspaceIndex) != bool(packages):
+            # 项目在普通项目和 monorepo 之间切换：丢弃内存中的索引，下次按新的结构加载
+            with self._lock:
+                self._indexes.pop(key, None)
+        return packages
+    
+    def _cached_workspace(self, project_dir: Path) -> List[WorkspacePackage]:
+        """最近一次识别到的 workspace 包（没有识别过时重新识别）"""
+        with self._lock:
+            packages = self._workspaces.get(str(project_dir.resolve()))
+        return packages if packages is not None else self._detect_workspace(project_dir)
+    
+    def _collect_components(
+        self, 
+        project_dir: Path, 
+        component_files: List[Path],
+        workers: int = 1,
+        diagnostics: Optional[ScanDiagnostics] = None,
+        scope: Optional[List[WorkspacePackage]] = None
+    ) -> List[ComponentRecord]:
+        """
+        分析组件文件，启用索引时只分析新增或变更的文件
+        
+        monorepo 的各个分片并发同步；scope 指定时文件列表只覆盖这些包，其他包的分片保持不变
+        """
+        start = time.perf_counter()
+        files = []
+        for file_path in component_files:
+            try:
+                files.append((file_path, file_path.stat()))
+            except OSError:
+                continue
+        
+        def analyze_batch(batch):
+            return self._analyze_files(batch, workers, diagnostics)
+        
+        if not self.use_index:
+            components = [component for component in analyze_batch(files) if component]
+            if diagnostics is not None:
+                diagnostics.add_time("refresh", time.perf_counter() - start)
+            return components
+        
+        index = self._get_index(project_dir)
+        with self._get_project_lock(project_dir):
+            if scope:
+                counts = index.refresh(files, analyze_batch, scope)
+                components = index.components(scope)
+            else:
+                counts = index.refresh(files, analyze_batch)
+                components = index.components()
+        if counts["analyzed"] or counts["removed"]:
+            self._invalidate_results(project_dir)
+        if diagnostics is not None:
+            diagnostics.add_time("refresh", time.perf_counter() - start)
+            diagnostics.count("cache_hits", counts["hits"])
+        logger.info(
+            f"组件索引: 命中 {counts['hits']} 个, 重新分析 {counts['analyzed']} 个, "
+            f"移除 {counts['removed']} 个"
+        )
+        return components
+    
+    def _get_search_index(
+        self,
+        project_dir: Path,
+        components: List[ComponentRecord],
+        scope: Optional[List[WorkspacePackage]] = None
+    ) -> ComponentSearchIndex:
+        """获取组件列表对应的倒排索引，启用组件索引时按 generation 复用"""
+        if self.use_index:
+            with self._get_project_lock(project_dir):
+                index = self._get_index(project_dir)
+                search_index = index.search_index(scope) if scope else index.search_index()
+            # 并发扫描可能已经更新了索引，此时为本次结果单独建立
+            if search_index.components is components:
+                return search_index
+        return ComponentSearchIndex(components)
+    
+    def _resolve_use_git(self, use_git: Optional[bool]) -> bool:
+        """确定是否用 git ls-files 枚举文件：参数 > 环境变量"""
+        if use_git is not None:
+            return bool(use_git)
+        return os.environ.get(GIT_FILES_ENV, '').strip().lower() in ('1', 'true', 'on', 'yes')
+    
+    def _resolve_lazy_analysis(self, lazy_analysis: Optional[bool]) -> bool:
+        """确定冷启动查询是否两阶段分析：参数 > 环境变量，默认开启"""
+        if lazy_analysis is not None:
+            return bool(lazy_analysis)
+        return os.environ.get(LAZY_ANALYSIS_ENV, '').strip().lower() not in ('0', 'false', 'off', 'no')
+    
+    def _resolve_max_file_bytes(self, max_file_bytes: Optional[int]) -> int:
+        """确定单文件大小上限：参数 > 环境变量 > 默认值；0 表示不限制"""
+        if max_file_bytes is not None:
+            return max(int(max_file_bytes), 0)
+        
+        env_value = os.environ.get(MAX_FILE_KB_ENV, '').strip()
+        if not env_value:
+            return DEFAULT_MAX_FILE_BYTES
+        try:
+            return max(int(env_value), 0) * 1024
+        except ValueError:
+            logger.warning(f"{MAX_FILE_KB_ENV}={env_value} 不是有效的大小，使用默认上限")
+            return DEFAULT_MAX_FILE_BYTES
+    
+    def _resolve_watch_mode(self, watch: Optional[str]) -> Optional[str]:
+        """确定文件监听模式：参数 > 环境变量；返回 "inotify"、"poll" 或 None"""
+        if watch is None:
+            watch = os.environ.get(WATCH_ENV, '')
+        
+        watch = str(watch).strip().lower()
+        if watch in ('', '0', 'false', 'off', 'no'):
+            return None
+        if watch in ('poll', 'polling'):
+            return 'poll'
+        return 'inotify'
+    
+    def _apply_watch_changes(self, project_dir: Path, paths: Optional[set]) -> None:
+        """
+        文件监听回调：把变化应用到组件索引
+        
+        paths 为 None 时整体重新同步（只重新分析变化过的文件）；
+        使用 git ls-files 枚举时同样整体同步，以遵循 .gitignore
+        """
+        if paths is None or self.use_git:
+            component_files = self._find_component_files(project_dir, workspace=self._detect_workspace(project_dir))
+            self._collect_components(project_dir, component_files, self._resolve_workers(None))
+            return
+        
+        present = []
+        removed = []
+        for path in paths:
+            try:
+                file_stat = path.stat()
+            except OSError:
+                removed.append(path)
+                continue
+            
+            if path.is_dir():
+                if any(is_excluded_dir(part) for part in path.relative_to(project_dir).parts):
+                    continue
+                # 新增或移入的目录：其中的组件文件全部视为变化
+                for file_path in walk_component_files(
+                    path, in_components=is_under_components_dir(project_dir, path)
+                ):
+                    try:
+                        present.append((file_path, file_path.stat()))
+                    except OSError:
+                        continue
+            elif is_candidate_path(project_dir, path):
+                present.append((path, file_stat))
+            else:
+                removed.append(path)
+        
+        workers = self._resolve_workers(None)
+        index = self._get_index(project_dir)
+        with self._get_project_lock(project_dir):
+            counts = index.apply_changes(
+                present, removed, lambda batch: self._analyze_files(batch, workers)
+            )
+        if counts["analyzed"] or counts["removed"]:
+            self._invalidate_results(project_dir)
+            logger.info(
+                f"组件索引增量更新 {project_dir}: 重新分析 {counts['analyzed']} 个, "
+                f"移除 {counts['removed']} 个"
+            )
+    
+    def _resolve_workers(self, workers: Optional[int]) -> int:
+        """确定并行分析的进程数：调用参数 > 环境变量 > 串行"""
+        if workers is None:
+            env_value = os.environ.get(WORKERS_ENV, '').strip().lower()
+            if env_value == 'auto':
+                workers = os.cpu_count() or 1
+            elif env_value:
+                try:
+                    workers = int(env_value)
+                except ValueError:
+                    logger.warning(f"{WORKERS_ENV}={env_value} 不是有效的进程数，使用串行分析")
+                    workers = 1
+            else:
+                workers = 1
+        
+        return max(1, min(int(workers), os.cpu_count() or 1))
+    
+    def _analyze_files(
+        self,
+        files: List[Tuple[Path, os.stat_result]],
+        workers: int,
+        diagnostics: Optional[ScanDiagnostics] = None
+    ) -> List[Optional[ComponentRecord]]:
+        """
+        批量分析组件文件，结果与输入顺序一致
+        
+        workers > 1 且文件足够多时分块提交到进程池，按块顺序合并，保证结果确定；
+        超过大小上限的文件直接跳过，不读取也不提交到进程池
+        """
+        if self.max_file_bytes:
+            oversized = {
+                position for position, (_, file_stat) in enumerate(files)
+                if file_stat.st_size > self.max_file_bytes
+            }
+            if oversized:
+                if diagnostics is not None:
+                    diagnostics.count("files_skipped", len(oversized))
+                analyzed = iter(self._analyze_files(
+                    [item for position, item in enumerate(files) if position not in oversized],
+                    workers, diagnostics
+                ))
+                return [None if position in oversized else next(analyzed) for position in range(len(files))]
+        
+        results: List[TimedAnalysis] = []
+        if workers <= 1 or len(files) < PARALLEL_MIN_FILES:
+            seen: ContentCache = {}
+            results = [self._analyze_component_file_timed(path, stat, seen) for path, stat in files]
+        else:
+            chunk_size = max(1, min(PARALLEL_MAX_CHUNK, len(files) // (workers * 4)))
+            chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+            
+            pool = None
+            try:
+                pool = self._get_pool(workers)
+                analyze_chunk = partial(_analyze_chunk, max_file_bytes=self.max_file_bytes)
+                for chunk_result in pool.map(analyze_chunk, chunks):
+                    results.extend(chunk_result)
+            except Exception as e:
+                logger.warning(f"并行分析失败，改为串行分析: {str(e)}")
+                if isinstance(e, BrokenProcessPool):
+                    self._discard_pool(workers, pool)
+                seen = {}
+                results = [self._analyze_component_file_timed(path, stat, seen) for path, stat in files]
+        
+        if diagnostics is not None:
+            for (file_path, file_stat), (_, read_seconds, extract_seconds) in zip(files, results):
+                diagnostics.record_file(str(file_path), read_seconds, extract_seconds, file_stat.st_size)
+            hashes = [component.content_hash for component, _, _ in results if component]
+            diagnostics.count("duplicates", len(hashes) - len(set(hashes)))
+        
+        return [component for component, _, _ in results]
+    
+    def _get_pool(self, workers: int) -> ProcessPoolExecutor:
+        """
+        获取指定进程数的进程池（每种进程数一个，不会关闭其他扫描正在使用的进程池）
+        
+        工作进程以 spawn 方式启动：服务进程中有扫描、监听和写入线程，fork 出的子进程
+        可能继承被其他线程持有的锁而卡死
+        """
+        with self._lock:
+            pool = self._pools.get(workers)
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                self._pools[workers] = pool
+            return pool
+    
+    def _discard_pool(self, workers: int, pool: Optional[ProcessPoolExecutor]) -> None:
+        """丢弃已损坏的进程池（工作进程异常退出），下次并行分析时重新创建"""
+        if pool is None:
+            return
+        with self._lock:
+            if self._pools.get(workers) is pool:
+                del self._pools[workers]
+        pool.shutdown(wait=False)
+    
+    def _shutdown_pool(self) -> None:
+        """关闭全部并行分析进程池"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=False)
+    
+    def shutdown(self) -> None:
+        """停止文件监听，关闭并行分析进程池和扫描线程池"""
+        if self._watcher is not None:
+            self._watcher.stop()
+        self._shutdown_pool()
+        with self._lock:
+            if self._scan_executor is not None:
+                self._scan_executor.shutdown(wait=False)
+                self._scan_executor = None
+    
+    def _analyze_component_file(
+        self, file_path: Path, file_stat: Optional[os.stat_result] = None
+    ) -> Optional[ComponentRecord]:
         """分析单个组件文件"""
+        return self._analyze_component_file_timed(file_path, file_stat)[0]
+    
+    def _analyze_component_file_timed(
+        self,
+        file_path: Path,
+        file_stat: Optional[os.stat_result] = None,
+        seen: Optional[ContentCache] = None
+    ) -> TimedAnalysis:
+        """
+        分析单个组件文件，同时返回读取和提取各自的耗时
+        
+        传入 seen 时按内容哈希去重：同一批中内容完全相同的文件只提取一次，
+        之后的文件复用提取结果，只重新计算与路径相关的名称和类型
+        """
+        start = time.perf_counter()
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if file_stat is None:
+                file_stat = file_path.stat()
+            
+            data, skip_reason = read_component_bytes(file_path, file_stat.st_size, self.max_file_bytes)
+            if data is None:
+                logger.debug(f"跳过组件文件 {file_path}: {skip_reason}")
+                return None, time.perf_counter() - start, 0.0
+            content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+            content = self._decode_content(data)
+        except Exception as e:
+            logger.error(f"分析组件文件 {file_path} 时出错: {str(e)}")
+            return None, time.perf_counter() - start, 0.0
+        
+        read_done = time.perf_counter()
+        cache_key = (content_hash, file_path.suffix)
+        if seen is not None and cache_key in seen:
+            template, content_type = seen[cache_key]
+            component = self._relocate_component(template, content_type, file_path, file_stat)
+        else:
+            component, content_type = self._analyze_content_typed(file_path, content, file_stat, content_hash)
+            if seen is not None:
+                seen[cache_key] = (component, content_type)
+        return component, read_done - start, time.perf_counter() - read_done
+    
+    def _decode_content(self, data: bytes) -> str:
+        """按 UTF-8 解码，换行统一为 \n（与文本模式读取一致）"""
+        content = data.decode('utf-8')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+    
+    def _relocate_component(
+        self,
+        template: Optional[ComponentRecord],
+        content_type: str,
+        file_path: Path,
+        file_stat: os.stat_result
+    ) -> Optional[ComponentRecord]:
+        """为内容相同的另一个文件生成记录（名称和类型依赖路径，需要重新计算）"""
+        if template is None:
+            return None
+        
+        component_name = self._extract_component_name(file_path)
+        return template.relocated(
+            name=component_name,
+            file_path=str(file_path),
+            component_type=self._guess_type_from_name(component_name) or content_type,
+            file_size=file_stat.st_size,
+            mtime=file_stat.st_mtime
+        )
+    
+    def _analyze_component_content(
+        self, file_path: Path, content: str, file_stat: os.stat_result, content_hash: str = ""
+    ) -> Optional[ComponentRecord]:
+        """分析已读入内存的组件文件内容"""
+        return self._analyze_content_typed(file_path, content, file_stat, content_hash)[0]
+    
+    def _analyze_content_typed(
+        self, file_path: Path, content: str, file_stat: os.stat_result, content_hash: str
+    ) -> Tuple[Optional[ComponentRecord], str]:
+        """分析组件文件内容，同时返回基于内容推测的类型（供内容相同的文件复用）"""
+        try:
+            # 一次性切分SFC各个块，后续提取器只在相关的块上匹配
+            blocks = split_sfc(content) if file_path.suffix == '.vue' else whole_file_blocks(content)
             
             # 检查是否是有效的UI组件
-            if not self._is_valid_ui_component(content, file_path):
-                return None
+            if not self._is_valid_ui_component(blocks, file_path):
+                return None, ""
             
             # 提取组件信息
             component_name = self._extract_component_name(file_path)
-            props, events = self._extract_props_and_events(content)
-            slots = self._extract_slots(content)
-            description = self._extract_description(content)
-            component_type = self._guess_component_type(component_name, content, file_path)
-            features = self._extract_features(content)
-            
-            return {
-                "name": component_name,
-                "file_path": str(file_path),
-                "relative_path": str(file_path.relative_to(file_path.parts[0])),
-                "type": component_type,
-                "description": description,
-                "props": props,
-                "events": events,
-                "slots": slots,
-                "features": features,
-                "file_size": file_path.stat().st_size,
-                "modified_time": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-            }
+            props, events = self._extract_props_and_events(blocks)
+            slots = self._extract_slots(blocks)
+            description = self._extract_description(blocks)
+            content_type = self._guess_type_from_content(blocks)
+            component_type = self._guess_type_from_name(component_name) or content_type
+            features = self._extract_features(blocks)
+            imports, tags = self._extract_usages(blocks)
+            
+            component = ComponentRecord.create(
+                name=component_name,
+                file_path=str(file_path),
+                component_type=component_type,
+                description=description,
+                props=props,
+                events=events,
+                slots=slots,
+                features=features,
+                file_size=file_stat.st_size,
+                mtime=file_stat.st_mtime,
+                content_hash=content_hash,
+                imports=imports,
+                tags=tags
+            )
+            return component, content_type
             
         except Exception as e:
             logger.error(f"分析组件文件 {file_path} 时出错: {str(e)}")
-            return None
+            return None, ""
     
-    def _is_valid_ui_component(self, content: str, file_path: Path) -> bool:
+    def _is_valid_ui_component(self, blocks: SfcBlocks, file_path: Path) -> bool:
         """判断是否是有效的UI组件"""
         
         # Vue文件检查
-        if file_path.suffix == '.vue':
-            return '<template>' in content and ('<script>' in content or '<script setup>' in content)
+        if blocks.is_sfc:
+            return blocks.has_template and blocks.has_script
         
         # JS/TS文件检查
-        ui_indicators = [
-            r'export\s+default\s*{.*template',
-            r'render\s*\(',
-            r'createElement\s*\(',
-            r'h\s*\(',
-            r'return\s+React\.createElement',
-            r'return\s+<\w+',
-            r'jsx',
-            r'tsx'
-        ]
-        
-        for pattern in ui_indicators:
-            if re.search(pattern, content, re.IGNORECASE | re.DOTALL):
-                return True
-        
-        return False
+        lowered = blocks.content.lower()
+        if _contains_any(lowered, _UI_INDICATOR_WORDS):
+            return True
+        export_match = _EXPORT_DEFAULT_OBJECT.search(lowered)
+        if export_match and lowered.find('template', export_match.end()) != -1:
+            return True
+        return any(pattern.search(lowered) for pattern in _UI_INDICATORS)
     
     def _extract_component_name(self, file_path: Path) -> str:
         """提取组件名称"""
@@ -200,35 +1603,29 @@ class ComponentFinder:
     def _to_pascal_case(self, text: str) -> str:
         """转换为PascalCase"""
         # 处理多种分隔符
-        words = re.split(r'[-_\s.]+', text)
+        words = _NAME_SEPARATORS.split(text)
         return ''.join(word.capitalize() for word in words if word)
     
-    def _extract_props_and_events(self, content: str) -> Tuple[List[Dict], List[str]]:
+    def _extract_props_and_events(self, blocks: SfcBlocks) -> Tuple[List[Dict], List[str]]:
         """提取props和events"""
-        props = self._extract_props_enhanced(content)
-        events = self._extract_events_enhanced(content)
+        props = self._extract_props_enhanced(blocks)
+        events = self._extract_events_enhanced(blocks)
         return props, events
     
-    def _extract_props_enhanced(self, content: str) -> List[Dict]:
+    def _extract_props_enhanced(self, blocks: SfcBlocks) -> List[Dict]:
         """增强的props提取"""
         props = []
         
         # Vue3 script setup props
-        script_setup_match = re.search(r'<script\s+setup[^>]*>(.*?)</script>', content, re.DOTALL)
-        if script_setup_match:
-            script_content = script_setup_match.group(1)
-            
-            # defineProps
-            props_match = re.search(r'defineProps\s*\(\s*({.*?}|\[.*?\])', script_content, re.DOTALL)
+        if blocks.script_setup:
+            props_match = _DEFINE_PROPS.search(blocks.script_setup)
             if props_match:
-                props_str = props_match.group(1)
-                props.extend(self._parse_props_object(props_str))
+                props.extend(self._parse_props_object(props_match.group(1)))
         
         # Vue2/3 options API
-        options_match = re.search(r'props\s*:\s*({.*?}|\[.*?\])', content, re.DOTALL)
+        options_match = _PROPS_OPTION.search(blocks.script)
         if options_match:
-            props_str = options_match.group(1)
-            props.extend(self._parse_props_object(props_str))
+            props.extend(self._parse_props_object(options_match.group(1)))
         
         return props
     
@@ -238,8 +1635,7 @@ class ComponentFinder:
         
         # 简单的props数组格式
         if props_content.strip().startswith('['):
-            array_props = re.findall(r'["\'](\w+)["\']', props_content)
-            for prop in array_props:
+            for prop in _QUOTED_WORD.findall(props_content):
                 props.append({
                     "name": prop,
                     "type": "any",
@@ -249,8 +1645,7 @@ class ComponentFinder:
             return props
         
         # 对象格式props
-        prop_matches = re.finditer(r'(\w+)\s*:\s*({[^}]*}|\w+)', props_content)
-        for match in prop_matches:
+        for match in _PROP_ENTRY.finditer(props_content):
             prop_name = match.group(1)
             prop_def = match.group(2)
             
@@ -278,7 +1673,7 @@ class ComponentFinder:
                 prop_info["required"] = True
             
             # 提取默认值
-            default_match = re.search(r'default\s*:\s*([^,}]+)', prop_def)
+            default_match = _PROP_DEFAULT.search(prop_def)
             if default_match:
                 prop_info["default"] = default_match.group(1).strip()
             
@@ -286,66 +1681,47 @@ class ComponentFinder:
         
         return props
     
-    def _extract_events_enhanced(self, content: str) -> List[str]:
+    def _extract_events_enhanced(self, blocks: SfcBlocks) -> List[str]:
         """增强的事件提取"""
-        events = []
-        
-        # $emit 调用
-        emit_matches = re.finditer(r'\$emit\s*\(\s*["\']([^"\']+)["\']', content)
-        for match in emit_matches:
-            events.append(match.group(1))
+        # $emit 调用（模板和脚本里都可能出现）
+        events = _EMIT_CALL.findall(blocks.code) if '$emit' in blocks.code else []
         
         # defineEmits (Vue3)
-        emits_match = re.search(r'defineEmits\s*\(\s*\[([^\]]+)\]', content)
+        emits_match = _DEFINE_EMITS.search(blocks.script)
         if emits_match:
-            emits_str = emits_match.group(1)
-            event_matches = re.findall(r'["\']([^"\']+)["\']', emits_str)
-            events.extend(event_matches)
+            events.extend(_QUOTED_STRING.findall(emits_match.group(1)))
         
         # emits选项
-        emits_option_match = re.search(r'emits\s*:\s*\[([^\]]+)\]', content)
+        emits_option_match = _EMITS_OPTION.search(blocks.script)
         if emits_option_match:
-            emits_str = emits_option_match.group(1)
-            event_matches = re.findall(r'["\']([^"\']+)["\']', emits_str)
-            events.extend(event_matches)
+            events.extend(_QUOTED_STRING.findall(emits_option_match.group(1)))
         
-        return list(set(events))  # 去重
+        return list(dict.fromkeys(events))  # 去重并保持出现顺序
     
-    def _extract_slots(self, content: str) -> List[str]:
+    def _extract_slots(self, blocks: SfcBlocks) -> List[str]:
         """提取插槽信息"""
-        slots = []
-        
-        # <slot> 标签
-        slot_matches = re.finditer(r'<slot\s+name=["\']([^"\']+)["\']', content)
-        for match in slot_matches:
-            slots.append(match.group(1))
+        slots = _NAMED_SLOT.findall(blocks.template)
         
         # 默认插槽
-        if '<slot>' in content or '<slot/>' in content:
+        if '<slot>' in blocks.template or '<slot/>' in blocks.template:
             slots.append('default')
         
-        return list(set(slots))
+        return list(dict.fromkeys(slots))
     
-    def _extract_description(self, content: str) -> str:
+    def _extract_description(self, blocks: SfcBlocks) -> str:
         """提取组件描述"""
         # 从注释中提取
-        comment_desc = self._extract_component_level_comment(content)
+        comment_desc = self._extract_component_level_comment(blocks.content)
         if comment_desc:
             return comment_desc
         
         # 智能生成描述
-        return self._generate_smart_description(content)
+        return self._generate_smart_description(blocks)
     
     def _extract_component_level_comment(self, content: str) -> str:
-        """提取组件级别的注释"""
-        patterns = [
-            r'/\*\*\s*\n?\s*\*\s*([^\n*]+)',  # JSDoc注释
-            r'//\s*([^\n]+)',  # 单行注释
-            r'<!--\s*([^-]+)\s*-->'  # HTML注释
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, content)
+        """提取组件级别的注释（JSDoc注释、单行注释、HTML注释依次查找）"""
+        for pattern in _COMMENT_PATTERNS:
+            match = pattern.search(content)
             if match:
                 desc = match.group(1).strip()
                 if len(desc) > 10:  # 过滤掉过短的注释
@@ -353,170 +1729,168 @@ class ComponentFinder:
         
         return ""
     
-    def _generate_smart_description(self, content: str) -> str:
+    def _generate_smart_description(self, blocks: SfcBlocks) -> str:
         """智能生成组件描述"""
-        template_features = self._analyze_template_features(content)
-        interaction_capabilities = self._analyze_interaction_capabilities(content)
+        template_features = self._analyze_template_features(blocks)
+        interaction_capabilities = self._analyze_interaction_capabilities(blocks)
         
         if template_features or interaction_capabilities:
             return f"{template_features} {interaction_capabilities}".strip()
         
         return "Vue组件"
     
-    def _analyze_template_features(self, content: str) -> str:
+    def _analyze_template_features(self, blocks: SfcBlocks) -> str:
         """分析模板特性"""
-        features = []
-        
-        if re.search(r'<form|@submit', content):
-            features.append("表单")
-        if re.search(r'<table|<thead|<tbody', content):
-            features.append("表格")
-        if re.search(r'v-for|:key', content):
-            features.append("列表")
-        if re.search(r'<input|<select|<textarea', content):
-            features.append("输入")
-        if re.search(r'<button|@click', content):
-            features.append("交互")
-        if re.search(r'<img|image', content):
-            features.append("图片")
+        template = blocks.template
+        features = [label for needles, label in _TEMPLATE_FEATURES if _contains_any(template, needles)]
         
         return "包含" + "、".join(features) + "功能" if features else ""
     
-    def _analyze_interaction_capabilities(self, content: str) -> str:
+    def _analyze_interaction_capabilities(self, blocks: SfcBlocks) -> str:
         """分析交互能力"""
         capabilities = []
         
-        if re.search(r'\$emit|defineEmits', content):
+        if _contains_any(blocks.code, _EMIT_USAGE):
             capabilities.append("事件通信")
-        if re.search(r'props|defineProps', content):
+        if 'props' in blocks.script:  # 同时覆盖 defineProps
             capabilities.append("属性配置")
-        if re.search(r'<slot', content):
+        if '<slot' in blocks.template:
             capabilities.append("内容插槽")
-        if re.search(r'v-model', content):
+        if 'v-model' in blocks.template:
             capabilities.append("双向绑定")
         
         return "支持" + "、".join(capabilities) if capabilities else ""
     
-    def _extract_features(self, content: str) -> List[str]:
+    def _extract_features(self, blocks: SfcBlocks) -> List[str]:
         """提取组件特性"""
         features = []
+        script = blocks.script
         
         # 基础特性检测
-        if re.search(r'v-model', content):
+        if 'v-model' in blocks.template:
             features.append("双向数据绑定")
-        if re.search(r'<slot', content):
+        if '<slot' in blocks.template:
             features.append("插槽支持")
-        if re.search(r'\$emit|defineEmits', content):
+        if _contains_any(blocks.code, _EMIT_USAGE):
             features.append("事件通信")
-        if re.search(r'watch|computed', content):
+        if _contains_any(script, _REACTIVE_USAGE):
             features.append("响应式数据")
-        if re.search(r'scoped', content):
+        if 'scoped' in (blocks.style_attrs if blocks.is_sfc else blocks.content):
             features.append("样式隔离")
-        if re.search(r'async|await|Promise', content):
+        if _contains_any(script, _ASYNC_USAGE):
             features.append("异步处理")
-        if re.search(r'props|defineProps', content):
+        if 'props' in script:
             features.append("属性配置")
-        if re.search(r'typescript|ts|interface', content):
+        if _contains_any(blocks.script_attrs, _TYPESCRIPT_USAGE) or _contains_any(script, _TYPESCRIPT_USAGE):
             features.append("TypeScript")
         
         return features
     
-    def _guess_component_type(self, name: str, content: str, file_path: Path) -> str:
-        """推测组件类型"""
+    def _extract_usages(self, blocks: SfcBlocks) -> Tuple[List[str], List[str]]:
+        """提取引用的本地模块（脚本中的 import）和使用的组件标签（模板中的自定义标签）"""
+        script = blocks.script
+        imports = [
+            spec for pattern in (_FROM_IMPORT, _BARE_IMPORT)
+            for spec in pattern.findall(script) if is_local_import(spec)
+        ]
+        tags = _COMPONENT_TAG.findall(blocks.template)
+        return list(dict.fromkeys(imports)), sorted(set(tags))
+    
+    def _guess_type_from_name(self, name: str) -> Optional[str]:
+        """基于名称推测组件类型"""
         name_lower = name.lower()
-        content_lower = content.lower()
-        
-        # 基于名称推测
-        type_keywords = {
-            "table": ["table", "grid", "list", "data"],
-            "form": ["form", "input", "field", "edit"],
-            "modal": ["modal", "dialog", "popup", "overlay"],
-            "card": ["card", "panel", "item"],
-            "button": ["button", "btn", "action"],
-            "navigation": ["nav", "menu", "header", "sidebar"],
-            "layout": ["layout", "container", "wrapper"],
-            "display": ["show", "display", "view", "preview"]
-        }
-        
-        for comp_type, keywords in type_keywords.items():
+        for comp_type, keywords in _TYPE_NAME_KEYWORDS.items():
             if any(keyword in name_lower for keyword in keywords):
                 return comp_type
-        
-        # 基于内容推测
-        if re.search(r'<table|<thead|<tbody|<tr|<td', content):
+        return None
+    
+    def _guess_type_from_content(self, blocks: SfcBlocks) -> str:
+        """基于内容推测组件类型（模板结构，弹窗还参考样式中的定位）"""
+        template = blocks.template
+        if _contains_any(template, _TABLE_MARKUP):
             return "table"
-        elif re.search(r'<form|<input|<select|<textarea', content):
+        elif _contains_any(template, _FORM_MARKUP):
             return "form"
-        elif re.search(r'v-show|v-if.*modal|position.*fixed|z-index', content):
+        elif ('v-show' in template or _V_IF_MODAL.search(template)
+              or 'z-index' in blocks.style or _POSITION_FIXED.search(blocks.style)):
             return "modal"
-        elif re.search(r'<nav|<menu|router-link', content):
+        elif _contains_any(template, _NAV_MARKUP):
             return "navigation"
-        elif re.search(r'<button|@click.*button', content):
+        elif '<button' in template or _CLICK_BUTTON.search(template):
             return "button"
         
         return "component"
     
     def _intelligent_component_filter(
         self, 
-        components: List[Dict], 
+        components: List[ComponentRecord], 
         component_type: Optional[str],
-        keywords: Optional[List[str]]
-    ) -> List[Dict]:
-        """智能组件过滤"""
-        if not component_type and not keywords:
-            return components[:10]  # 返回前10个
-        
-        # 计算相似度分数
-        scored_components = []
-        for component in components:
-            score = self._calculate_component_similarity(component, component_type, keywords)
-            if score > 0:
-                component["similarity_score"] = score
-                scored_components.append(component)
-        
-        # 按分数排序
-        scored_components.sort(key=lambda x: x["similarity_score"], reverse=True)
+        keywords: Optional[List[str]],
+        search_index: Optional[ComponentSearchIndex] = None,
+        limit: int = DEFAULT_RESULT_LIMIT,
+        offset: int = 0,
+        usage: Optional[UsageGraph] = None
+    ) -> Tuple[List[ScoredComponent], int]:
+        """
+        智能组件过滤：类型和各个关键词都是 BM25 的一个查询子句，
+        稀有的词（如少见的 prop 名）比常见的词（如路径中的 table）得分更高；
+        总分除以各子句最高可能得分之和，归一化为 0-1 的相似度。
+        传入 usage 时被引用多的组件排名靠前（只影响排序，不改变相似度）
         
-        return scored_components[:8]  # 返回最相关的8个
-    
-    def _calculate_component_similarity(
-        self, 
-        component: Dict, 
-        target_type: Optional[str], 
-        keywords: Optional[List[str]]
-    ) -> float:
-        """计算组件相似度"""
-        score = 0.0
-        
-        # 类型匹配 (40%权重)
-        if target_type:
-            type_score = self._calculate_type_similarity(component, target_type)
-            score += type_score * 0.4
-        
-        # 关键词匹配 (60%权重)
-        if keywords:
-            component_text = self._build_component_full_text(component)
-            keyword_score = self._calculate_keyword_similarity(component_text, keywords)
-            score += keyword_score * 0.6
-        
-        return min(score, 1.0)
-    
-    def _build_component_full_text(self, component: Dict) -> str:
-        """构建组件的全文本用于搜索"""
-        texts = [
-            component.get("name", ""),
-            component.get("description", ""),
-            component.get("type", ""),
-            " ".join(component.get("features", [])),
-            " ".join([prop.get("name", "") for prop in component.get("props", [])]),
-            " ".join(component.get("events", [])),
-            component.get("relative_path", "")
-        ]
-        return " ".join(texts).lower()
+        Returns:
+            (当前页的组件及相似度, 匹配的组件总数)
+        """
+        if not component_type and not keywords:
+            return [(component, 0.0) for component in components[offset:offset + limit]], len(components)
+        
+        if search_index is None:
+            search_index = ComponentSearchIndex(components)
+        
+        # 各子句的 (组件ID -> 得分, 最高可能得分)，只累加命中倒排表的组件
+        clauses = []
+        if component_type:
+            target_type = component_type.lower()
+            clauses.append(search_index.match_types({
+                comp_type: self._calculate_type_similarity(comp_type, target_type)
+                for comp_type in search_index.type_postings
+            }))
+        for keyword in keywords or []:
+            clauses.append(search_index.match_keyword(keyword))
+        
+        max_total = sum(upper for _, upper in clauses)
+        if max_total <= 0:
+            return [], 0
+        
+        scale = 1.0 / max_total
+        scores: Dict[int, float] = {}
+        for clause_scores, _ in clauses:
+            if not scores:
+                scores = {doc_id: score * scale for doc_id, score in clause_scores.items()}
+                continue
+            for doc_id, score in clause_scores.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score * scale
+        
+        # 内容相同的组件只保留得分最高的一个，其他位置在结果中一并列出
+        scores = search_index.collapse_duplicates(scores)
+        
+        # 只选出前 offset + limit 名（堆选择，不对全部命中排序），同分按路径顺序
+        usage_counts = usage.counts() if usage is not None else None
+        if usage_counts:
+            def rank_key(item):
+                count = usage_counts.get(components[item[0]].file_path, 0)
+                return -item[1] * (1.0 + USAGE_BOOST * math.log1p(count)), item[0]
+        else:
+            def rank_key(item):
+                return -item[1], item[0]
+        ranked = heapq.nsmallest(offset + limit, scores.items(), key=rank_key)[offset:]
+        
+        # 分数单独返回，不写入索引中缓存的记录
+        page = [(components[doc_id], min(score, 1.0)) for doc_id, score in ranked]
+        return page, len(scores)
     
-    def _calculate_type_similarity(self, component: Dict, target_type: str) -> float:
+    def _calculate_type_similarity(self, component_type: str, target_type: str) -> float:
         """计算类型相似度"""
-        component_type = component.get("type", "").lower()
+        component_type = component_type.lower()
         target_type = target_type.lower()
         
         if component_type == target_type:
@@ -539,64 +1913,14 @@ class ComponentFinder:
         
         return 0.0
     
-    def _calculate_keyword_similarity(self, component_text: str, keywords: List[str]) -> float:
-        """计算关键词相似度"""
-        if not keywords:
-            return 0.0
-        
-        total_score = 0.0
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            # 精确匹配
-            if keyword_lower in component_text:
-                total_score += 1.0
-            # 模糊匹配
-            elif self._fuzzy_match(keyword_lower, component_text) > 0.7:
-                total_score += 0.7
-        
-        return min(total_score / len(keywords), 1.0)
-    
-    def _fuzzy_match(self, keyword: str, text: str) -> float:
-        """模糊匹配算法"""
-        words = text.split()
-        max_similarity = 0.0
-        
-        for word in words:
-            similarity = self._string_similarity(keyword, word)
-            max_similarity = max(max_similarity, similarity)
-        
-        return max_similarity
-    
-    def _string_similarity(self, s1: str, s2: str) -> float:
-        """计算字符串相似度"""
-        if not s1 or not s2:
-            return 0.0
-        
-        # 简单的编辑距离相似度
-        len1, len2 = len(s1), len(s2)
-        if len1 == 0 or len2 == 0:
-            return 0.0
-        
-        # 包含关系
-        if s1 in s2 or s2 in s1:
-            return 0.8
-        
-        # 字符重叠度
-        common_chars = set(s1) & set(s2)
-        total_chars = set(s1) | set(s2)
-        
-        if total_chars:
-            return len(common_chars) / len(total_chars)
-        
-        return 0.0
-    
-    def _generate_search_suggestions(self, all_components: List[Dict], keywords: Optional[List[str]]) -> str:
+    def _generate_search_suggestions(
+        self, all_components: List[ComponentRecord], keywords: Optional[List[str]]
+    ) -> str:
         """生成搜索建议"""
         # 统计组件类型
         type_counts = {}
         for comp in all_components:
-            comp_type = comp.get("type", "unknown")
+            comp_type = comp.type or "unknown"
             type_counts[comp_type] = type_counts.get(comp_type, 0) + 1
         
         suggestions = ["**💡 搜索建议：**\n"]
@@ -611,7 +1935,7 @@ class ComponentFinder:
         # 推荐常见关键词
         all_features = []
         for comp in all_components:
-            all_features.extend(comp.get("features", []))
+            all_features.extend(comp.features)
         
         if all_features:
             feature_counts = {}
@@ -625,53 +1949,71 @@ class ComponentFinder:
         
         return "\n".join(suggestions)
     
-    def _format_component_suggestions(self, components: List[Dict]) -> str:
-        """格式化组件建议"""
+    def _format_component_suggestions(
+        self,
+        components: List[ScoredComponent],
+        duplicates: Optional[Dict[str, List[ComponentRecord]]] = None,
+        usage: Optional[UsageGraph] = None
+    ) -> str:
+        """格式化组件建议（duplicates 为内容哈希 -> 内容相同的全部组件，usage 为组件引用图）"""
         if not components:
             return "未找到匹配的组件"
         
         result = [f"## 🎯 找到 {len(components)} 个匹配的组件\n"]
         
-        for i, comp in enumerate(components, 1):
-            score = comp.get("similarity_score", 0)
+        for i, (comp, score) in enumerate(components, 1):
+            result.append(f"### {i}. {comp.name} ⭐ {score:.1%}")
+            result.append(f"**路径：** `{comp.relative_path}`")
+            result.append(f"**类型：** {comp.type}")
+            result.append(f"**描述：** {comp.description}")
+            
+            # 内容完全相同的其他位置
+            others = [
+                other for other in (duplicates or {}).get(comp.content_hash, ())
+                if other is not comp
+            ]
+            if others:
+                locations = "、".join(f"`{other.relative_path}`" for other in others[:MAX_DUPLICATE_LOCATIONS])
+                if len(others) > MAX_DUPLICATE_LOCATIONS:
+                    locations += f" 等{len(others)}处"
+                result.append(f"**相同副本：** {locations}")
             
-            result.append(f"### {i}. {comp['name']} ⭐ {score:.1%}")
-            result.append(f"**路径：** `{comp['relative_path']}`")
-            result.append(f"**类型：** {comp['type']}")
-            result.append(f"**描述：** {comp['description']}")
+            # 被其他文件引用的次数
+            usage_count = usage.count(comp.file_path) if usage is not None else 0
+            if usage_count:
+                result.append(f"**引用：** 被 {usage_count} 个文件引用")
             
             # Props信息
-            if comp.get('props'):
+            if comp.props:
                 result.append("**Props：**")
-                for prop in comp['props'][:3]:  # 只显示前3个
-                    required = "必需" if prop.get("required") else "可选"
-                    default = f" (默认: {prop.get('default')})" if prop.get('default') else ""
-                    result.append(f"- `{prop['name']}`: {prop['type']} - {required}{default}")
+                for prop in comp.props[:3]:  # 只显示前3个
+                    required = "必需" if prop.required else "可选"
+                    default = f" (默认: {prop.default})" if prop.default else ""
+                    result.append(f"- `{prop.name}`: {prop.type} - {required}{default}")
                 
-                if len(comp['props']) > 3:
-                    result.append(f"- ... 还有 {len(comp['props']) - 3} 个props")
+                if len(comp.props) > 3:
+                    result.append(f"- ... 还有 {len(comp.props) - 3} 个props")
             
             # 功能特性
-            if comp.get('features'):
-                features_str = "、".join(comp['features'][:4])
-                if len(comp['features']) > 4:
-                    features_str += f"等{len(comp['features'])}项特性"
+            if comp.features:
+                features_str = "、".join(comp.features[:4])
+                if len(comp.features) > 4:
+                    features_str += f"等{len(comp.features)}项特性"
                 result.append(f"**特性：** {features_str}")
             
             # 使用示例
             result.append("**使用示例：**")
             result.append("```vue")
-            result.append(f"<{self._to_kebab_case(comp['name'])}")
+            result.append(f"<{self._to_kebab_case(comp.name)}")
             
             # 生成props示例
-            if comp.get('props'):
-                for prop in comp['props'][:2]:  # 只显示前2个prop
-                    if prop.get('type') == 'string':
-                        result.append(f'  {self._to_kebab_case(prop["name"])}="示例值"')
-                    elif prop.get('type') == 'boolean':
-                        result.append(f'  {self._to_kebab_case(prop["name"])}')
-                    elif prop.get('type') == 'number':
-                        result.append(f'  :{self._to_kebab_case(prop["name"])}="123"')
+            for prop in comp.props[:2]:  # 只显示前2个prop
+                if prop.type == 'string':
+                    result.append(f'  {self._to_kebab_case(prop.name)}="示例值"')
+                elif prop.type == 'boolean':
+                    result.append(f'  {self._to_kebab_case(prop.name)}')
+                elif prop.type == 'number':
+                    result.append(f'  :{self._to_kebab_case(prop.name)}="123"')
             
             result.append("/>")
             result.append("```")
@@ -685,8 +2027,8 @@ class ComponentFinder:
     def _to_kebab_case(self, text: str) -> str:
         """转换为kebab-case"""
         # 处理PascalCase到kebab-case
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1-\2', text)
-        return re.sub('([a-z0-9])([A-Z])', r'\1-\2', s1).lower()
+        s1 = _KEBAB_FIRST.sub(r'\1-\2', text)
+        return _KEBAB_SECOND.sub(r'\1-\2', s1).lower()
 
 # 为了保持向后兼容，创建一个别名
 ComponentGenerator = ComponentFinder 
\ No newline at end of file
@@ -0,0 +1,447 @@
+"""
+组件索引模块
+将每个组件文件的分析结果按 (路径, 大小, 修改时间) 持久化到数据目录，
+查询时只重新分析新增或变更的文件，并移除已删除的文件；
+内存中每个文件只保存一个 (大小, 修改时间, 组件记录) 元组。
+monorepo 按 workspace 包分片，每个包一个索引文件，某个包变化时只更新该包的分片；
+组件之间的引用图随索引条目一起增量维护
+"""
+
+import os
+import json
+import heapq
+import hashlib
+import logging
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Callable, Iterable, Tuple
+from datetime import datetime
+from .component_record import ComponentRecord
+from .component_search import ComponentSearchIndex
+from .component_usage import UsageGraph
+from .workspaces import WORKSPACE_SCAN_THREADS, WorkspacePackage
+
+logger = logging.getLogger(__name__)
+
+# 索引文件格式版本，格式或分析逻辑变化时递增，旧索引将被整体丢弃
+INDEX_VERSION = 4
+
+
+class IndexEntry(NamedTuple):
+    """单个文件的索引条目（component 为 None 表示不是有效组件）"""
+    size: int
+    mtime_ns: int
+    component: Optional[ComponentRecord]
+
+    def is_fresh(self, file_stat: os.stat_result) -> bool:
+        """文件自上次分析以来是否未变化"""
+        return self.size == file_stat.st_size and self.mtime_ns == file_stat.st_mtime_ns
+
+
+# 批量分析函数：输入 (文件路径, stat结果) 列表，返回与输入顺序一致的组件记录
+AnalyzeBatch = Callable[[List[Tuple[Path, os.stat_result]]], List[Optional[ComponentRecord]]]
+
+
+class ComponentIndex:
+    def __init__(
+        self,
+        index_dir: Path,
+        project_dir: Path,
+        shard: Optional[str] = None,
+        usage: Optional[UsageGraph] = None
+    ):
+        """
+        初始化单个项目（或单个 workspace 包）的组件索引
+
+        Args:
+            index_dir: 索引文件目录
+            project_dir: 项目或包的根目录
+            shard: 分片名，写入索引文件名（monorepo 根目录中不属于任何包的文件使用 "root" 分片）
+            usage: 共用的引用图（monorepo 各分片共用一个，默认单独建立）
+        """
+        self.index_dir = index_dir
+        self.project_dir = project_dir
+        suffix = f".{shard}" if shard else ""
+        self.index_file = index_dir / f"{self._project_key(project_dir)}{suffix}.json"
+
+        # 文件路径 -> 索引条目
+        self.entries: Dict[str, IndexEntry] = {}
+        # 组件引用图，与 entries 同步更新
+        self.usage = usage if usage is not None else UsageGraph([str(project_dir)])
+        # 每次索引内容变化时递增，供上层缓存判断是否失效
+        self.generation = 0
+        self._loaded = False
+
+        # 按 generation 缓存的组件列表和搜索索引
+        self._components_cache: Optional[Tuple[int, List[ComponentRecord]]] = None
+        self._search_cache: Optional[Tuple[int, ComponentSearchIndex]] = None
+
+    @staticmethod
+    def _project_key(project_dir: Path) -> str:
+        """根据项目路径生成索引文件名"""
+        resolved = str(project_dir.resolve())
+        digest = hashlib.sha1(resolved.encode('utf-8')).hexdigest()[:16]
+        return f"{project_dir.name or 'root'}-{digest}"
+
+    def load(self) -> None:
+        """从磁盘加载索引（只在首次使用时加载）"""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if not self.index_file.exists():
+            return
+
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"组件索引 {self.index_file} 读取失败，将重新建立: {e}")
+            return
+
+        if data.get("version") != INDEX_VERSION:
+            logger.info(f"组件索引版本已变化，丢弃旧索引: {self.index_file}")
+            return
+
+        entries = {}
+        for key, entry in data.get("files", {}).items():
+            component = entry.get("component")
+            entries[key] = IndexEntry(
+                entry.get("size"),
+                entry.get("mtime_ns"),
+                ComponentRecord.from_dict(component) if component else None
+            )
+        self.entries = entries
+        self.generation = data.get("generation", 0)
+        self.usage.update_many((key, entry.component) for key, entry in entries.items())
+
+    def save(self) -> None:
+        """写回磁盘（先写临时文件再替换，避免中途中断损坏索引）"""
+        data = {
+            "version": INDEX_VERSION,
+            "project_path": str(self.project_dir),
+            "generation": self.generation,
+            "updated_at": datetime.now().isoformat(),
+            "files": {
+                key: {
+                    "size": entry.size,
+                    "mtime_ns": entry.mtime_ns,
+                    "component": entry.component.to_dict() if entry.component else None
+                }
+                for key, entry in self.entries.items()
+            }
+        }
+
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            logger.error(f"保存组件索引失败: {e}")
+
+    def refresh(
+        self,
+        files: Iterable[Tuple[Path, os.stat_result]],
+        analyze_batch: AnalyzeBatch
+    ) -> Dict[str, int]:
+        """
+        根据当前文件列表同步索引
+
+        Args:
+            files: (文件路径, stat结果) 序列
+            analyze_batch: 批量分析新增或变更文件的函数，返回结果须与输入顺序一致
+
+        Returns:
+            本次同步的计数：hits / analyzed / removed
+        """
+        self.load()
+
+        counts = {"hits": 0, "analyzed": 0, "removed": 0}
+        seen = set()
+        stale: List[Tuple[Path, os.stat_result]] = []
+
+        for file_path, file_stat in files:
+            key = str(file_path)
+            seen.add(key)
+
+            entry = self.entries.get(key)
+            if entry is not None and entry.is_fresh(file_stat):
+                counts["hits"] += 1
+                continue
+
+            stale.append((file_path, file_stat))
+
+        if stale:
+            self._store(stale, analyze_batch(stale))
+            counts["analyzed"] = len(stale)
+
+        missing = [key for key in self.entries if key not in seen]
+        self._remove(missing)
+        counts["removed"] += len(missing)
+
+        if counts["analyzed"] or counts["removed"]:
+            self.generation += 1
+            self.save()
+
+        return counts
+
+    def apply_changes(
+        self,
+        present: List[Tuple[Path, os.stat_result]],
+        removed: Iterable[Path],
+        analyze_batch: AnalyzeBatch
+    ) -> Dict[str, int]:
+        """
+        增量更新部分文件（文件监听使用）
+
+        Args:
+            present: 新增或可能变更的文件及其stat结果
+            removed: 已删除的文件或目录（目录下的所有条目一并移除）
+            analyze_batch: 批量分析函数
+
+        Returns:
+            本次更新的计数：hits / analyzed / removed
+        """
+        self.load()
+
+        counts = {"hits": 0, "analyzed": 0, "removed": 0}
+        stale = []
+        for file_path, file_stat in present:
+            entry = self.entries.get(str(file_path))
+            if entry is not None and entry.is_fresh(file_stat):
+                counts["hits"] += 1
+            else:
+                stale.append((file_path, file_stat))
+
+        keys = []
+        prefixes = []
+        for path in removed:
+            key = str(path)
+            if key in self.entries:
+                keys.append(key)
+            else:
+                prefixes.append(key.rstrip(os.sep) + os.sep)
+
+        if prefixes:
+            prefixes = tuple(prefixes)
+            keys.extend(key for key in self.entries if key.startswith(prefixes))
+        self._remove(keys)
+        counts["removed"] += len(keys)
+
+        if stale:
+            self._store(stale, analyze_batch(stale))
+            counts["analyzed"] = len(stale)
+
+        if counts["analyzed"] or counts["removed"]:
+            self.generation += 1
+            self.save()
+
+        return counts
+
+    def _store(
+        self,
+        files: List[Tuple[Path, os.stat_result]],
+        components: List[Optional[ComponentRecord]]
+    ) -> None:
+        """写入一批分析结果"""
+        updates = []
+        for (file_path, file_stat), component in zip(files, components):
+            key = str(file_path)
+            self.entries[key] = IndexEntry(file_stat.st_size, file_stat.st_mtime_ns, component)
+            updates.append((key, component))
+        self.usage.update_many(updates)
+
+    def _remove(self, keys: List[str]) -> None:
+        """移除一批条目"""
+        for key in keys:
+            del self.entries[key]
+        self.usage.remove_many(keys)
+
+    def unload(self) -> None:
+        """把本分片的条目从共用的引用图中移除（分片对应的包已不存在时）"""
+        self.usage.remove_many(list(self.entries))
+
+    def component(self, file_path: Path) -> Optional[ComponentRecord]:
+        """已索引文件的组件记录"""
+        entry = self.entries.get(str(file_path))
+        return entry.component if entry is not None else None
+
+    def components(self) -> List[ComponentRecord]:
+        """按路径顺序返回所有有效组件记录（同一 generation 内返回同一列表）"""
+        if self._components_cache is None or self._components_cache[0] != self.generation:
+            components = [
+                self.entries[key].component
+                for key in sorted(self.entries)
+                if self.entries[key].component
+            ]
+            self._components_cache = (self.generation, components)
+        return self._components_cache[1]
+
+    def search_index(self) -> ComponentSearchIndex:
+        """返回当前 generation 的倒排索引，索引内容变化后才重建"""
+        if self._search_cache is None or self._search_cache[0] != self.generation:
+            self._search_cache = (self.generation, ComponentSearchIndex(self.components()))
+        return self._search_cache[1]
+
+
+class WorkspaceIndex:
+    def __init__(self, index_dir: Path, project_dir: Path, packages: List[WorkspacePackage]):
+        """
+        初始化 monorepo 的分片组件索引
+
+        每个 workspace 包一个分片（与单独查询该包时共用同一个索引文件），
+        不属于任何包的文件放在根目录的 "root" 分片中
+        """
+        self.index_dir = index_dir
+        self.project_dir = project_dir
+        # 各分片共用的引用图，包之间的引用也能统计到
+        self.usage = UsageGraph()
+        self.root_shard = ComponentIndex(index_dir, project_dir, shard="root", usage=self.usage)
+        # 包目录 -> 分片
+        self.shards: Dict[str, ComponentIndex] = {}
+        self.packages: List[WorkspacePackage] = []
+        self.set_packages(packages)
+
+        # 按 (选择的分片, 各分片 generation) 缓存的组件列表和搜索索引
+        self._components_cache: Optional[Tuple[tuple, List[ComponentRecord]]] = None
+        self._search_cache: Optional[Tuple[List[ComponentRecord], ComponentSearchIndex]] = None
+
+    def set_packages(self, packages: List[WorkspacePackage]) -> None:
+        """更新包列表：保留已有的分片，为新增的包建立分片"""
+        shards = {}
+        for package in packages:
+            key = str(package.path)
+            shards[key] = self.shards.get(key) or ComponentIndex(self.index_dir, package.path, usage=self.usage)
+        for key, shard in self.shards.items():
+            if key not in shards:
+                shard.unload()
+        self.shards = shards
+        self.packages = packages
+        self.usage.set_roots([str(self.project_dir), *shards])
+
+    def load(self) -> None:
+        """加载全部分片（统计跨包引用时需要）"""
+        for shard in self._all_shards():
+            shard.load()
+
+    def _all_shards(self) -> List[ComponentIndex]:
+        """全部分片（根目录分片在前）"""
+        return [self.root_shard, *self.shards.values()]
+
+    def _selected_shards(self, scope: Optional[List[WorkspacePackage]]) -> List[ComponentIndex]:
+        """scope 为 None 时返回全部分片，否则只返回选中包的分片"""
+        if scope is None:
+            return self._all_shards()
+        return [self.shards[str(package.path)] for package in scope if str(package.path) in self.shards]
+
+    def shard_for(self, file_path: Path) -> ComponentIndex:
+        """文件所属的分片（嵌套的包取最内层）"""
+        for parent in file_path.parents:
+            shard = self.shards.get(str(parent))
+            if shard is not None:
+                return shard
+            if parent == self.project_dir:
+                break
+        return self.root_shard
+
+    @property
+    def entries(self) -> ChainMap:
+        """所有分片的索引条目"""
+        return ChainMap(*(shard.entries for shard in self._all_shards()))
+
+    @property
+    def generation(self) -> tuple:
+        """各分片的 generation，任一分片变化时随之变化"""
+        return tuple(shard.generation for shard in self._all_shards())
+
+    def _group(self, files: Iterable[Tuple[Path, os.stat_result]]) -> Dict[int, Tuple[ComponentIndex, list]]:
+        """按分片分组文件"""
+        groups: Dict[int, Tuple[ComponentIndex, list]] = {}
+        for item in files:
+            shard = self.shard_for(item[0])
+            groups.setdefault(id(shard), (shard, []))[1].append(item)
+        return groups
+
+    @staticmethod
+    def _sum_counts(results: Iterable[Dict[str, int]]) -> Dict[str, int]:
+        """合并各分片的计数"""
+        counts = {"hits": 0, "analyzed": 0, "removed": 0}
+        for result in results:
+            for name, value in result.items():
+                counts[name] += value
+        return counts
+
+    def refresh(
+        self,
+        files: Iterable[Tuple[Path, os.stat_result]],
+        analyze_batch: AnalyzeBatch,
+        scope: Optional[List[WorkspacePackage]] = None
+    ) -> Dict[str, int]:
+        """
+        根据当前文件列表并发同步各分片
+
+        Args:
+            files: (文件路径, stat结果) 序列
+            analyze_batch: 批量分析函数（会在多个线程中同时调用）
+            scope: 文件列表只覆盖这些包时传入，其他分片保持不变
+
+        Returns:
+            各分片同步计数之和：hits / analyzed / removed
+        """
+        groups = self._group(files)
+        # 选中但没有文件的分片也要同步（移除其中已删除的文件）
+        tasks = [(shard, groups.get(id(shard), (shard, []))[1]) for shard in self._selected_shards(scope)]
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(WORKSPACE_SCAN_THREADS, len(tasks))), thread_name_prefix="workspace-index"
+        ) as executor:
+            results = list(executor.map(lambda task: task[0].refresh(task[1], analyze_batch), tasks))
+        return self._sum_counts(results)
+
+    def apply_changes(
+        self,
+        present: List[Tuple[Path, os.stat_result]],
+        removed: Iterable[Path],
+        analyze_batch: AnalyzeBatch
+    ) -> Dict[str, int]:
+        """增量更新部分文件，只有涉及的分片会变化"""
+        groups = self._group(present)
+        removed_by_shard: Dict[int, List[Path]] = {}
+        for path in removed:
+            # 删除的可能是目录：所在的分片以及其下的包分片都要处理
+            prefix = str(path).rstrip(os.sep) + os.sep
+            targets = [self.shard_for(path)] + [
+                shard for key, shard in self.shards.items() if key.startswith(prefix) or key == str(path)
+            ]
+            for shard in targets:
+                groups.setdefault(id(shard), (shard, []))
+                removed_by_shard.setdefault(id(shard), []).append(path)
+
+        return self._sum_counts(
+            shard.apply_changes(shard_files, removed_by_shard.get(shard_id, []), analyze_batch)
+            for shard_id, (shard, shard_files) in groups.items()
+        )
+
+    def component(self, file_path: Path) -> Optional[ComponentRecord]:
+        """已索引文件的组件记录"""
+        return self.shard_for(file_path).component(file_path)
+
+    def components(self, scope: Optional[List[WorkspacePackage]] = None) -> List[ComponentRecord]:
+        """按路径顺序合并各分片的组件记录（各分片都没有变化时返回同一列表）"""
+        shards = self._selected_shards(scope)
+        key = tuple((id(shard), shard.generation) for shard in shards)
+        if self._components_cache is None or self._components_cache[0] != key:
+            merged = list(heapq.merge(*(shard.components() for shard in shards), key=attrgetter("file_path")))
+            self._components_cache = (key, merged)
+        return self._components_cache[1]
+
+    def search_index(self, scope: Optional[List[WorkspacePackage]] = None) -> ComponentSearchIndex:
+        """返回选中分片的倒排索引，分片内容变化后才重建"""
+        components = self.components(scope)
+        if self._search_cache is None or self._search_cache[0] is not components:
+            self._search_cache = (components, ComponentSearchIndex(components))
+        return self._search_cache[1]
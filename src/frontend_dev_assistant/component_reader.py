@@ -0,0 +1,94 @@
+"""
+组件文件读取模块
+读取前按大小上限跳过过大的文件，读取时只检查开头一段内容识别二进制和压缩（minified）文件；
+较大的文件通过 mmap 映射，被判定为压缩或二进制时不会把整个文件读入内存；
+两阶段分析的预筛选只读取文件开头一小段
+"""
+
+import os
+import mmap
+from pathlib import Path
+from typing import Optional, Tuple
+
+# 默认的单文件大小上限（字节），超过的文件不分析
+DEFAULT_MAX_FILE_BYTES = 512 * 1024
+
+# 达到该大小的文件通过 mmap 读取
+MMAP_THRESHOLD = 64 * 1024
+
+# 判定二进制/压缩文件时检查的开头字节数
+PROBE_BYTES = 8 * 1024
+
+# 开头内容不足该长度时不做压缩判定（短文件即使是单行也很便宜）
+MINIFIED_MIN_PROBE = 2 * 1024
+
+# 平均行长超过该值视为压缩文件
+MINIFIED_AVG_LINE = 300
+
+# 预筛选读取的文件开头字节数
+HEADER_BYTES = 2 * 1024
+
+# 跳过原因
+SKIP_OVERSIZED = "oversized"
+SKIP_BINARY = "binary"
+SKIP_MINIFIED = "minified"
+
+
+def classify_prefix(prefix: bytes) -> Optional[str]:
+    """根据文件开头判断是否应跳过，返回跳过原因；正常源码返回 None"""
+    if b"\0" in prefix:
+        return SKIP_BINARY
+    if len(prefix) >= MINIFIED_MIN_PROBE:
+        lines = prefix.count(b"\n") + 1
+        if len(prefix) / lines > MINIFIED_AVG_LINE:
+            return SKIP_MINIFIED
+    return None
+
+
+def read_component_bytes(
+    file_path: Path, file_size: int, max_bytes: int = DEFAULT_MAX_FILE_BYTES
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    读取组件文件的原始字节
+
+    Returns:
+        (文件内容, 跳过原因)；文件被跳过时内容为 None
+    """
+    if max_bytes and file_size > max_bytes:
+        return None, SKIP_OVERSIZED
+
+    with open(file_path, "rb") as f:
+        if file_size < MMAP_THRESHOLD:
+            data = f.read()
+            reason = classify_prefix(data[:PROBE_BYTES])
+            return (None, reason) if reason else (data, None)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # 文件可能在 stat 之后变大，以映射的实际长度为准
+            if max_bytes and len(mapped) > max_bytes:
+                return None, SKIP_OVERSIZED
+            reason = classify_prefix(mapped[:PROBE_BYTES])
+            if reason:
+                return None, reason
+            return mapped[:], None
+
+
+def read_component_header(
+    file_path: Path, max_bytes: int = DEFAULT_MAX_FILE_BYTES, header_bytes: int = HEADER_BYTES
+) -> Optional[str]:
+    """
+    读取文件开头一段内容（转为小写，供预筛选做子串匹配；不单独 stat，大小由打开的文件获取）
+
+    Returns:
+        开头内容；文件过大、二进制、压缩或无法读取时为 None
+    """
+    try:
+        with open(file_path, "rb") as f:
+            if max_bytes and os.fstat(f.fileno()).st_size > max_bytes:
+                return None
+            prefix = f.read(header_bytes)
+    except OSError:
+        return None
+    if classify_prefix(prefix):
+        return None
+    return prefix.decode("utf-8", errors="ignore").lower()
@@ -0,0 +1,172 @@
+"""
+组件记录模块
+用带 __slots__ 的紧凑记录代替每个组件一个字典：
+类型、特性等重复出现的字符串做驻留（intern），props 用元组保存，
+相对路径和修改时间按需计算，大项目的组件列表常驻内存时占用更少；
+内容完全相同的文件共享同一份 props/events/slots/features 元组
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Iterable, NamedTuple, Optional, Tuple
+
+
+class PropSpec(NamedTuple):
+    """单个 prop：名称、类型、是否必需、默认值"""
+    name: str
+    type: str
+    required: bool
+    default: Optional[str]
+
+
+def _intern_all(values: Iterable[str]) -> Tuple[str, ...]:
+    """驻留一组字符串并转为元组"""
+    return tuple(sys.intern(value) for value in values)
+
+
+@dataclass(eq=False)
+class ComponentRecord:
+    """单个组件的分析结果"""
+
+    __slots__ = (
+        "name", "file_path", "type", "description", "props",
+        "events", "slots", "features", "file_size", "mtime", "content_hash",
+        "imports", "tags"
+    )
+
+    name: str
+    file_path: str
+    type: str
+    description: str
+    props: Tuple[PropSpec, ...]
+    events: Tuple[str, ...]
+    slots: Tuple[str, ...]
+    features: Tuple[str, ...]
+    file_size: int
+    mtime: float
+    content_hash: str
+    imports: Tuple[str, ...]     # 引用的本地模块路径（相对路径或 @/ 别名，未解析）
+    tags: Tuple[str, ...]        # 模板中使用的自定义组件标签
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        file_path: str,
+        component_type: str,
+        description: str,
+        props: Iterable[Dict[str, Any]],
+        events: Iterable[str],
+        slots: Iterable[str],
+        features: Iterable[str],
+        file_size: int,
+        mtime: float,
+        content_hash: str = "",
+        imports: Iterable[str] = (),
+        tags: Iterable[str] = ()
+    ) -> "ComponentRecord":
+        """由提取结果创建记录（props 为提取器输出的字典）"""
+        return cls(
+            name=name,
+            file_path=file_path,
+            type=sys.intern(component_type),
+            description=description,
+            props=tuple(
+                PropSpec(
+                    prop["name"],
+                    sys.intern(prop.get("type") or "any"),
+                    bool(prop.get("required")),
+                    prop.get("default")
+                )
+                for prop in props
+            ),
+            events=_intern_all(events),
+            slots=_intern_all(slots),
+            features=_intern_all(features),
+            file_size=file_size,
+            mtime=mtime,
+            content_hash=content_hash,
+            imports=_intern_all(imports),
+            tags=_intern_all(tags)
+        )
+
+    def relocated(
+        self,
+        name: str,
+        file_path: str,
+        component_type: str,
+        file_size: int,
+        mtime: float
+    ) -> "ComponentRecord":
+        """内容相同的另一个文件的记录（共享提取出的元组，不重新复制）"""
+        return ComponentRecord(
+            name=name,
+            file_path=file_path,
+            type=sys.intern(component_type),
+            description=self.description,
+            props=self.props,
+            events=self.events,
+            slots=self.slots,
+            features=self.features,
+            file_size=file_size,
+            mtime=mtime,
+            content_hash=self.content_hash,
+            imports=self.imports,
+            tags=self.tags
+        )
+
+    @property
+    def relative_path(self) -> str:
+        """显示用的路径（去掉开头的根目录和盘符）"""
+        return os.path.splitdrive(self.file_path)[1].lstrip("/\\")
+
+    @property
+    def modified_time(self) -> str:
+        """修改时间（ISO 格式）"""
+        return datetime.fromtimestamp(self.mtime).isoformat()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（写入索引文件，与原来的组件字典格式一致）"""
+        return {
+            "name": self.name,
+            "file_path": self.file_path,
+            "relative_path": self.relative_path,
+            "type": self.type,
+            "description": self.description,
+            "props": [prop._asdict() for prop in self.props],
+            "events": list(self.events),
+            "slots": list(self.slots),
+            "features": list(self.features),
+            "file_size": self.file_size,
+            "modified_time": self.modified_time,
+            "content_hash": self.content_hash,
+            "imports": list(self.imports),
+            "tags": list(self.tags)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ComponentRecord":
+        """从索引文件中的字典恢复"""
+        modified_time = data.get("modified_time")
+        try:
+            mtime = datetime.fromisoformat(modified_time).timestamp() if modified_time else 0.0
+        except ValueError:
+            mtime = 0.0
+
+        return cls.create(
+            name=data.get("name", ""),
+            file_path=data.get("file_path", ""),
+            component_type=data.get("type", "component"),
+            description=data.get("description", ""),
+            props=data.get("props", []),
+            events=data.get("events", []),
+            slots=data.get("slots", []),
+            features=data.get("features", []),
+            file_size=data.get("file_size", 0),
+            mtime=mtime,
+            content_hash=data.get("content_hash", ""),
+            imports=data.get("imports", []),
+            tags=data.get("tags", [])
+        )
@@ -0,0 +1,192 @@
+"""
+组件文件扫描模块
+单次遍历项目目录，在进入子目录之前剪掉被排除的目录（node_modules、.git 等），
+同时匹配所有组件文件扩展名；git 仓库也可以直接用 git ls-files 列出文件（遵循 .gitignore）
+"""
+
+import os
+import logging
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Iterable, Iterator, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 不进入的目录名（按目录名精确匹配，不区分大小写）
+EXCLUDE_DIRS = frozenset({
+    "node_modules", ".git", "dist", "build", ".nuxt",
+    ".next", "coverage", ".cache", "tmp", "temp",
+    "__pycache__", ".pytest_cache"
+})
+
+# 任意位置都识别为组件的扩展名
+COMPONENT_EXTENSIONS = frozenset({".vue"})
+
+# 只在 components 目录下识别为组件的扩展名
+SCRIPT_EXTENSIONS = frozenset({".js", ".ts", ".jsx", ".tsx"})
+
+COMPONENTS_DIR_NAME = "components"
+
+# git ls-files 的超时时间（秒）
+GIT_LS_FILES_TIMEOUT = 30
+
+
+def is_excluded_dir(name: str, exclude_dirs: Iterable[str] = EXCLUDE_DIRS) -> bool:
+    """判断目录名是否需要跳过"""
+    return name.lower() in exclude_dirs
+
+
+def is_component_file(name: str, in_components_dir: bool) -> bool:
+    """根据文件名和所在目录判断是否是候选组件文件"""
+    ext = os.path.splitext(name)[1]
+    if ext in COMPONENT_EXTENSIONS:
+        return True
+    return in_components_dir and ext in SCRIPT_EXTENSIONS
+
+
+def is_candidate_path(root: Path, path: Path) -> bool:
+    """判断项目内的某个文件路径是否是候选组件文件（用于增量更新）"""
+    try:
+        rel_parts = path.relative_to(root).parts
+    except ValueError:
+        return False
+
+    if not rel_parts:
+        return False
+
+    dir_parts = rel_parts[:-1]
+    if any(is_excluded_dir(part) for part in dir_parts):
+        return False
+    return is_component_file(rel_parts[-1], COMPONENTS_DIR_NAME in dir_parts)
+
+
+def is_under_components_dir(root: Path, path: Path) -> bool:
+    """目录 path 自身或其上级（root 以下）是否是 components 目录"""
+    try:
+        return COMPONENTS_DIR_NAME in path.relative_to(root).parts
+    except ValueError:
+        return False
+
+
+def walk_directories(root: Path) -> Iterator[Path]:
+    """遍历项目中所有未被排除的目录（含 root 自身）"""
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        yield Path(current)
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False) and not is_excluded_dir(entry.name):
+                            stack.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"无法读取目录 {current}: {e}")
+
+
+def _add_stats(stats: Dict[str, int], files_seen: int, files_excluded: int, dirs_pruned: int) -> None:
+    """累加扫描计数"""
+    stats["files_seen"] = stats.get("files_seen", 0) + files_seen
+    stats["files_excluded"] = stats.get("files_excluded", 0) + files_excluded
+    stats["dirs_pruned"] = stats.get("dirs_pruned", 0) + dirs_pruned
+
+
+def walk_component_files(
+    root: Path,
+    exclude_dirs: Optional[Iterable[str]] = None,
+    in_components: bool = False,
+    stats: Optional[Dict[str, int]] = None,
+    skip_paths: Optional[Set[str]] = None
+) -> List[Path]:
+    """
+    单次遍历查找组件文件
+
+    Args:
+        root: 项目根目录（或项目中的某个子目录）
+        exclude_dirs: 需要剪枝的目录名集合（默认 EXCLUDE_DIRS）
+        in_components: root 是否已位于 components 目录之下
+        stats: 传入时累加计数 files_seen / files_excluded / dirs_pruned
+        skip_paths: 按完整路径跳过的目录（如 monorepo 中单独扫描的其他包）
+
+    Returns:
+        排序后的组件文件路径列表
+    """
+    exclude = frozenset(d.lower() for d in exclude_dirs) if exclude_dirs is not None else EXCLUDE_DIRS
+    results: List[Path] = []
+    files_seen = 0
+    dirs_pruned = 0
+
+    # 栈中保存 (目录路径, 是否位于 components 目录之下)
+    stack = [(str(root), in_components)]
+    while stack:
+        current, in_components = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() in exclude or (skip_paths and entry.path in skip_paths):
+                                dirs_pruned += 1
+                                continue
+                            stack.append((
+                                entry.path,
+                                in_components or entry.name == COMPONENTS_DIR_NAME
+                            ))
+                        elif entry.is_file():
+                            files_seen += 1
+                            if is_component_file(entry.name, in_components):
+                                results.append(Path(entry.path))
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"无法读取目录 {current}: {e}")
+
+    if stats is not None:
+        _add_stats(stats, files_seen, files_seen - len(results), dirs_pruned)
+
+    results.sort()
+    return results
+
+
+def git_component_files(root: Path, stats: Optional[Dict[str, int]] = None) -> Optional[List[Path]]:
+    """
+    用一次 git ls-files 列出组件文件（已跟踪 + 未被忽略的未跟踪文件）
+
+    stats 传入时累加计数 files_seen / files_excluded（被 .gitignore 忽略的文件不计入）
+
+    Returns:
+        排序后的组件文件路径列表；root 不在 git 仓库中或 git 不可用时返回 None
+    """
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=str(root), capture_output=True, timeout=GIT_LS_FILES_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"无法执行 git ls-files ({root}): {e}")
+        return None
+
+    if result.returncode != 0:
+        logger.debug(f"git ls-files 失败 ({root}): {result.stderr.decode('utf-8', 'replace').strip()}")
+        return None
+
+    # 输出为相对 root 的路径；已删除但仍被跟踪的文件在后续 stat 时跳过
+    results = set()
+    files_seen = 0
+    for rel_path in os.fsdecode(result.stdout).split("\0"):
+        if not rel_path:
+            continue
+        files_seen += 1
+        parts = rel_path.split("/")
+        dir_parts = parts[:-1]
+        if any(is_excluded_dir(part) for part in dir_parts):
+            continue
+        if is_component_file(parts[-1], COMPONENTS_DIR_NAME in dir_parts):
+            results.add(root / rel_path)
+
+    if stats is not None:
+        _add_stats(stats, files_seen, files_seen - len(results), 0)
+
+    return sorted(results)
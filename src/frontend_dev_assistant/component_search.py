@@ -0,0 +1,364 @@
+"""
+组件搜索索引模块
+为组件记录建立倒排索引（词 -> 组件ID及 BM25F 得分），建索引时预先统计文档频率和各字段长度，
+关键词查询只合并命中的倒排表，而不是逐个组件拼接全文做子串匹配；
+词表上另建三元组索引，子串匹配和拼写纠错（有界编辑距离）都只校验候选词
+"""
+
+import re
+import math
+from collections import Counter
+from typing import Dict, List, Iterable, Optional, Tuple
+from .component_record import ComponentRecord
+
+# BM25F 各字段的权重（同一词出现在多个字段时按权重累加）
+FIELD_WEIGHTS = {
+    "name": 1.0,
+    "type": 0.9,
+    "props": 0.8,
+    "events": 0.8,
+    "path": 0.7,
+    "features": 0.6,
+    "description": 0.5
+}
+
+# BM25 参数：词频饱和速度、字段长度归一化程度
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 子串匹配（查询词是更长的词的一部分）和模糊匹配命中时的得分系数
+SUBSTRING_SCORE = 0.85
+FUZZY_SCORE = 0.7
+
+# 组件类型过滤的权重（相对于单个关键词的 BM25 得分）
+TYPE_WEIGHT = 1.0
+
+# 三元组长度及补齐字符
+GRAM_SIZE = 3
+GRAM_PAD = "\x00"
+
+_WORD_SPLIT = re.compile(r'[^0-9A-Za-z\u4e00-\u9fff]+')
+_CAMEL_SPLIT = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+
+def tokenize(text: str) -> List[str]:
+    """切分为小写词（驼峰命名额外拆出各个单词）"""
+    if not text:
+        return []
+
+    tokens = []
+    for word in _WORD_SPLIT.split(text):
+        if not word:
+            continue
+        tokens.append(word.lower())
+        parts = _CAMEL_SPLIT.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+
+def max_edit_distance(term: str) -> int:
+    """按词长确定允许的最大编辑距离（过短的词不做模糊匹配）"""
+    if len(term) <= 3:
+        return 0
+    if len(term) <= 5:
+        return 1
+    return 2
+
+
+def edit_distance(s1: str, s2: str, max_distance: int) -> int:
+    """
+    有界的编辑距离（含相邻字符交换，即 OSA 距离）
+
+    超过 max_distance 时提前结束并返回 max_distance + 1
+    """
+    if abs(len(s1) - len(s2)) > max_distance:
+        return max_distance + 1
+    if s1 == s2:
+        return 0
+
+    prev_prev: List[int] = []
+    prev = list(range(len(s2) + 1))
+    for i in range(1, len(s1) + 1):
+        current = [i] + [0] * len(s2)
+        row_min = i
+        for j in range(1, len(s2) + 1):
+            cost = 0 if s1[i - 1] == s2[j - 1] else 1
+            value = min(prev[j] + 1, current[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and s1[i - 1] == s2[j - 2] and s1[i - 2] == s2[j - 1]:
+                value = min(value, prev_prev[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        prev_prev, prev = prev, current
+
+    return min(prev[-1], max_distance + 1)
+
+
+def _grams(text: str, padded: bool) -> List[str]:
+    """切分三元组（padded 时首尾补齐，使词首词尾也参与匹配）"""
+    if padded:
+        pad = GRAM_PAD * (GRAM_SIZE - 1)
+        text = f"{pad}{text}{pad}"
+    return [text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)]
+
+
+class TrigramIndex:
+    def __init__(self, vocabulary: Iterable[str]):
+        """为词表建立三元组 -> 词ID 的索引"""
+        self.tokens: List[str] = list(vocabulary)
+        self.grams: Dict[str, List[int]] = {}
+
+        for token_id, token in enumerate(self.tokens):
+            for gram in set(_grams(token, padded=True)):
+                self.grams.setdefault(gram, []).append(token_id)
+
+    def substring(self, term: str) -> List[str]:
+        """包含 term 的所有词：用 term 的三元组求交得到候选，再逐个校验"""
+        grams = set(_grams(term, padded=False))
+        if not grams:
+            # 过短的词无法用三元组过滤，直接扫描词表
+            return [token for token in self.tokens if term in token]
+
+        postings = sorted((self.grams.get(gram, []) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+
+        return [self.tokens[i] for i in candidates if term in self.tokens[i]]
+
+    def fuzzy(self, term: str, max_distance: Optional[int] = None) -> List[str]:
+        """
+        与 term 编辑距离不超过 max_distance 的词
+
+        候选词须与 term 共享足够多的三元组（每次编辑最多破坏 GRAM_SIZE + 1 个三元组），
+        再用有界编辑距离校验。下界不足2时仍要求至少共享2个三元组：
+        这会漏掉极少数两处错误恰好打散全部三元组的词，但能把候选数控制在很小范围内
+        """
+        if max_distance is None:
+            max_distance = max_edit_distance(term)
+        if max_distance <= 0:
+            return []
+
+        grams = set(_grams(term, padded=True))
+        min_shared = max(2, len(grams) - max_distance * (GRAM_SIZE + 1))
+        min_len, max_len = len(term) - max_distance, len(term) + max_distance
+
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for token_id in self.grams.get(gram, ()):
+                shared[token_id] = shared.get(token_id, 0) + 1
+
+        matches = []
+        for token_id, count in shared.items():
+            if count < min_shared:
+                continue
+            token = self.tokens[token_id]
+            if not min_len <= len(token) <= max_len:
+                continue
+            if edit_distance(term, token, max_distance) <= max_distance:
+                matches.append(token)
+        return matches
+
+
+def component_fields(component: ComponentRecord) -> Dict[str, Iterable[str]]:
+    """取出组件各个可搜索字段的文本"""
+    return {
+        "name": (component.name,),
+        "type": (component.type,),
+        "props": [prop.name for prop in component.props],
+        "events": component.events,
+        "path": (component.relative_path,),
+        "features": component.features,
+        "description": (component.description,)
+    }
+
+
+class ComponentSearchIndex:
+    def __init__(self, components: List[ComponentRecord]):
+        """为一组组件建立倒排索引，组件ID即其在列表中的下标"""
+        self.components = components
+        self.doc_count = len(components)
+
+        # 词 -> {组件ID: 预先算好的 BM25 得分（idf × 饱和后的加权词频）}
+        self.postings: Dict[str, Dict[int, float]] = {}
+        # 词 -> 包含该词的组件数
+        self.doc_freq: Dict[str, int] = {}
+        # 字段 -> 各组件该字段的词数，以及全部组件的平均词数
+        self.field_lengths: Dict[str, List[int]] = {field: [] for field in FIELD_WEIGHTS}
+        self.avg_field_lengths: Dict[str, float] = {}
+        # 组件类型 -> 组件ID列表
+        self.type_postings: Dict[str, List[int]] = {}
+
+        self._build()
+
+        # 内容哈希 -> 内容完全相同的组件（只保留多于一个的分组）
+        groups: Dict[str, List[ComponentRecord]] = {}
+        for component in components:
+            if component.content_hash:
+                groups.setdefault(component.content_hash, []).append(component)
+        self.duplicates = {key: group for key, group in groups.items() if len(group) > 1}
+
+        # 词表三元组索引，用于子串匹配和拼写纠错
+        self.trigrams = TrigramIndex(self.postings.keys())
+
+    def _build(self) -> None:
+        """统计各字段词频和长度，再把每个 (词, 组件) 的 BM25F 得分算好存入倒排表"""
+        doc_fields: List[Dict[str, Counter]] = []
+        for doc_id, component in enumerate(self.components):
+            comp_type = (component.type or "").lower()
+            self.type_postings.setdefault(comp_type, []).append(doc_id)
+
+            fields = {}
+            for field, texts in component_fields(component).items():
+                counts = Counter(token for text in texts for token in tokenize(text))
+                fields[field] = counts
+                self.field_lengths[field].append(sum(counts.values()))
+            doc_fields.append(fields)
+
+        for field, lengths in self.field_lengths.items():
+            self.avg_field_lengths[field] = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+        # BM25F：各字段的词频按字段长度归一化后乘以字段权重再相加，得到组件的加权词频
+        for doc_id, fields in enumerate(doc_fields):
+            weighted: Dict[str, float] = {}
+            for field, counts in fields.items():
+                avg_length = self.avg_field_lengths[field] or 1.0
+                norm = 1 - BM25_B + BM25_B * self.field_lengths[field][doc_id] / avg_length
+                boost = FIELD_WEIGHTS[field] / norm
+                for token, count in counts.items():
+                    weighted[token] = weighted.get(token, 0.0) + count * boost
+            for token, tf in weighted.items():
+                self.postings.setdefault(token, {})[doc_id] = tf
+
+        # 词频饱和后乘以 idf，查询时只需合并倒排表
+        for token, postings in self.postings.items():
+            self.doc_freq[token] = len(postings)
+            idf = self.idf(len(postings))
+            for doc_id, tf in postings.items():
+                postings[doc_id] = idf * tf * (BM25_K1 + 1) / (tf + BM25_K1)
+
+    def idf(self, doc_freq: int) -> float:
+        """BM25 的 idf（恒为正）"""
+        return math.log(1 + (self.doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def max_score(self, token: str) -> float:
+        """单个词在任意组件上能得到的最高分（词频饱和的上限）"""
+        return self.idf(self.doc_freq[token]) * (BM25_K1 + 1)
+
+    @property
+    def vocabulary(self) -> Iterable[str]:
+        """索引中的所有词"""
+        return self.postings.keys()
+
+    def _merge(self, tokens: Iterable[str], hits: Dict[int, float], factor: float = 1.0) -> float:
+        """把多个词的倒排表合并进 hits（每个组件取最高分），返回这些词的最高可能得分"""
+        upper = 0.0
+        for token in tokens:
+            upper = max(upper, self.max_score(token) * factor)
+            postings = self.postings[token]
+            if hits.keys().isdisjoint(postings):
+                # 与已命中的组件没有重叠时整表合并（大部分扩展出来的词属于不同组件）
+                hits.update(postings if factor == 1.0 else {doc_id: score * factor for doc_id, score in postings.items()})
+                continue
+            for doc_id, score in postings.items():
+                score *= factor
+                if hits.get(doc_id, 0.0) < score:
+                    hits[doc_id] = score
+        return upper
+
+    def substring_tokens(self, term: str) -> List[str]:
+        """词表中包含 term 的词"""
+        return self.trigrams.substring(term)
+
+    def fuzzy_tokens(self, term: str) -> List[str]:
+        """词表中与 term 编辑距离在阈值内的词（用于纠正拼写错误）"""
+        return self.trigrams.fuzzy(term)
+
+    def match_keyword(self, keyword: str) -> Tuple[Dict[int, float], float]:
+        """
+        计算单个关键词命中的组件及 BM25 得分
+
+        完全相同的词得满分，包含该词的更长的词打折，拼写纠错匹配再打折；
+        关键词包含多个词时，组件须命中全部词，得分为各词之和
+
+        Returns:
+            (组件ID -> 得分, 该关键词的最高可能得分)
+        """
+        terms = tokenize(keyword)
+        if not terms:
+            return {}, 0.0
+
+        result: Optional[Dict[int, float]] = None
+        upper = 0.0
+        for term in terms:
+            hits: Dict[int, float] = {}
+            substrings = self.substring_tokens(term)
+            term_upper = self._merge([token for token in substrings if token == term], hits)
+            term_upper = max(term_upper, self._merge(
+                [token for token in substrings if token != term], hits, SUBSTRING_SCORE
+            ))
+            term_upper = max(term_upper, self._merge(self.fuzzy_tokens(term), hits, FUZZY_SCORE))
+            upper += term_upper
+
+            if result is None:
+                result = hits
+            else:
+                result = {
+                    doc_id: score + hits[doc_id]
+                    for doc_id, score in result.items()
+                    if doc_id in hits
+                }
+            if not result:
+                return {}, upper
+
+        return result or {}, upper
+
+    def match_types(self, similarities: Dict[str, float]) -> Tuple[Dict[int, float], float]:
+        """
+        按组件类型打分：类型相似度 × 该类型的 idf × 类型权重
+
+        Args:
+            similarities: 组件类型 -> 与目标类型的相似度（0 表示不相关）
+
+        Returns:
+            (组件ID -> 得分, 最高可能得分)
+        """
+        scores: Dict[int, float] = {}
+        upper = 0.0
+        for comp_type, similarity in similarities.items():
+            doc_ids = self.type_postings.get(comp_type)
+            if similarity <= 0 or not doc_ids:
+                continue
+            score = TYPE_WEIGHT * similarity * self.idf(len(doc_ids))
+            upper = max(upper, score)
+            for doc_id in doc_ids:
+                scores[doc_id] = score
+        return scores, upper
+
+    def collapse_duplicates(self, scores: Dict[int, float]) -> Dict[int, float]:
+        """内容相同的组件只保留得分最高的一个（同分取路径靠前的）"""
+        if not self.duplicates:
+            return scores
+
+        collapsed: Dict[int, float] = {}
+        best: Dict[str, int] = {}
+        for doc_id, score in scores.items():
+            content_hash = self.components[doc_id].content_hash
+            if content_hash not in self.duplicates:
+                collapsed[doc_id] = score
+                continue
+            current = best.get(content_hash)
+            if current is None or (-score, doc_id) < (-scores[current], current):
+                best[content_hash] = doc_id
+
+        for doc_id in best.values():
+            collapsed[doc_id] = scores[doc_id]
+        return collapsed
+
+    def type_ids(self, comp_type: str) -> List[int]:
+        """指定类型的组件ID"""
+        return self.type_postings.get(comp_type, [])
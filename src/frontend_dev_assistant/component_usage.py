@@ -0,0 +1,235 @@
+"""
+组件引用关系模块
+根据组件文件中的本地 import 语句和模板中使用的组件标签，维护 "哪些文件使用了哪个组件" 的引用图；
+随组件索引增量更新：某个文件变化时只替换该文件的引用，受影响组件的引用数在下次读取时才重新计算
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .component_record import ComponentRecord
+
+# 导入路径可以省略的扩展名（组件文件和脚本文件）
+MODULE_EXTENSIONS = ('.vue', '.jsx', '.tsx', '.js', '.ts')
+
+# 指向项目 src 目录的路径别名（vue-cli、vite、nuxt 的常见配置）
+SRC_ALIASES = ('@/', '~/')
+
+# 本地导入的前缀（其余视为 npm 包，不参与统计）
+LOCAL_IMPORT_PREFIXES = ('.',) + SRC_ALIASES
+
+
+def is_local_import(spec: str) -> bool:
+    """导入路径是否指向项目内的文件"""
+    return spec.startswith(LOCAL_IMPORT_PREFIXES)
+
+
+def tag_key(tag: str) -> str:
+    """标签或组件名的比较键：<user-card> 与 <UserCard> 都对应 usercard"""
+    return tag.replace('-', '').lower()
+
+
+def _strip_extension(path: str) -> str:
+    """去掉可省略的扩展名"""
+    stem, ext = os.path.splitext(path)
+    return stem if ext in MODULE_EXTENSIONS else path
+
+
+def _module_keys(file_path: str) -> Tuple[str, ...]:
+    """组件文件可以被导入的路径：去掉扩展名的路径，index 文件还可以用所在目录导入"""
+    stem = os.path.splitext(file_path)[0]
+    if os.path.basename(stem) == 'index':
+        return stem, os.path.dirname(stem)
+    return (stem,)
+
+
+class UsageGraph:
+    def __init__(self, roots: Iterable[str] = ()):
+        """
+        初始化引用图
+
+        Args:
+            roots: 项目（或各个 workspace 包）的根目录，用于解析 @/ 和 ~/ 别名，
+                   文件按所在的最内层根目录解析为 <根目录>/src
+        """
+        self._lock = threading.Lock()
+        self._roots: List[str] = []
+
+        # 文件路径 -> 组件记录
+        self._records: Dict[str, ComponentRecord] = {}
+        # 引用方：文件路径 -> (导入的模块键, 使用的标签键)
+        self._sources: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        # 模块键 / 标签键 -> 引用它的文件
+        self._module_refs: Dict[str, Set[str]] = {}
+        self._tag_refs: Dict[str, Set[str]] = {}
+        # 被引用方：模块键 / 标签键 -> 对应的组件文件
+        self._module_targets: Dict[str, Set[str]] = {}
+        self._tag_targets: Dict[str, Set[str]] = {}
+
+        # 组件文件 -> 引用它的文件数；_dirty 中的组件在读取时重新计算
+        self._counts: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+
+        self.set_roots(roots)
+
+    @classmethod
+    def build(cls, components: Iterable[ComponentRecord], roots: Iterable[str] = ()) -> "UsageGraph":
+        """由一组组件记录一次性建立引用图（不使用组件索引时）"""
+        graph = cls(roots)
+        graph.update_many((component.file_path, component) for component in components)
+        return graph
+
+    def set_roots(self, roots: Iterable[str]) -> None:
+        """更新根目录列表；变化时所有文件的别名导入重新解析"""
+        ordered = sorted({str(root).rstrip(os.sep) for root in roots}, key=len, reverse=True)
+        with self._lock:
+            if ordered == self._roots:
+                return
+            self._roots = ordered
+            for path, record in self._records.items():
+                self._remove_source(path)
+                self._add_source(path, record)
+
+    def update(self, file_path: str, component: Optional[ComponentRecord]) -> None:
+        """文件被重新分析（component 为 None 表示不是有效组件）"""
+        with self._lock:
+            self._update(file_path, component)
+
+    def update_many(self, items: Iterable[Tuple[str, Optional[ComponentRecord]]]) -> None:
+        """批量更新"""
+        with self._lock:
+            for file_path, component in items:
+                self._update(file_path, component)
+
+    def remove(self, file_path: str) -> None:
+        """文件已从索引中移除"""
+        self.update(file_path, None)
+
+    def remove_many(self, file_paths: Iterable[str]) -> None:
+        """批量移除"""
+        self.update_many((file_path, None) for file_path in file_paths)
+
+    def count(self, file_path: str) -> int:
+        """引用该组件的文件数（不含组件自身）"""
+        with self._lock:
+            self._recount()
+            return self._counts.get(file_path, 0)
+
+    def counts(self) -> Dict[str, int]:
+        """所有被引用过的组件及其引用数"""
+        with self._lock:
+            self._recount()
+            return dict(self._counts)
+
+    def users(self, file_path: str) -> List[str]:
+        """引用该组件的文件，按路径排序"""
+        with self._lock:
+            if file_path not in self._records:
+                return []
+            return sorted(self._users(file_path))
+
+    def _update(self, file_path: str, component: Optional[ComponentRecord]) -> None:
+        """替换单个文件的引用和被引用信息，并标记受影响的组件"""
+        if file_path in self._records:
+            self._remove_source(file_path)
+            self._remove_target(file_path)
+            del self._records[file_path]
+        if component is not None:
+            self._records[file_path] = component
+            self._add_target(file_path, component)
+            self._add_source(file_path, component)
+
+    def _add_target(self, file_path: str, component: ComponentRecord) -> None:
+        """登记组件可以被引用的模块键和标签键"""
+        for key in _module_keys(file_path):
+            self._module_targets.setdefault(key, set()).add(file_path)
+        tag = tag_key(component.name)
+        targets = self._tag_targets.setdefault(tag, set())
+        targets.add(file_path)
+        # 同名组件增减会改变标签能否唯一对应到组件，同名的组件都要重新计算
+        self._dirty.update(targets)
+
+    def _remove_target(self, file_path: str) -> None:
+        """注销组件的模块键和标签键"""
+        for key in _module_keys(file_path):
+            self._discard(self._module_targets, key, file_path)
+        tag = tag_key(self._records[file_path].name)
+        self._discard(self._tag_targets, tag, file_path)
+        self._dirty.update(self._tag_targets.get(tag, ()))
+        self._counts.pop(file_path, None)
+        self._dirty.discard(file_path)
+
+    def _add_source(self, file_path: str, component: ComponentRecord) -> None:
+        """登记文件中的导入和标签，并标记它们指向的组件"""
+        modules = tuple(dict.fromkeys(
+            key for key in (self._resolve(file_path, spec) for spec in component.imports) if key
+        ))
+        tags = tuple(dict.fromkeys(tag_key(tag) for tag in component.tags))
+        if not modules and not tags:
+            return
+        self._sources[file_path] = (modules, tags)
+        for key in modules:
+            self._module_refs.setdefault(key, set()).add(file_path)
+            self._dirty.update(self._module_targets.get(key, ()))
+        for tag in tags:
+            self._tag_refs.setdefault(tag, set()).add(file_path)
+            self._dirty.update(self._tag_targets.get(tag, ()))
+
+    def _remove_source(self, file_path: str) -> None:
+        """注销文件中的导入和标签，并标记它们指向的组件"""
+        modules, tags = self._sources.pop(file_path, ((), ()))
+        for key in modules:
+            self._discard(self._module_refs, key, file_path)
+            self._dirty.update(self._module_targets.get(key, ()))
+        for tag in tags:
+            self._discard(self._tag_refs, tag, file_path)
+            self._dirty.update(self._tag_targets.get(tag, ()))
+
+    @staticmethod
+    def _discard(mapping: Dict[str, Set[str]], key: str, value: str) -> None:
+        """从 key 对应的集合中移除 value，集合为空时删除 key"""
+        values = mapping.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del mapping[key]
+
+    def _resolve(self, file_path: str, spec: str) -> Optional[str]:
+        """把导入路径解析为模块键；npm 包返回 None"""
+        if spec.startswith('.'):
+            target = os.path.join(os.path.dirname(file_path), spec)
+        elif spec.startswith(SRC_ALIASES):
+            root = next(
+                (root for root in self._roots if file_path.startswith(root + os.sep)),
+                os.path.dirname(file_path)
+            )
+            target = os.path.join(root, 'src', spec[2:])
+        else:
+            return None
+        return _strip_extension(os.path.normpath(target))
+
+    def _users(self, file_path: str) -> Set[str]:
+        """引用该组件的文件：导入了它的文件，以及使用了它的标签的文件（只在标签唯一对应该组件时）"""
+        users: Set[str] = set()
+        for key in _module_keys(file_path):
+            users.update(self._module_refs.get(key, ()))
+        tag = tag_key(self._records[file_path].name)
+        if len(self._tag_targets.get(tag, ())) == 1:
+            users.update(self._tag_refs.get(tag, ()))
+        users.discard(file_path)
+        return users
+
+    def _recount(self) -> None:
+        """重新计算被标记组件的引用数"""
+        if not self._dirty:
+            return
+        for file_path in self._dirty:
+            if file_path not in self._records:
+                continue
+            count = len(self._users(file_path))
+            if count:
+                self._counts[file_path] = count
+            else:
+                self._counts.pop(file_path, None)
+        self._dirty.clear()
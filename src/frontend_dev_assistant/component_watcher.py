@@ -0,0 +1,437 @@
+"""
+组件文件监听模块
+监听已查询过的项目目录，在组件文件变化时增量更新组件索引，
+使后续查询直接使用内存中的索引。Linux 下使用 inotify，其他平台或
+inotify 不可用（如监听数量达到上限）时退回到定时轮询。
+短时间内的大量变化（如切换分支）会被合并后统一处理。
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .component_scanner import (
+    walk_component_files, walk_directories, is_excluded_dir,
+    COMPONENT_EXTENSIONS, SCRIPT_EXTENSIONS
+)
+
+logger = logging.getLogger(__name__)
+
+# 最后一次变化后等待多久再处理（秒），用于合并连续的变化
+DEBOUNCE_SECONDS = 0.5
+
+# 持续有变化时最多延迟多久必须处理一次（秒）
+MAX_DELAY_SECONDS = 5.0
+
+# 轮询模式的扫描间隔（秒）
+POLL_INTERVAL_SECONDS = 2.0
+
+# 单次累积的变化路径超过该数量时，改为整体重新同步
+MAX_PENDING_PATHS = 2000
+
+# 监听线程的最长等待时间（秒），也是发现新项目的最大延迟
+LOOP_INTERVAL_SECONDS = 0.5
+
+WATCHED_EXTENSIONS = COMPONENT_EXTENSIONS | SCRIPT_EXTENSIONS
+
+
+class _Inotify:
+    """基于 ctypes 的最小 inotify 封装（仅 Linux）"""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (
+        IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+        | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    )
+
+    _EVENT = struct.Struct('iIII')
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify 仅在 Linux 上可用")
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path: Path) -> int:
+        """监听目录，返回 watch descriptor"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(path))
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """取消监听"""
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """读取当前可用的事件：(wd, mask, name)"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            wd, mask, _cookie, name_len = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        """关闭 inotify 实例"""
+        os.close(self.fd)
+
+
+class _WatchedProject:
+    """单个被监听项目的状态"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.backend: Optional[str] = None      # "inotify" / "polling"，建立监听后确定
+        self.ready = False                      # 完成首次同步后为 True
+        self.dirty = True                       # 需要整体重新同步
+        self.pending: Set[Path] = set()
+        self.first_event = 0.0
+        self.last_event = 0.0
+        self.snapshot: Dict[str, Tuple[int, int]] = {}   # 轮询模式的文件快照
+        self.last_poll = 0.0
+        self.flushing = False                   # 正在把变化交给回调处理（索引更新到一半）
+
+    def mark(self, path: Optional[Path] = None) -> None:
+        """记录一次变化（path 为 None 表示需要整体重新同步）"""
+        now = time.monotonic()
+        if not self.pending and not self.dirty:
+            self.first_event = now
+        self.last_event = now
+
+        if path is None:
+            self.dirty = True
+            self.pending.clear()
+        elif not self.dirty:
+            self.pending.add(path)
+            if len(self.pending) > MAX_PENDING_PATHS:
+                self.dirty = True
+                self.pending.clear()
+
+
+class ComponentWatcher:
+    def __init__(
+        self,
+        on_change: Callable[[Path, Optional[Set[Path]]], None],
+        use_inotify: bool = True
+    ):
+        """
+        初始化文件监听器
+
+        Args:
+            on_change: 变化回调，参数为 (项目根目录, 变化的路径集合)；
+                       路径集合为 None 表示需要整体重新同步
+            use_inotify: 是否尝试使用 inotify（否则始终轮询）
+        """
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        # 项目的一次处理结束时通知（等待正在进行的处理完成）
+        self._flush_done = threading.Condition(self._lock)
+        # 读取和处理 inotify 事件、增删监听时持有（监听线程和查询线程都会读取事件）
+        self._events_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._projects: Dict[str, _WatchedProject] = {}
+        self._watches: Dict[int, Tuple[str, Path]] = {}   # wd -> (项目key, 目录)
+        self._thread: Optional[threading.Thread] = None
+
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify 不可用，使用轮询监听: {e}")
+
+    @staticmethod
+    def _key(project_dir: Path) -> str:
+        return str(project_dir.resolve())
+
+    def watch(self, project_dir: Path) -> None:
+        """开始监听项目（重复调用无副作用）"""
+        key = self._key(project_dir)
+        with self._lock:
+            if key in self._projects:
+                return
+            self._projects[key] = _WatchedProject(Path(key))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="component-watcher", daemon=True
+                )
+                self._thread.start()
+        logger.info(f"开始监听组件目录: {key}")
+
+    def is_hot(self, project_dir: Path) -> bool:
+        """项目是否已完成同步且没有需要整体重新同步的变化"""
+        with self._lock:
+            project = self._projects.get(self._key(project_dir))
+            return bool(project and project.ready and not project.dirty)
+
+    def flush(self, project_dir: Path) -> None:
+        """
+        立即处理项目尚未处理的变化（查询前调用，保证结果最新）
+
+        先读取 inotify 中还没有读取的事件，正在处理的变化完成后再处理剩余的变化，
+        查询不会看到更新到一半的索引（轮询模式下还没有轮询到的变化不在其中）
+        """
+        project = self._projects.get(self._key(project_dir))
+        if project is None:
+            return
+        if project.backend == "inotify":
+            self._read_inotify_events()
+        self._flush(project)
+
+    def stop(self) -> None:
+        """停止监听线程并释放 inotify"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        with self._events_lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+
+    def _run(self) -> None:
+        """监听线程主循环"""
+        while not self._stop.is_set():
+            try:
+                self._setup_new_projects()
+
+                if self._inotify is not None and self._watches:
+                    readable, _, _ = select.select([self._inotify.fd], [], [], LOOP_INTERVAL_SECONDS)
+                    if readable:
+                        self._read_inotify_events()
+                else:
+                    self._stop.wait(LOOP_INTERVAL_SECONDS)
+
+                self._poll_projects()
+                self._flush_due()
+            except Exception as e:
+                logger.error(f"组件监听线程出错: {e}")
+                self._stop.wait(LOOP_INTERVAL_SECONDS)
+
+    def _setup_new_projects(self) -> None:
+        """为新加入的项目建立监听"""
+        with self._lock:
+            new_projects = [
+                (key, project) for key, project in self._projects.items()
+                if project.backend is None
+            ]
+
+        for key, project in new_projects:
+            backend = "polling"
+            if self._inotify is not None:
+                with self._events_lock:
+                    try:
+                        for directory in walk_directories(project.root):
+                            self._add_watch(key, directory)
+                        backend = "inotify"
+                    except OSError as e:
+                        # 常见原因是超过 fs.inotify.max_user_watches
+                        logger.warning(f"inotify 监听 {project.root} 失败，改为轮询: {e}")
+                        self._remove_watches(key)
+
+            if backend == "polling":
+                project.snapshot = self._snapshot(project.root)
+                project.last_poll = time.monotonic()
+
+            with self._lock:
+                project.backend = backend
+                # 建立监听前可能已有变化，首次整体同步一次
+                project.mark(None)
+
+    def _add_watch(self, key: str, directory: Path) -> None:
+        """监听单个目录（目录已消失或无权限时跳过，其他错误向上抛出）"""
+        try:
+            wd = self._inotify.add_watch(directory)
+        except OSError as e:
+            if e.errno in (errno.ENOENT, errno.EACCES, errno.ENOTDIR):
+                return
+            raise
+        self._watches[wd] = (key, directory)
+
+    def _remove_watches(self, key: str, under: Optional[Path] = None) -> None:
+        """取消项目（或项目中某个目录之下）的所有监听"""
+        prefix = str(under) + os.sep if under is not None else None
+        for wd, (watch_key, directory) in list(self._watches.items()):
+            if watch_key != key:
+                continue
+            if under is not None and directory != under and not str(directory).startswith(prefix):
+                continue
+            try:
+                self._inotify.rm_watch(wd)
+            except OSError:
+                pass
+            del self._watches[wd]
+
+    def _read_inotify_events(self) -> None:
+        """读取并处理 inotify 中当前可用的全部事件"""
+        with self._events_lock:
+            if self._inotify is None:
+                return
+            while True:
+                events = self._inotify.read_events()
+                if not events:
+                    break
+                self._handle_inotify_events(events)
+
+    def _handle_inotify_events(self, events: List[Tuple[int, int, str]]) -> None:
+        """把 inotify 事件转换为项目的待处理变化"""
+        ino = _Inotify
+        for wd, mask, name in events:
+            if mask & ino.IN_Q_OVERFLOW:
+                # 事件队列溢出，所有 inotify 项目都需要整体重新同步
+                with self._lock:
+                    for project in self._projects.values():
+                        if project.backend == "inotify":
+                            project.mark(None)
+                continue
+
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            key, directory = watch
+
+            if mask & ino.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            path = directory / name if name else directory
+            project = self._projects.get(key)
+            if project is None:
+                continue
+
+            if mask & ino.IN_ISDIR:
+                if is_excluded_dir(name):
+                    continue
+                if mask & (ino.IN_CREATE | ino.IN_MOVED_TO):
+                    try:
+                        for sub_dir in walk_directories(path):
+                            self._add_watch(key, sub_dir)
+                    except OSError as e:
+                        logger.debug(f"监听新目录 {path} 失败: {e}")
+                elif mask & ino.IN_MOVED_FROM:
+                    self._remove_watches(key, path)
+                with self._lock:
+                    project.mark(path)
+            elif mask & (ino.IN_DELETE_SELF | ino.IN_MOVE_SELF):
+                if directory == project.root:
+                    with self._lock:
+                        project.mark(None)
+            elif os.path.splitext(name)[1] in WATCHED_EXTENSIONS:
+                with self._lock:
+                    project.mark(path)
+
+    def _snapshot(self, root: Path) -> Dict[str, Tuple[int, int]]:
+        """轮询模式：记录所有组件文件的大小和修改时间"""
+        snapshot = {}
+        for file_path in walk_component_files(root):
+            try:
+                file_stat = file_path.stat()
+            except OSError:
+                continue
+            snapshot[str(file_path)] = (file_stat.st_size, file_stat.st_mtime_ns)
+        return snapshot
+
+    def _poll_projects(self) -> None:
+        """轮询模式：定期对比快照找出变化的文件"""
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                project for project in self._projects.values()
+                if project.backend == "polling" and now - project.last_poll >= POLL_INTERVAL_SECONDS
+            ]
+
+        for project in due:
+            snapshot = self._snapshot(project.root)
+            changed = [
+                path for path, signature in snapshot.items()
+                if project.snapshot.get(path) != signature
+            ]
+            changed.extend(path for path in project.snapshot if path not in snapshot)
+            project.snapshot = snapshot
+            project.last_poll = time.monotonic()
+
+            if changed:
+                with self._lock:
+                    for path in changed:
+                        project.mark(Path(path))
+
+    def _flush_due(self) -> None:
+        """处理已经稳定（或等待过久）的变化"""
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                project for project in self._projects.values()
+                if (project.pending or project.dirty) and project.backend is not None and (
+                    now - project.last_event >= DEBOUNCE_SECONDS
+                    or now - project.first_event >= MAX_DELAY_SECONDS
+                )
+            ]
+
+        for project in due:
+            self._flush(project)
+
+    def _flush(self, project: _WatchedProject) -> None:
+        """把累积的变化交给回调处理（项目正在处理时先等待处理完成，同一项目不会同时处理）"""
+        with self._lock:
+            while project.flushing:
+                self._flush_done.wait()
+            if project.backend is None or not (project.pending or project.dirty):
+                return
+            paths = None if project.dirty else set(project.pending)
+            project.pending.clear()
+            project.dirty = False
+            project.flushing = True
+
+        failed = True
+        try:
+            self.on_change(project.root, paths)
+            failed = False
+        except Exception as e:
+            logger.error(f"更新组件索引失败 {project.root}: {e}")
+        finally:
+            with self._lock:
+                if failed:
+                    project.mark(None)
+                else:
+                    project.ready = True
+                project.flushing = False
+                self._flush_done.notify_all()
@@ -0,0 +1,144 @@
+"""
+组件扫描诊断信息模块
+记录一次组件查找中各阶段的耗时和计数（发现、读取、分析、打分、格式化），
+可以附加到工具输出中，也会写入调用追踪记录
+"""
+
+import time
+import heapq
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Tuple, Iterator
+
+# 记录的最慢文件数
+SLOWEST_FILES = 5
+
+# 阶段名称及显示名称（按执行顺序）
+PHASE_LABELS = {
+    "discovery": "文件发现",
+    "prefilter": "预筛选",
+    "refresh": "索引同步",
+    "read": "读取文件",
+    "extract": "提取信息",
+    "scoring": "打分排序",
+    "formatting": "格式化",
+}
+
+# 计数名称及显示名称
+COUNTER_LABELS = {
+    "files_seen": "检查的文件",
+    "files_excluded": "排除的文件",
+    "dirs_pruned": "剪枝的目录",
+    "packages": "扫描的 workspace 包",
+    "files_skipped": "跳过的过大文件",
+    "candidates": "预筛选候选",
+    "files_analyzed": "分析的文件",
+    "cache_hits": "索引命中",
+    "result_cache_hits": "结果缓存命中",
+    "duplicates": "内容重复的文件",
+    "bytes_read": "读取字节数",
+    "components": "有效组件",
+    "matches": "匹配结果",
+}
+
+
+class ScanDiagnostics:
+    def __init__(self):
+        """初始化一次查找的诊断信息"""
+        self.started_at = time.perf_counter()
+        self.total_seconds = 0.0
+        self.source = "scan"  # scan / browse / watcher / lazy
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        # 最慢文件的小顶堆：(耗时, 路径)
+        self._slowest: List[Tuple[float, str]] = []
+        # monorepo 各包并发扫描时会从多个线程记录
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """计时一个阶段（同名阶段的耗时累加）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """累加阶段耗时"""
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        """累加计数"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_file(self, path: str, read_seconds: float, extract_seconds: float, size: int) -> None:
+        """记录单个文件的读取和分析耗时"""
+        with self._lock:
+            self.add_time("read", read_seconds)
+            self.add_time("extract", extract_seconds)
+            self.count("files_analyzed")
+            self.count("bytes_read", size)
+
+            item = (read_seconds + extract_seconds, path)
+            if len(self._slowest) < SLOWEST_FILES:
+                heapq.heappush(self._slowest, item)
+            elif item > self._slowest[0]:
+                heapq.heapreplace(self._slowest, item)
+
+    def finish(self) -> None:
+        """记录总耗时"""
+        self.total_seconds = time.perf_counter() - self.started_at
+
+    @property
+    def ordered_phases(self) -> List[Tuple[str, float]]:
+        """按执行顺序排列的阶段耗时"""
+        order = list(PHASE_LABELS)
+        return sorted(
+            self.phases.items(),
+            key=lambda item: order.index(item[0]) if item[0] in PHASE_LABELS else len(order)
+        )
+
+    @property
+    def slowest_files(self) -> List[Tuple[float, str]]:
+        """最慢的文件，按耗时降序"""
+        return sorted(self._slowest, reverse=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典（毫秒）"""
+        return {
+            "source": self.source,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.ordered_phases},
+            "counters": dict(self.counters),
+            "slowest_files": [
+                {"path": path, "ms": round(seconds * 1000, 2)}
+                for seconds, path in self.slowest_files
+            ]
+        }
+
+    def format(self) -> str:
+        """格式化为工具输出中的诊断信息段落"""
+        lines = ["## 🩺 诊断信息", "", f"**来源：** {self.source}，**总耗时：** {self.total_seconds * 1000:.1f}ms", ""]
+
+        lines.append("**各阶段耗时：**")
+        for name, seconds in self.ordered_phases:
+            lines.append(f"- {PHASE_LABELS.get(name, name)}：{seconds * 1000:.1f}ms")
+        if "read" in self.phases or "extract" in self.phases:
+            lines.append("- （读取和提取为各文件耗时之和，并行分析时可能大于索引同步的实际耗时）")
+
+        if self.counters:
+            lines.append("")
+            lines.append("**计数：**")
+            for name, value in self.counters.items():
+                lines.append(f"- {COUNTER_LABELS.get(name, name)}：{value}")
+
+        if self._slowest:
+            lines.append("")
+            lines.append("**最慢的文件：**")
+            for seconds, path in self.slowest_files:
+                lines.append(f"- `{path}`：{seconds * 1000:.1f}ms")
+
+        return "\n".join(lines)
@@ -0,0 +1,116 @@
+"""
+Vue单文件组件（SFC）分块模块
+一次扫描定位 <template>、<script>、<script setup> 和 <style> 顶层块，
+供各个提取器只在相关的块上做匹配
+"""
+
+import re
+from typing import List
+
+_BLOCK_OPEN = re.compile(r'<(template|script|style)(\s[^>]*)?>', re.IGNORECASE)
+_TEMPLATE_TAG = re.compile(r'<(/?)template\b[^>]*>', re.IGNORECASE)
+_SCRIPT_CLOSE = re.compile(r'</script\s*>', re.IGNORECASE)
+_STYLE_CLOSE = re.compile(r'</style\s*>', re.IGNORECASE)
+_SETUP_ATTR = re.compile(r'\bsetup\b', re.IGNORECASE)
+
+
+class SfcBlocks:
+    """SFC 各个块的内容；非 .vue 文件的每个块都是完整的文件内容"""
+
+    __slots__ = (
+        "content", "is_sfc", "has_template", "has_script", "template", "script",
+        "script_setup", "style", "script_attrs", "style_attrs"
+    )
+
+    def __init__(self, content: str, is_sfc: bool):
+        self.content = content
+        self.is_sfc = is_sfc
+        self.has_template = False
+        self.has_script = False
+        self.template = ""
+        self.script = ""          # 普通 <script> 与 <script setup> 的合并内容
+        self.script_setup = ""
+        self.style = ""
+        self.script_attrs = ""
+        self.style_attrs = ""
+
+    @property
+    def code(self) -> str:
+        """模板和脚本（事件等既可能写在模板里也可能写在脚本里）"""
+        if not self.is_sfc:
+            return self.content
+        return f"{self.template}\n{self.script}"
+
+
+def split_sfc(content: str) -> SfcBlocks:
+    """把 .vue 文件内容切分为顶层块"""
+    blocks = SfcBlocks(content, is_sfc=True)
+    templates: List[str] = []
+    scripts: List[str] = []
+    setups: List[str] = []
+    styles: List[str] = []
+    script_attrs: List[str] = []
+    style_attrs: List[str] = []
+
+    pos = 0
+    length = len(content)
+    while pos < length:
+        match = _BLOCK_OPEN.search(content, pos)
+        if not match:
+            break
+
+        tag = match.group(1).lower()
+        attrs = match.group(2) or ""
+        start = match.end()
+
+        if tag == "template":
+            # 模板里可以嵌套 <template>（如 v-slot），按层级找到对应的闭合标签
+            depth = 1
+            end = length
+            close_end = length
+            for tag_match in _TEMPLATE_TAG.finditer(content, start):
+                if tag_match.group(1):
+                    depth -= 1
+                    if depth == 0:
+                        end = tag_match.start()
+                        close_end = tag_match.end()
+                        break
+                elif not tag_match.group(0).endswith("/>"):
+                    depth += 1
+            templates.append(content[start:end])
+        else:
+            closer = _SCRIPT_CLOSE if tag == "script" else _STYLE_CLOSE
+            close_match = closer.search(content, start)
+            end = close_match.start() if close_match else length
+            close_end = close_match.end() if close_match else length
+            if tag == "script":
+                scripts.append(content[start:end])
+                script_attrs.append(attrs)
+                if _SETUP_ATTR.search(attrs):
+                    setups.append(content[start:end])
+            else:
+                styles.append(content[start:end])
+                style_attrs.append(attrs)
+
+        pos = close_end
+
+    blocks.has_template = bool(templates)
+    blocks.has_script = bool(scripts)
+    blocks.template = "\n".join(templates)
+    blocks.script = "\n".join(scripts)
+    blocks.script_setup = "\n".join(setups)
+    blocks.style = "\n".join(styles)
+    blocks.script_attrs = " ".join(script_attrs)
+    blocks.style_attrs = " ".join(style_attrs)
+    return blocks
+
+
+def whole_file_blocks(content: str) -> SfcBlocks:
+    """JS/TS/JSX/TSX 文件不分块，每个块都是完整内容"""
+    blocks = SfcBlocks(content, is_sfc=False)
+    blocks.has_template = True
+    blocks.has_script = True
+    blocks.template = content
+    blocks.script = content
+    blocks.style = content
+    return blocks
@@ -0,0 +1,199 @@
+"""
+使用事件日志模块
+工具调用记录以 JSON Lines 格式追加写入：每条记录一行，记录一次调用只追加一行，
+不再读取和重写整个统计文件，耗时与历史记录的多少无关；
+统计数据按字节偏移量增量读取新追加的行。
+日志按记录日期分段（每天或每月一个文件），过期的分段整体压缩归档后删除
+"""
+
+import calendar
+import gzip
+import json
+import os
+import re
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# 分段周期
+SEGMENT_PERIODS = ('day', 'month')
+DEFAULT_SEGMENT_PERIOD = 'month'
+
+# 分段文件名：YYYY-MM.jsonl 或 YYYY-MM-DD.jsonl
+_SEGMENT_NAME = re.compile(r"^(\d{4}-\d{2}(?:-\d{2})?)\.jsonl$")
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(event: Dict[str, Any]) -> str:
+    """单条记录编码为一行"""
+    return json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+
+
+def append_archive(path: Path, events: Iterable[Dict[str, Any]]) -> None:
+    """把记录追加到 gzip 压缩的归档文件（每次追加一个 gzip 成员，可以直接用 gzip 整体解压）"""
+    data = "".join(_encode(event) for event in events).encode("utf-8")
+    if data:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "ab") as f:
+            f.write(data)
+
+
+def archive_by_month(directory: Path, prefix: str, events: Iterable[Dict[str, Any]]) -> None:
+    """按记录所在月份把记录追加到归档目录下的 {prefix}-YYYY-MM.jsonl.gz"""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for event in events:
+        month = (event.get("date") or str(event.get("timestamp", "")))[:7]
+        groups.setdefault(month, []).append(event)
+    for month, group in groups.items():
+        append_archive(Path(directory) / f"{prefix}-{month}.jsonl.gz", group)
+
+
+def _decode(line: bytes) -> Any:
+    """解析一行记录，格式错误时返回 None"""
+    try:
+        return json.loads(line)
+    except ValueError:
+        logger.warning(f"跳过格式错误的使用记录: {line[:80]!r}")
+        return None
+
+
+class UsageEventLog:
+    def __init__(self, path: Path):
+        """
+        初始化事件日志
+
+        Args:
+            path: 日志文件路径（不存在时在第一次写入时创建）
+        """
+        self.path = Path(path)
+
+    def append(self, event: Dict[str, Any]) -> None:
+        """
+        追加一条记录
+
+        记录以一次 write 写入追加模式打开的文件，多个服务进程共用同一个数据目录时各行也不会交错
+        """
+        self.append_many([event])
+
+    def append_many(self, events: Iterable[Dict[str, Any]]) -> None:
+        """追加一批记录（一次 write 写入）"""
+        data = "".join(_encode(event) for event in events).encode("utf-8")
+        if data:
+            with open(self.path, "ab", buffering=0) as f:
+                f.write(data)
+
+    def size(self) -> int:
+        """日志文件的字节数（不存在时为0）"""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def read_from(self, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        读取 offset 之后新追加的完整行（末尾正在写入、还没有换行符的行留到下次读取）
+
+        Returns:
+            (记录列表, 已读取到的偏移量)
+        """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return [], offset
+
+        end = chunk.rfind(b"\n") + 1
+        events = []
+        for line in chunk[:end].splitlines():
+            if line.strip():
+                event = _decode(line)
+                if isinstance(event, dict):
+                    events.append(event)
+        return events, offset + end
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """按写入顺序逐条读取全部记录"""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                if not line.endswith(b"\n") or not line.strip():
+                    continue
+                event = _decode(line)
+                if isinstance(event, dict):
+                    yield event
+
+
+class SegmentedEventLog:
+    def __init__(self, directory: Path, period: str = DEFAULT_SEGMENT_PERIOD):
+        """
+        初始化分段事件日志
+
+        Args:
+            directory: 分段文件所在目录（第一次写入时创建）
+            period: 新记录的分段周期（day / month）；已有的其他周期的分段照常读取和归档
+        """
+        self.directory = Path(directory)
+        self.period = period if period in SEGMENT_PERIODS else DEFAULT_SEGMENT_PERIOD
+
+    def segment_key(self, date: str) -> str:
+        """记录日期（YYYY-MM-DD）所属分段"""
+        return date[:10] if self.period == 'day' else date[:7]
+
+    def segment(self, key: str) -> UsageEventLog:
+        """分段对应的日志文件"""
+        return UsageEventLog(self.directory / f"{key}.jsonl")
+
+    def keys(self) -> List[str]:
+        """已有的分段（按时间排序）"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(match.group(1) for match in map(_SEGMENT_NAME.match, names) if match)
+
+    @staticmethod
+    def segment_end(key: str) -> str:
+        """分段覆盖的最后一天（YYYY-MM-DD）"""
+        if len(key) == 10:
+            return key
+        year, month = int(key[:4]), int(key[5:7])
+        return f"{key}-{calendar.monthrange(year, month)[1]:02d}"
+
+    def append_many(self, events: Iterable[Dict[str, Any]]) -> None:
+        """按记录日期把一批记录追加到各自的分段（每个分段一次 write）"""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for event in events:
+            date = event.get("date") or str(event.get("timestamp", ""))[:10]
+            groups.setdefault(self.segment_key(date), []).append(event)
+        if not groups:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for key, group in groups.items():
+            self.segment(key).append_many(group)
+
+    def iter_events(self, since_date: str = "") -> Iterator[Dict[str, Any]]:
+        """
+        按时间顺序读取记录
+
+        Args:
+            since_date: 只读取覆盖该日期（YYYY-MM-DD）及之后的分段，空字符串表示全部；
+                分段内早于该日期的记录仍会返回，由调用方按时间过滤
+        """
+        for key in self.keys():
+            if self.segment_end(key) >= since_date:
+                yield from self.segment(key).iter_events()
+
+    def archive_segment(self, key: str, archive_path: Path) -> None:
+        """把分段追加到 gzip 归档文件并删除分段"""
+        segment = self.segment(key)
+        archive_path = Path(archive_path)
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(segment.path, "rb") as src, gzip.open(archive_path, "ab") as dst:
+            shutil.copyfileobj(src, dst)
+        segment.path.unlink()
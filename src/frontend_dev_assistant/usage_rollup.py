@@ -0,0 +1,165 @@
+"""
+使用统计汇总模块
+把记录按天汇总为统计桶：每个工具、每个用户的调用次数，各工具的反馈分布，以及AI编程效果指标的合计。
+计数在写入记录时累加到当天的统计桶和总计中，统计报告只合并日期范围内的统计桶，不再逐条读取记录；
+过期的原始记录压缩归档后只保留每日汇总
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# 生产力评分低于该值、新增复杂度高于该值的会话分别计数（用于改进建议）
+LOW_PRODUCTIVITY_SCORE = 0.3
+HIGH_COMPLEXITY_SCORE = 20
+
+# AI编程效果指标中需要求和的字段
+AI_SUM_FIELDS = (
+    "lines_generated", "files_modified", "session_duration",
+    "ai_probability", "quality_score", "productivity_score"
+)
+
+# AI编程效果指标中按是否为真计数的字段
+AI_FLAG_FIELDS = ("has_comments", "has_error_handling", "has_type_annotations")
+
+# 每日汇总中记录当天已由归档计入的记录种类（calls / ai）
+COMPACTED_KEY = "compacted"
+
+
+def _add_counts(target: Dict[str, int], source: Dict[str, int]) -> None:
+    """把 source 中的计数累加到 target"""
+    for key, count in source.items():
+        target[key] = target.get(key, 0) + count
+
+
+def new_ai_summary() -> Dict[str, Any]:
+    """空的AI编程效果合计"""
+    summary: Dict[str, Any] = {"sessions": 0}
+    summary.update((field, 0) for field in AI_SUM_FIELDS + AI_FLAG_FIELDS)
+    summary.update(ratings={}, tools={}, low_productivity=0, high_complexity=0)
+    return summary
+
+
+def add_ai_log(summary: Dict[str, Any], log: Dict[str, Any]) -> None:
+    """把一条AI编程效果记录计入合计"""
+    metrics = log.get("ai_metrics", {})
+    summary["sessions"] += 1
+    for field in AI_SUM_FIELDS:
+        summary[field] += metrics.get(field, 0) or 0
+    for field in AI_FLAG_FIELDS:
+        if metrics.get(field):
+            summary[field] += 1
+
+    rating = metrics.get("efficiency_rating", "未知")
+    summary["ratings"][rating] = summary["ratings"].get(rating, 0) + 1
+    tool_name = log.get("tool_name", "unknown")
+    summary["tools"][tool_name] = summary["tools"].get(tool_name, 0) + 1
+
+    if (metrics.get("productivity_score", 0) or 0) < LOW_PRODUCTIVITY_SCORE:
+        summary["low_productivity"] += 1
+    if (metrics.get("complexity_added", 0) or 0) > HIGH_COMPLEXITY_SCORE:
+        summary["high_complexity"] += 1
+
+
+def merge_ai_summary(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    """把 source 合计累加到 target"""
+    for key, value in source.items():
+        if isinstance(value, dict):
+            _add_counts(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+def add_call(bucket: Dict[str, Any], event: Dict[str, Any]) -> None:
+    """把一次工具调用计入统计桶（"tools": 工具 -> 次数, "users": 用户 -> 次数）"""
+    tool_name = event.get("tool_name", "unknown")
+    user_id = event.get("user_id") or "unknown"
+    tools = bucket.setdefault("tools", {})
+    tools[tool_name] = tools.get(tool_name, 0) + 1
+    users = bucket.setdefault("users", {})
+    users[user_id] = users.get(user_id, 0) + 1
+
+
+def add_feedback(bucket: Dict[str, Any], tool_name: str, feedback: str) -> None:
+    """把一条反馈计入统计桶（"feedback": 工具 -> 反馈 -> 条数）"""
+    counts = bucket.setdefault("feedback", {}).setdefault(tool_name, {})
+    counts[feedback] = counts.get(feedback, 0) + 1
+
+
+def add_ai(bucket: Dict[str, Any], log: Dict[str, Any]) -> None:
+    """把一条AI编程效果记录计入统计桶（"ai": 合计）"""
+    add_ai_log(bucket.setdefault("ai", new_ai_summary()), log)
+
+
+def merge_bucket(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    """把 source 统计桶累加到 target"""
+    for key in ("tools", "users"):
+        if key in source:
+            _add_counts(target.setdefault(key, {}), source[key])
+    for tool_name, counts in source.get("feedback", {}).items():
+        _add_counts(target.setdefault("feedback", {}).setdefault(tool_name, {}), counts)
+    if "ai" in source:
+        merge_ai_summary(target.setdefault("ai", new_ai_summary()), source["ai"])
+
+
+def new_counters() -> Dict[str, Any]:
+    """空的计数：{"days": 日期 -> 统计桶, "total": 全部时间的统计桶}"""
+    return {"days": {}, "total": {}}
+
+
+def record(counters: Dict[str, Any], date: str, add: Callable[..., None], *args: Any) -> None:
+    """用 add（add_call / add_feedback / add_ai）把一条记录同时计入当天的统计桶和总计"""
+    add(counters["days"].setdefault(date, {}), *args)
+    add(counters["total"], *args)
+
+
+def range_bucket(counters: Dict[str, Any], since_date: Optional[str]) -> Dict[str, Any]:
+    """
+    日期范围内的统计（新的统计桶，不引用 counters 中的数据）
+
+    Args:
+        since_date: 起始日期（YYYY-MM-DD），None 表示全部时间（直接使用总计）
+    """
+    merged: Dict[str, Any] = {}
+    if since_date is None:
+        merge_bucket(merged, counters.get("total", {}))
+        return merged
+    for date in sorted(counters.get("days", {})):
+        if date >= since_date:
+            merge_bucket(merged, counters["days"][date])
+    return merged
+
+
+def merge_compacted(target: Dict[str, Dict[str, Any]], source: Dict[str, Dict[str, Any]], kind: str) -> None:
+    """
+    把归档时汇总出的各天计入每日汇总（kind: calls / ai）
+
+    已计入的种类记录在当天的 "compacted" 中，归档中途退出后重新归档时不会重复计数
+    """
+    for date, bucket in source.items():
+        day = target.setdefault(date, {})
+        compacted = day.setdefault(COMPACTED_KEY, [])
+        if kind in compacted:
+            continue
+        merge_bucket(day, bucket)
+        compacted.append(kind)
+
+
+def rollup_calls(events: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """把调用记录按天汇总：日期 -> {"tools": 工具 -> 次数, "users": 用户 -> 次数}"""
+    days: Dict[str, Dict[str, Any]] = {}
+    for event in events:
+        add_call(days.setdefault(event.get("date") or event.get("timestamp", "")[:10], {}), event)
+    return days
+
+
+def rollup_ai_logs(logs: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """把AI编程效果记录按天汇总：日期 -> {"ai": 合计}"""
+    days: Dict[str, Dict[str, Any]] = {}
+    for log in logs:
+        add_ai(days.setdefault(log.get("date") or log.get("timestamp", "")[:10], {}), log)
+    return days
+
+
+def merge_rollups(target: Dict[str, Dict[str, Any]], source: Dict[str, Dict[str, Any]]) -> None:
+    """把 source 中各天的汇总累加到 target"""
+    for date, bucket in source.items():
+        merge_bucket(target.setdefault(date, {}), bucket)
@@ -0,0 +1,566 @@
+"""
+使用统计的 SQLite 存储模块
+调用记录、反馈、AI编程效果记录以及每日统计、工具统计保存在本地 SQLite 数据库中：
+WAL 模式下读写互不阻塞，时间和工具列建有索引；
+每日的工具调用次数、用户调用次数、反馈分布和AI编程效果合计在写入时累加，统计报告只读取这些计数；
+连续的写入合并在同一个事务中，攒够一批或超过提交间隔才提交一次；
+过期的调用记录和AI编程效果记录归档为 gzip 文件并汇总到每日汇总表后删除
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .usage_event_log import archive_by_month
+from .usage_rollup import (
+    add_ai, add_ai_log, merge_ai_summary, merge_rollups, new_ai_summary, rollup_ai_logs, rollup_calls
+)
+
+# 攒够多少次写入提交一次事务
+COMMIT_BATCH_SIZE = 100
+
+# 第一次未提交的写入之后最多等待多久提交（秒，由调用方定时调用 commit）
+COMMIT_INTERVAL = 0.5
+
+# 其他进程持有写锁时的等待时间（秒）
+BUSY_TIMEOUT = 5.0
+
+# 记录每日计数已由已有记录计算过的元数据键
+COUNTERS_KEY = 'daily_counters'
+
+# daily_ai 表中全部时间总计一行的日期
+TOTAL_DATE = ''
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS usage_logs (
+    id TEXT,
+    tool_name TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    date TEXT NOT NULL,
+    arguments TEXT,
+    user_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_usage_logs_timestamp ON usage_logs(timestamp, tool_name, user_id);
+CREATE INDEX IF NOT EXISTS idx_usage_logs_tool_name ON usage_logs(tool_name);
+
+CREATE TABLE IF NOT EXISTS user_feedback (
+    id TEXT,
+    tool_name TEXT NOT NULL,
+    feedback TEXT,
+    context TEXT,
+    timestamp TEXT NOT NULL,
+    user_id TEXT,
+    enhanced_usage_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_user_feedback_timestamp ON user_feedback(timestamp, tool_name, feedback);
+
+CREATE TABLE IF NOT EXISTS enhanced_usage_logs (
+    id TEXT,
+    tool_name TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    date TEXT NOT NULL,
+    user_id TEXT,
+    context TEXT,
+    user_feedback TEXT,
+    ai_metrics TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_enhanced_usage_logs_timestamp ON enhanced_usage_logs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_enhanced_usage_logs_tool_name ON enhanced_usage_logs(tool_name);
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+    date TEXT NOT NULL,
+    tool_name TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, tool_name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS tool_usage (
+    tool_name TEXT PRIMARY KEY,
+    total_uses INTEGER NOT NULL DEFAULT 0,
+    first_used TEXT,
+    last_used TEXT,
+    feedback_scores TEXT NOT NULL DEFAULT '[]',
+    contexts TEXT NOT NULL DEFAULT '[]'
+);
+
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    date TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS daily_users (
+    date TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, user_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS daily_feedback (
+    date TEXT NOT NULL,
+    tool_name TEXT NOT NULL,
+    feedback TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, tool_name, feedback)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS daily_ai (
+    date TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+class SQLiteUsageStore:
+    def __init__(self, db_path: Path):
+        """
+        打开（必要时创建）数据库
+
+        Args:
+            db_path: 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL 模式下 NORMAL 不会损坏数据库，只是断电时可能丢失最后几个已提交的事务
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        # 当前事务中尚未提交的写入次数
+        self._pending = 0
+
+        # 旧版数据库：由已有记录计算一次每日计数
+        if self.get_metadata(COUNTERS_KEY) is None:
+            self._init_counters()
+
+    @property
+    def pending(self) -> int:
+        """尚未提交的写入次数"""
+        return self._pending
+
+    def commit(self) -> None:
+        """提交当前事务"""
+        with self._lock:
+            if self._pending:
+                self._conn.commit()
+                self._pending = 0
+
+    def close(self) -> None:
+        """提交未提交的写入并关闭数据库"""
+        with self._lock:
+            self.commit()
+            self._conn.close()
+
+    def _written(self, count: int = 1) -> None:
+        """记录写入次数，攒够一批时提交"""
+        self._pending += count
+        if self._pending >= COMMIT_BATCH_SIZE:
+            self.commit()
+
+    # ---- 写入 ----
+
+    def log_call(self, entry: Dict[str, Any]) -> None:
+        """记录一次工具调用，同时累加每日统计和工具统计"""
+        self.log_calls([entry])
+
+    def log_calls(self, entries: List[Dict[str, Any]]) -> None:
+        """批量记录工具调用（写入同一个事务）"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO usage_logs (id, tool_name, timestamp, date, arguments, user_id) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (entry.get("id"), entry["tool_name"], entry["timestamp"], entry["date"],
+                     json.dumps(entry.get("arguments") or {}, ensure_ascii=False, default=str), entry.get("user_id"))
+                    for entry in entries
+                )
+            )
+            self._conn.executemany(
+                "INSERT INTO daily_stats (date, tool_name, calls) VALUES (?, ?, 1) "
+                "ON CONFLICT (date, tool_name) DO UPDATE SET calls = calls + 1",
+                ((entry["date"], entry["tool_name"]) for entry in entries)
+            )
+            self._conn.executemany(
+                "INSERT INTO daily_users (date, user_id, calls) VALUES (?, ?, 1) "
+                "ON CONFLICT (date, user_id) DO UPDATE SET calls = calls + 1",
+                ((entry["date"], entry.get("user_id") or "unknown") for entry in entries)
+            )
+            self._conn.executemany(
+                "INSERT INTO tool_usage (tool_name, total_uses, first_used, last_used) VALUES (?, 1, ?, ?) "
+                "ON CONFLICT (tool_name) DO UPDATE SET total_uses = total_uses + 1, last_used = excluded.last_used",
+                ((entry["tool_name"], entry["timestamp"], entry["timestamp"]) for entry in entries)
+            )
+            self._written(len(entries))
+
+    def record_usage(
+        self,
+        enhanced_entry: Dict[str, Any],
+        feedback_entry: Optional[Dict[str, Any]] = None,
+        feedback_score: Optional[int] = None
+    ) -> None:
+        """
+        记录一次AI编程效果数据；有反馈时同时记录反馈，并追加到已使用过的工具的反馈分数和使用上下文中，
+        当天和全部时间的AI编程效果合计、当天的反馈分布同时累加
+        """
+        with self._lock:
+            self._insert_enhanced(enhanced_entry)
+            date = enhanced_entry.get("date") or enhanced_entry.get("timestamp", "")[:10]
+            for key in (date, TOTAL_DATE):
+                row = self._conn.execute("SELECT data FROM daily_ai WHERE date = ?", (key,)).fetchone()
+                summary = json.loads(row[0]) if row else new_ai_summary()
+                add_ai_log(summary, enhanced_entry)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO daily_ai (date, data) VALUES (?, ?)",
+                    (key, json.dumps(summary, ensure_ascii=False))
+                )
+            if feedback_entry is not None:
+                self._insert_feedback(feedback_entry)
+                self._conn.execute(
+                    "INSERT INTO daily_feedback (date, tool_name, feedback, count) VALUES (?, ?, ?, 1) "
+                    "ON CONFLICT (date, tool_name, feedback) DO UPDATE SET count = count + 1",
+                    (feedback_entry.get("timestamp", "")[:10], feedback_entry.get("tool_name", "unknown"),
+                     feedback_entry.get("feedback") or "")
+                )
+                row = self._conn.execute(
+                    "SELECT feedback_scores, contexts FROM tool_usage WHERE tool_name = ?",
+                    (feedback_entry["tool_name"],)
+                ).fetchone()
+                if row is not None:
+                    scores, contexts = json.loads(row[0]), json.loads(row[1])
+                    scores.append(feedback_score)
+                    context = feedback_entry.get("context")
+                    if context and context not in contexts:
+                        contexts.append(context)
+                    self._conn.execute(
+                        "UPDATE tool_usage SET feedback_scores = ?, contexts = ? WHERE tool_name = ?",
+                        (json.dumps(scores), json.dumps(contexts, ensure_ascii=False), feedback_entry["tool_name"])
+                    )
+            self._written()
+
+    def _insert_enhanced(self, entry: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT INTO enhanced_usage_logs (id, tool_name, timestamp, date, user_id, context, user_feedback, ai_metrics) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (entry.get("id"), entry.get("tool_name", "unknown"), entry.get("timestamp", ""),
+             entry.get("date") or entry.get("timestamp", "")[:10],
+             entry.get("user_id"), entry.get("context"), entry.get("user_feedback"),
+             json.dumps(entry.get("ai_metrics") or {}, ensure_ascii=False))
+        )
+
+    def _insert_feedback(self, entry: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT INTO user_feedback (id, tool_name, feedback, context, timestamp, user_id, enhanced_usage_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (entry.get("id"), entry.get("tool_name", "unknown"), entry.get("feedback"), entry.get("context"),
+             entry.get("timestamp", ""), entry.get("user_id"), entry.get("enhanced_usage_id"))
+        )
+
+    # ---- 迁移 ----
+
+    def get_metadata(self, key: str) -> Optional[str]:
+        """读取元数据"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def import_data(self, data: Dict[str, Any], marker: str) -> Optional[int]:
+        """
+        导入旧版格式的使用数据（一次性迁移），与迁移标记在同一个事务中提交
+
+        Args:
+            data: 与 usage_stats.json 格式相同的数据
+            marker: 写入 metadata 的迁移标记键
+
+        Returns:
+            导入的调用记录条数；其他进程已经完成迁移时为 None
+        """
+        logs = data.get("usage_logs", [])
+        with self._lock:
+            self.commit()
+            # 先拿到写锁再检查迁移标记，多个服务进程同时启动时只有一个会导入
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("SELECT 1 FROM metadata WHERE key = ?", (marker,)).fetchone():
+                    self._conn.rollback()
+                    return None
+                self._conn.executemany(
+                    "INSERT INTO usage_logs (id, tool_name, timestamp, date, arguments, user_id) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (log.get("id"), log.get("tool_name", "unknown"), log.get("timestamp", ""),
+                         log.get("date") or log.get("timestamp", "")[:10],
+                         json.dumps(log.get("arguments") or {}, ensure_ascii=False), log.get("user_id"))
+                        for log in logs
+                    )
+                )
+                for entry in data.get("enhanced_usage_logs", []):
+                    self._insert_enhanced(entry)
+                for entry in data.get("user_feedback", []):
+                    self._insert_feedback(entry)
+                self._conn.executemany(
+                    "INSERT INTO daily_stats (date, tool_name, calls) VALUES (?, ?, ?) "
+                    "ON CONFLICT (date, tool_name) DO UPDATE SET calls = calls + excluded.calls",
+                    (
+                        (date, tool_name, count)
+                        for date, stats in data.get("daily_stats", {}).items()
+                        for tool_name, count in stats.get("tool_breakdown", {}).items()
+                    )
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO tool_usage (tool_name, total_uses, first_used, last_used, feedback_scores, contexts) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (tool_name, usage.get("total_uses", 0), usage.get("first_used"), usage.get("last_used"),
+                         json.dumps(usage.get("feedback_scores", [])),
+                         json.dumps(usage.get("contexts", []), ensure_ascii=False))
+                        for tool_name, usage in data.get("tool_usage", {}).items()
+                    )
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                    (marker, json.dumps({"usage_logs": len(logs)}))
+                )
+                self._rebuild_counters()
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return len(logs)
+
+    def _init_counters(self) -> None:
+        """一次性由已有记录计算每日计数（其他进程已经计算过时跳过）"""
+        with self._lock:
+            self.commit()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("SELECT 1 FROM metadata WHERE key = ?", (COUNTERS_KEY,)).fetchone():
+                    self._conn.rollback()
+                    return
+                self._rebuild_counters()
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _rebuild_counters(self) -> None:
+        """由记录和每日汇总重新计算每日用户调用次数、反馈分布和AI编程效果合计（在调用方的事务中执行）"""
+        for table in ("daily_users", "daily_feedback", "daily_ai"):
+            self._conn.execute(f"DELETE FROM {table}")
+        rollups = {
+            date: json.loads(data) for date, data in self._conn.execute("SELECT date, data FROM daily_rollups")
+        }
+
+        self._conn.execute(
+            "INSERT INTO daily_users (date, user_id, calls) "
+            "SELECT date, COALESCE(user_id, 'unknown'), COUNT(*) FROM usage_logs GROUP BY 1, 2"
+        )
+        self._conn.executemany(
+            "INSERT INTO daily_users (date, user_id, calls) VALUES (?, ?, ?) "
+            "ON CONFLICT (date, user_id) DO UPDATE SET calls = calls + excluded.calls",
+            (
+                (date, user_id, count)
+                for date, bucket in rollups.items()
+                for user_id, count in bucket.get("users", {}).items()
+            )
+        )
+        self._conn.execute(
+            "INSERT INTO daily_feedback (date, tool_name, feedback, count) "
+            "SELECT substr(timestamp, 1, 10), tool_name, COALESCE(feedback, ''), COUNT(*) FROM user_feedback "
+            "GROUP BY 1, 2, 3"
+        )
+
+        days: Dict[str, Dict[str, Any]] = {
+            date: {"ai": bucket["ai"]} for date, bucket in rollups.items() if "ai" in bucket
+        }
+        for date, tool_name, ai_metrics in self._conn.execute(
+            "SELECT date, tool_name, ai_metrics FROM enhanced_usage_logs ORDER BY rowid"
+        ).fetchall():
+            add_ai(days.setdefault(date, {}), {"tool_name": tool_name, "ai_metrics": json.loads(ai_metrics or "{}")})
+        total = new_ai_summary()
+        for date in sorted(days):
+            merge_ai_summary(total, days[date]["ai"])
+        days[TOTAL_DATE] = {"ai": total}
+        self._conn.executemany(
+            "INSERT INTO daily_ai (date, data) VALUES (?, ?)",
+            ((date, json.dumps(bucket["ai"], ensure_ascii=False)) for date, bucket in days.items())
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", (COUNTERS_KEY, "1")
+        )
+
+    # ---- 读取 ----
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[tuple]:
+        """执行查询（先提交未提交的写入，让其他进程也能看到）"""
+        with self._lock:
+            self.commit()
+            return self._conn.execute(sql, params).fetchall()
+
+    def call_counts(self, since_date: str = "") -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        since_date（YYYY-MM-DD，空字符串表示全部）及之后的调用次数，由每日计数求和
+
+        Returns:
+            (工具 -> 调用次数, 用户 -> 调用次数)
+        """
+        tool_counts = dict(self._query(
+            "SELECT tool_name, SUM(calls) FROM daily_stats WHERE date >= ? GROUP BY tool_name", (since_date,)
+        ))
+        user_activity = dict(self._query(
+            "SELECT user_id, SUM(calls) FROM daily_users WHERE date >= ? GROUP BY user_id", (since_date,)
+        ))
+        return tool_counts, user_activity
+
+    def daily_stats(self, since_date: str = "") -> Dict[str, Dict[str, Any]]:
+        """since_date（YYYY-MM-DD）及之后的每日统计，格式与 usage_stats.json 中的 daily_stats 相同"""
+        daily: Dict[str, Dict[str, Any]] = {}
+        for date, tool_name, calls in self._query(
+            "SELECT date, tool_name, calls FROM daily_stats WHERE date >= ? ORDER BY date", (since_date,)
+        ):
+            stats = daily.setdefault(date, {"total_calls": 0, "tool_breakdown": {}})
+            stats["total_calls"] += calls
+            stats["tool_breakdown"][tool_name] = calls
+        return daily
+
+    def feedback_counts(self, since_date: str = "") -> Dict[str, Dict[str, int]]:
+        """since_date 及之后的反馈分布：工具 -> 反馈 -> 条数"""
+        counts: Dict[str, Dict[str, int]] = {}
+        for tool_name, feedback, count in self._query(
+            "SELECT tool_name, feedback, SUM(count) FROM daily_feedback WHERE date >= ? "
+            "GROUP BY tool_name, feedback", (since_date,)
+        ):
+            counts.setdefault(tool_name, {})[feedback] = count
+        return counts
+
+    def ai_summary(self, since_date: Optional[str] = None) -> Dict[str, Any]:
+        """since_date 及之后的AI编程效果合计（None 表示全部时间，直接读取总计）"""
+        if since_date is None:
+            rows = self._query("SELECT data FROM daily_ai WHERE date = ?", (TOTAL_DATE,))
+        else:
+            rows = self._query(
+                "SELECT data FROM daily_ai WHERE date >= ? AND date != ? ORDER BY date", (since_date, TOTAL_DATE)
+            )
+        summary = new_ai_summary()
+        for (data,) in rows:
+            merge_ai_summary(summary, json.loads(data))
+        return summary
+
+    def enhanced_logs(self, since: str = "") -> List[Dict[str, Any]]:
+        """since 之后的AI编程效果记录"""
+        return self._enhanced_rows("timestamp >= ? ORDER BY timestamp", (since,))
+
+    def rollups(self, since_date: str = "") -> Dict[str, Dict[str, Any]]:
+        """since_date（YYYY-MM-DD）及之后的每日汇总（已归档的记录）"""
+        return {
+            date: json.loads(data)
+            for date, data in self._query(
+                "SELECT date, data FROM daily_rollups WHERE date >= ? ORDER BY date", (since_date,)
+            )
+        }
+
+    def _call_rows(self, where: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        return [
+            {"id": row[0], "tool_name": row[1], "timestamp": row[2], "date": row[3],
+             "arguments": json.loads(row[4] or "{}"), "user_id": row[5]}
+            for row in self._query(
+                f"SELECT id, tool_name, timestamp, date, arguments, user_id FROM usage_logs WHERE {where}", params
+            )
+        ]
+
+    def _enhanced_rows(self, where: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": row[0], "tool_name": row[1], "timestamp": row[2], "date": row[3], "user_id": row[4],
+                "context": row[5], "user_feedback": row[6], "ai_metrics": json.loads(row[7] or "{}")
+            }
+            for row in self._query(
+                "SELECT id, tool_name, timestamp, date, user_id, context, user_feedback, ai_metrics "
+                f"FROM enhanced_usage_logs WHERE {where}", params
+            )
+        ]
+
+    # ---- 归档 ----
+
+    def compact(self, cutoff_date: str, archive_dir: Path) -> Tuple[int, int]:
+        """
+        把 cutoff_date（YYYY-MM-DD）之前的调用记录和AI编程效果记录追加到归档目录下按月的 gzip 文件，
+        汇总到每日汇总表后从表中删除（汇总和删除在同一个事务中提交）
+
+        Returns:
+            (归档的调用记录条数, 归档的AI编程效果记录条数)
+        """
+        with self._lock:
+            self.commit()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                calls = self._call_rows("timestamp < ? ORDER BY rowid", (cutoff_date,))
+                enhanced = self._enhanced_rows("timestamp < ? ORDER BY rowid", (cutoff_date,))
+                if not calls and not enhanced:
+                    self._conn.rollback()
+                    return 0, 0
+
+                rollups = rollup_calls(calls)
+                merge_rollups(rollups, rollup_ai_logs(enhanced))
+                self._merge_rollups(rollups)
+                self._conn.execute("DELETE FROM usage_logs WHERE timestamp < ?", (cutoff_date,))
+                self._conn.execute("DELETE FROM enhanced_usage_logs WHERE timestamp < ?", (cutoff_date,))
+
+                # 归档文件在提交前写入：提交失败时记录仍在表中，下次归档会重复写入归档文件但不会丢失
+                archive_by_month(archive_dir, "usage_logs", calls)
+                archive_by_month(archive_dir, "enhanced_usage_logs", enhanced)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return len(calls), len(enhanced)
+
+    def _merge_rollups(self, rollups: Dict[str, Dict[str, Any]]) -> None:
+        """把每日汇总累加到汇总表中"""
+        dates = list(rollups)
+        existing: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(dates), 500):
+            chunk = dates[start:start + 500]
+            existing.update(
+                (date, json.loads(data))
+                for date, data in self._conn.execute(
+                    f"SELECT date, data FROM daily_rollups WHERE date IN ({','.join('?' * len(chunk))})", chunk
+                )
+            )
+        merge_rollups(existing, rollups)
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO daily_rollups (date, data) VALUES (?, ?)",
+            ((date, json.dumps(existing[date], ensure_ascii=False)) for date in dates)
+        )
+
+    def export_data(self) -> Dict[str, Any]:
+        """导出为旧版 usage_stats.json 格式（导出脚本使用）"""
+        usage_logs = self._call_rows("1 ORDER BY rowid")
+        user_feedback = [
+            {"id": row[0], "tool_name": row[1], "feedback": row[2], "context": row[3], "timestamp": row[4],
+             "user_id": row[5], "enhanced_usage_id": row[6]}
+            for row in self._query(
+                "SELECT id, tool_name, feedback, context, timestamp, user_id, enhanced_usage_id "
+                "FROM user_feedback ORDER BY rowid"
+            )
+        ]
+        tool_usage = {
+            row[0]: {"total_uses": row[1], "first_used": row[2], "last_used": row[3],
+                     "feedback_scores": json.loads(row[4]), "contexts": json.loads(row[5])}
+            for row in self._query(
+                "SELECT tool_name, total_uses, first_used, last_used, feedback_scores, contexts FROM tool_usage"
+            )
+        }
+        return {
+            "metadata": {"storage": "sqlite", "database": str(self.db_path)},
+            "daily_stats": self.daily_stats(),
+            "tool_usage": tool_usage,
+            "user_feedback": user_feedback,
+            "usage_logs": usage_logs,
+            "enhanced_usage_logs": self.enhanced_logs(),
+            "daily_rollups": self.rollups()
+        }
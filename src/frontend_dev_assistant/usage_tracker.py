@@ -8,17 +8,112 @@ import os
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+import time
 import uuid
 import asyncio
+import threading
+
+from .usage_event_log import (
+    SEGMENT_PERIODS, DEFAULT_SEGMENT_PERIOD, SegmentedEventLog, UsageEventLog, archive_by_month
+)
+from .usage_rollup import (
+    add_ai, add_call, add_feedback, merge_bucket, merge_compacted, merge_rollups, new_ai_summary,
+    new_counters, range_bucket, record, rollup_ai_logs, rollup_calls
+)
+from .usage_store import SQLiteUsageStore, COMMIT_INTERVAL
+from .write_behind import WriteBehindQueue
+
+# 由调用记录汇总出的工具统计字段（保存在汇总文件中，其余字段保存在统计文件中）
+CALL_USAGE_FIELDS = ("total_uses", "first_used", "last_used")
+
+# 存储方式：json（默认，统计文件 + 事件日志）或 sqlite
+USAGE_BACKEND_ENV = 'FRONTEND_DEV_ASSISTANT_USAGE_BACKEND'
+USAGE_BACKENDS = ('json', 'sqlite')
+
+# SQLite 数据库中记录已从 JSON 文件迁移的元数据键
+SQLITE_MIGRATION_KEY = 'migrated_from_json'
+
+# 事件日志的分段周期（day / month）
+USAGE_SEGMENT_ENV = 'FRONTEND_DEV_ASSISTANT_USAGE_SEGMENT'
+
+# 原始记录保留天数，更早的记录归档并汇总为每日汇总（0 表示永久保留）
+USAGE_RETENTION_ENV = 'FRONTEND_DEV_ASSISTANT_USAGE_RETENTION_DAYS'
+DEFAULT_RETENTION_DAYS = 90
+
+# 归档锁文件超过该时间（秒）视为进程异常退出时残留
+COMPACT_LOCK_TIMEOUT = 3600
+
+# 写入时更新的汇总最多每隔多久（秒）保存一次，退出时保存最新的汇总
+AGGREGATES_SAVE_INTERVAL = 1.0
+
+# 统计报告的日期范围对应的天数（含今天，与每日使用趋势的日期相同）
+RANGE_DAYS = {"today": 1, "week": 7, "month": 30}
+
+# 反馈对应的分数
+FEEDBACK_SCORES = {
+    "excellent": 5,
+    "good": 4,
+    "average": 3,
+    "poor": 2
+}
+
 
 class UsageTracker:
-    def __init__(self):
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        segment_period: Optional[str] = None,
+        retention_days: Optional[int] = None
+    ):
+        """
+        初始化使用统计追踪器
+        
+        Args:
+            backend: 存储方式（json / sqlite），默认读取环境变量 FRONTEND_DEV_ASSISTANT_USAGE_BACKEND
+            segment_period: 事件日志分段周期（day / month），默认读取环境变量 FRONTEND_DEV_ASSISTANT_USAGE_SEGMENT
+            retention_days: 原始记录保留天数，默认读取环境变量 FRONTEND_DEV_ASSISTANT_USAGE_RETENTION_DAYS
+        """
         # 智能确定数据目录位置
         self.data_dir = self._determine_data_directory()
         self.data_dir.mkdir(exist_ok=True)
         self.usage_file = self.data_dir / "usage_stats.json"
+        # 调用记录按日期分段逐行追加到事件日志，每日统计和工具使用次数由日志增量汇总到单独的小文件
+        self.events_dir = self.data_dir / "usage_events"
+        self.legacy_events_file = self.data_dir / "usage_events.jsonl"
+        self.aggregates_file = self.data_dir / "usage_aggregates.json"
+        self.event_log = SegmentedEventLog(self.events_dir, self._resolve_segment_period(segment_period))
+        # 汇总在内存中维护：写入线程写完每批记录后立即计入，定期保存到汇总文件
+        self._aggregates: Optional[Dict[str, Any]] = None
+        self._aggregates_lock = threading.RLock()
+        self._aggregates_dirty = False
+        self._aggregates_saved_at = 0.0
+        # 超过保留天数的原始记录压缩归档，统计较早的日期时读取每日汇总
+        self.rollups_file = self.data_dir / "usage_rollups.json"
+        self.archive_dir = self.data_dir / "usage_archive"
+        self.retention_days = self._resolve_retention_days(retention_days)
+        self._compacted_on: Optional[str] = None
+        # 统计文件的读取-修改-保存（记录使用情况、归档AI编程效果记录）持有，归档在线程池中进行
+        self._stats_lock = threading.Lock()
         self.init_usage_file()
         
+        # SQLite 存储：第一次使用时从 JSON 文件导入已有数据（旧版格式不再迁移到事件日志分段）
+        self.backend = self._resolve_backend(backend)
+        if self.backend == 'json':
+            self._migrate_legacy_logs()
+            self._split_event_log()
+            self._migrate_counters()
+        self.store: Optional[SQLiteUsageStore] = None
+        self._commit_handle: Optional[asyncio.TimerHandle] = None
+        if self.backend == 'sqlite':
+            self.store = SQLiteUsageStore(self.data_dir / "usage.db")
+            self._migrate_to_sqlite()
+        
+        # 调用记录由后台线程批量写入，工具调用不等待文件或数据库写入
+        self._writer = WriteBehindQueue(
+            "usage-log", self._write_calls, spill_path=self.data_dir / "usage_calls.spill.jsonl"
+        )
+        self._maybe_compact()
+        
         # 初始化云端追踪器
         self.cloud_tracker = None
         self._init_cloud_tracker()
@@ -59,6 +154,209 @@ class UsageTracker:
         print(f"使用默认项目数据目录: {project_data_dir}")
         return project_data_dir
     
+    def _resolve_backend(self, backend: Optional[str]) -> str:
+        """确定存储方式：参数 > 环境变量，默认 json"""
+        if backend is None:
+            backend = os.environ.get(USAGE_BACKEND_ENV, '')
+        backend = str(backend).strip().lower() or 'json'
+        if backend not in USAGE_BACKENDS:
+            print(f"⚠️  未知的使用统计存储方式 {backend}，使用 json")
+            return 'json'
+        return backend
+    
+    def _resolve_segment_period(self, period: Optional[str]) -> str:
+        """确定事件日志分段周期：参数 > 环境变量，默认按月"""
+        if period is None:
+            period = os.environ.get(USAGE_SEGMENT_ENV, '')
+        period = str(period).strip().lower() or DEFAULT_SEGMENT_PERIOD
+        if period not in SEGMENT_PERIODS:
+            print(f"⚠️  未知的事件日志分段周期 {period}，使用 {DEFAULT_SEGMENT_PERIOD}")
+            return DEFAULT_SEGMENT_PERIOD
+        return period
+    
+    def _resolve_retention_days(self, days: Optional[int]) -> int:
+        """确定原始记录保留天数：参数 > 环境变量 > 默认值（0 表示永久保留）"""
+        if days is None:
+            env_value = os.environ.get(USAGE_RETENTION_ENV, '').strip()
+            if not env_value:
+                return DEFAULT_RETENTION_DAYS
+            try:
+                days = int(env_value)
+            except ValueError:
+                print(f"⚠️  {USAGE_RETENTION_ENV}={env_value} 不是有效的天数，使用默认值")
+                return DEFAULT_RETENTION_DAYS
+        return max(int(days), 0)
+    
+    def _migrate_to_sqlite(self) -> None:
+        """一次性把 JSON 文件中的使用数据导入 SQLite（JSON 文件保留，之后不再更新）"""
+        if self.store.get_metadata(SQLITE_MIGRATION_KEY) is not None:
+            return
+        try:
+            data = self._load_json_data()
+            if not data:
+                # 统计文件读取失败，下次启动再迁移
+                return
+            legacy_logs = self._legacy_call_logs()
+            if legacy_logs:
+                self._add_legacy_logs(data, legacy_logs)
+            count = self.store.import_data(data, SQLITE_MIGRATION_KEY)
+            if count:
+                print(f"已将 {count} 条调用记录迁移到 {self.store.db_path.name}")
+        except Exception as e:
+            print(f"迁移使用数据到 SQLite 失败: {e}")
+    
+    def _legacy_call_logs(self) -> List[Dict[str, Any]]:
+        """旧版统计文件中的 usage_logs 和单文件事件日志 usage_events.jsonl 中的调用记录"""
+        logs = list(self._read_stats_file().get("usage_logs", []))
+        logs.extend(UsageEventLog(self.legacy_events_file).iter_events())
+        return logs
+    
+    def _add_legacy_logs(self, data: Dict[str, Any], legacy_logs: List[Dict[str, Any]]) -> None:
+        """把旧版格式的调用记录和事件日志分段中的记录一起计入要导入 SQLite 的数据（重新计算每日统计和工具使用次数）"""
+        data["usage_logs"] = legacy_logs + data.get("usage_logs", [])
+        aggregates = self._empty_aggregates()
+        for event in data["usage_logs"]:
+            self._apply_call_event(aggregates, event)
+        data["daily_stats"] = self._daily_stats(aggregates["counters"])
+        for tool_name, usage in aggregates["tool_usage"].items():
+            data["tool_usage"].setdefault(tool_name, {"feedback_scores": [], "contexts": []}).update(usage)
+    
+    def _schedule_commit(self) -> None:
+        """SQLite 中未提交的写入在提交间隔之后提交，服务空闲时也不会一直留在事务中"""
+        if not self.store.pending or self._commit_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.store.commit()
+            return
+        self._commit_handle = loop.call_later(COMMIT_INTERVAL, self._commit_pending)
+    
+    def _commit_pending(self) -> None:
+        """定时提交"""
+        self._commit_handle = None
+        try:
+            self.store.commit()
+        except Exception as e:
+            print(f"提交使用数据失败: {e}")
+    
+    def _write_calls(self, entries: List[Dict[str, Any]]) -> None:
+        """写入一批调用记录（在写入线程中调用）"""
+        if self.store is not None:
+            self.store.log_calls(entries)
+            self.store.commit()
+        else:
+            self.event_log.append_many(entries)
+            # 写入时计入汇总（只读取刚追加的内容），查看统计时不再汇总
+            self._refresh_aggregates()
+    
+    def close(self) -> None:
+        """写完队列中的调用记录、提交尚未写入的数据并关闭存储（服务退出时调用）"""
+        self._writer.close()
+        if self._commit_handle is not None:
+            self._commit_handle.cancel()
+            self._commit_handle = None
+        if self.store is not None:
+            self.store.close()
+        else:
+            self._refresh_aggregates(force_save=True)
+    
+    def _maybe_compact(self) -> None:
+        """每天最多一次：把超过保留天数的原始记录压缩归档，并汇总为每日汇总"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        if not self.retention_days or self._compacted_on == today:
+            return
+        self._compacted_on = today
+        
+        # 多个服务进程共用数据目录时只有一个进程归档
+        lock_path = self.data_dir / "usage_compact.lock"
+        if not self._acquire_compact_lock(lock_path):
+            return
+        try:
+            cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+            if self.store is not None:
+                calls, sessions = self.store.compact(cutoff, self.archive_dir)
+            else:
+                calls, sessions = self._compact_json(cutoff)
+            if calls or sessions:
+                print(f"已归档 {cutoff} 之前的 {calls} 条调用记录和 {sessions} 条AI编程效果记录到 {self.archive_dir.name}")
+        except Exception as e:
+            print(f"归档使用数据失败: {e}")
+        finally:
+            try:
+                lock_path.unlink()
+            except OSError:
+                pass
+    
+    def _acquire_compact_lock(self, lock_path: Path) -> bool:
+        """创建归档锁文件（已存在且未过期时返回 False）"""
+        for _ in range(2):
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime < COMPACT_LOCK_TIMEOUT:
+                        return False
+                    lock_path.unlink()
+                except FileNotFoundError:
+                    pass
+        return False
+    
+    def _compact_json(self, cutoff: str) -> tuple:
+        """
+        JSON 存储的归档：最后一天早于 cutoff 的事件日志分段、统计文件中早于 cutoff 的AI编程效果记录
+        先计入每日汇总并保存，再追加到归档目录下的 gzip 文件并删除原始记录。
+        每日汇总是已归档日期唯一的统计来源：中途退出时原始记录仍在，重新归档时
+        已计入的日期不再重复计数（统计报告使用的计数不受影响）
+        
+        Returns:
+            (归档的调用记录条数, 归档的AI编程效果记录条数)
+        """
+        expired_keys = [key for key in self.event_log.keys() if self.event_log.segment_end(key) < cutoff]
+        call_rollups: Dict[str, Dict[str, Any]] = {}
+        calls = 0
+        for key in expired_keys:
+            events = list(self.event_log.segment(key).iter_events())
+            merge_rollups(call_rollups, rollup_calls(events))
+            calls += len(events)
+        
+        expired_logs = [
+            log for log in self._read_stats_file().get("enhanced_usage_logs", []) if self._log_date(log) < cutoff
+        ]
+        if not expired_keys and not expired_logs:
+            return 0, 0
+        
+        rollups = self._load_rollups()
+        merge_compacted(rollups, call_rollups, "calls")
+        merge_compacted(rollups, rollup_ai_logs(expired_logs), "ai")
+        self._save_rollups(rollups)
+        
+        if expired_keys:
+            # 先把分段中尚未汇总的记录计入汇总（汇总中的计数在归档后保留）
+            self._refresh_aggregates()
+            for key in expired_keys:
+                with self._aggregates_lock:
+                    self.event_log.archive_segment(key, self.archive_dir / f"usage_events-{key}.jsonl.gz")
+                    self._aggregates["offsets"].pop(key, None)
+            self._refresh_aggregates(force_save=True)
+        
+        if expired_logs:
+            archive_by_month(self.archive_dir, "enhanced_usage_logs", expired_logs)
+            with self._stats_lock:
+                data = self._read_stats_file()
+                data["enhanced_usage_logs"] = [
+                    log for log in data.get("enhanced_usage_logs", []) if self._log_date(log) >= cutoff
+                ]
+                self._save_usage_data(data)
+        
+        return calls, len(expired_logs)
+    
+    @staticmethod
+    def _log_date(log: Dict[str, Any]) -> str:
+        """记录的日期（YYYY-MM-DD）"""
+        return log.get("date") or log.get("timestamp", "")[:10]
+    
     def _init_cloud_tracker(self):
         """初始化云端追踪器"""
         try:
@@ -90,20 +388,69 @@ class UsageTracker:
                     "created_at": datetime.now().isoformat(),
                     "version": "1.0.0"
                 },
-                "daily_stats": {},
                 "tool_usage": {},
-                "user_feedback": [],
-                "usage_logs": []
+                "user_feedback": []
             }
             
             with open(self.usage_file, 'w', encoding='utf-8') as f:
                 json.dump(initial_data, f, ensure_ascii=False, indent=2)
     
+    def _migrate_legacy_logs(self) -> None:
+        """
+        一次性迁移旧版统计文件：usage_logs 移到事件日志的各分段（汇总由事件日志重新计算），
+        统计文件中只保留反馈等其余数据
+        """
+        data = self._read_stats_file()
+        if "usage_logs" not in data and "daily_stats" not in data:
+            return
+        
+        try:
+            legacy_logs = data.pop("usage_logs", [])
+            data.pop("daily_stats", None)
+            self.event_log.append_many(legacy_logs)
+            self._save_usage_data(data)
+            print(f"已将 {len(legacy_logs)} 条调用记录迁移到 {self.events_dir.name}")
+        except Exception as e:
+            print(f"迁移使用数据失败: {e}")
+    
+    def _split_event_log(self) -> None:
+        """一次性把单文件事件日志 usage_events.jsonl 按日期拆分到各分段（汇总由各分段重新计算）"""
+        if not self.legacy_events_file.exists():
+            return
+        
+        try:
+            legacy_log = UsageEventLog(self.legacy_events_file)
+            self.event_log.append_many(legacy_log.iter_events())
+            legacy_log.path.unlink()
+            print(f"已将 {self.legacy_events_file.name} 按日期拆分到 {self.events_dir.name}")
+        except Exception as e:
+            print(f"拆分事件日志失败: {e}")
+    
+    def _migrate_counters(self) -> None:
+        """一次性由统计文件中的反馈记录、AI编程效果记录和每日汇总计算反馈和AI编程效果计数"""
+        data = self._read_stats_file()
+        if not data or "counters" in data:
+            return
+        
+        counters = new_counters()
+        for date, bucket in sorted(self._settled_rollups(data).items()):
+            if "ai" in bucket:
+                record(counters, date, merge_bucket, {"ai": bucket["ai"]})
+        for log in data.get("enhanced_usage_logs", []):
+            record(counters, self._log_date(log), add_ai, log)
+        for feedback in data.get("user_feedback", []):
+            record(counters, self._log_date(feedback), add_feedback,
+                   feedback.get("tool_name", "unknown"), feedback.get("feedback", ""))
+        data["counters"] = counters
+        self._save_usage_data(data)
+    
+    def _segment_sizes(self) -> Dict[str, int]:
+        """各分段当前的字节数"""
+        return {key: self.event_log.segment(key).size() for key in self.event_log.keys()}
+    
     async def log_tool_call(self, tool_name: str, arguments: Optional[Dict] = None) -> None:
-        """记录工具调用"""
+        """记录工具调用（放入写入队列，由后台线程批量写入事件日志或数据库）"""
         try:
-            data = self._load_usage_data()
-            
             # 生成唯一日志ID
             log_id = str(uuid.uuid4())
             timestamp = datetime.now().isoformat()
@@ -119,37 +466,7 @@ class UsageTracker:
                 "user_id": self._get_user_id()  # 简单的用户标识
             }
             
-            data["usage_logs"].append(log_entry)
-            
-            # 更新每日统计
-            if today not in data["daily_stats"]:
-                data["daily_stats"][today] = {
-                    "total_calls": 0,
-                    "tool_breakdown": {}
-                }
-            
-            data["daily_stats"][today]["total_calls"] += 1
-            
-            if tool_name not in data["daily_stats"][today]["tool_breakdown"]:
-                data["daily_stats"][today]["tool_breakdown"][tool_name] = 0
-            
-            data["daily_stats"][today]["tool_breakdown"][tool_name] += 1
-            
-            # 更新工具总使用统计
-            if tool_name not in data["tool_usage"]:
-                data["tool_usage"][tool_name] = {
-                    "total_uses": 0,
-                    "first_used": timestamp,
-                    "last_used": timestamp,
-                    "feedback_scores": [],
-                    "contexts": []
-                }
-            
-            data["tool_usage"][tool_name]["total_uses"] += 1
-            data["tool_usage"][tool_name]["last_used"] = timestamp
-            
-            # 保存数据
-            self._save_usage_data(data)
+            await self._writer.put_async(log_entry)
             
             # 异步上报到云端
             if self.cloud_tracker:
@@ -179,7 +496,6 @@ class UsageTracker:
     ) -> str:
         """记录AI编程使用情况和效果数据"""
         try:
-            data = self._load_usage_data()
             timestamp = datetime.now().isoformat()
             today = datetime.now().strftime('%Y-%m-%d')
             
@@ -218,56 +534,7 @@ class UsageTracker:
                 }
             }
             
-            # 添加到增强使用日志
-            if "enhanced_usage_logs" not in data:
-                data["enhanced_usage_logs"] = []
-            data["enhanced_usage_logs"].append(enhanced_usage_entry)
-            
-            # 更新每日AI编程统计
-            if "daily_ai_stats" not in data:
-                data["daily_ai_stats"] = {}
-            
-            if today not in data["daily_ai_stats"]:
-                data["daily_ai_stats"][today] = {
-                    "total_sessions": 0,
-                    "total_lines_generated": 0,
-                    "total_files_modified": 0,
-                    "avg_ai_probability": 0,
-                    "avg_quality_score": 0,
-                    "avg_productivity": 0,
-                    "tool_breakdown": {}
-                }
-            
-            # 更新当日统计
-            daily_stats = data["daily_ai_stats"][today]
-            daily_stats["total_sessions"] += 1
-            daily_stats["total_lines_generated"] += enhanced_usage_entry["ai_metrics"]["lines_generated"]
-            daily_stats["total_files_modified"] += enhanced_usage_entry["ai_metrics"]["files_modified"]
-            
-            # 计算平均值
-            current_sessions = daily_stats["total_sessions"]
-            daily_stats["avg_ai_probability"] = self._update_average(
-                daily_stats["avg_ai_probability"], 
-                enhanced_usage_entry["ai_metrics"]["ai_probability"], 
-                current_sessions
-            )
-            daily_stats["avg_quality_score"] = self._update_average(
-                daily_stats["avg_quality_score"], 
-                enhanced_usage_entry["ai_metrics"]["quality_score"], 
-                current_sessions
-            )
-            daily_stats["avg_productivity"] = self._update_average(
-                daily_stats["avg_productivity"], 
-                enhanced_usage_entry["ai_metrics"]["productivity_score"], 
-                current_sessions
-            )
-            
-            # 工具分解统计
-            if tool_name not in daily_stats["tool_breakdown"]:
-                daily_stats["tool_breakdown"][tool_name] = 0
-            daily_stats["tool_breakdown"][tool_name] += 1
-            
-            # 添加传统反馈记录（保持兼容性）
+            feedback_entry = None
             if user_feedback:
                 feedback_entry = {
                     "id": str(uuid.uuid4()),
@@ -278,27 +545,20 @@ class UsageTracker:
                     "user_id": self._get_user_id(),
                     "enhanced_usage_id": usage_id  # 关联到增强记录
                 }
-                
-                data["user_feedback"].append(feedback_entry)
-                
-                # 更新工具的反馈分数
-                if tool_name in data["tool_usage"]:
-                    score_map = {
-                        "excellent": 5,
-                        "good": 4,
-                        "average": 3,
-                        "poor": 2
-                    }
-                    
-                    score = score_map.get(user_feedback, 3)
-                    data["tool_usage"][tool_name]["feedback_scores"].append(score)
-                    
-                    # 添加使用上下文
-                    if usage_context and usage_context not in data["tool_usage"][tool_name]["contexts"]:
-                        data["tool_usage"][tool_name]["contexts"].append(usage_context)
-                
-                self._save_usage_data(data)
-                
+            
+            if self.store is not None:
+                # 每日AI编程统计在查询时由记录聚合，不单独保存
+                self.store.record_usage(
+                    enhanced_usage_entry, feedback_entry, FEEDBACK_SCORES.get(user_feedback, 3)
+                )
+                self._schedule_commit()
+            else:
+                # 反馈要关联到工具的使用统计，先等待队列中的调用记录写入（不阻塞事件循环）
+                await self._writer.wait_idle_async()
+                with self._stats_lock:
+                    self._record_usage_json(enhanced_usage_entry, feedback_entry)
+            
+            if user_feedback:
                 return f"✅ 已记录对工具 '{tool_name}' 的反馈：{user_feedback}"
             else:
                 return f"✅ 已记录工具 '{tool_name}' 的使用"
@@ -306,29 +566,106 @@ class UsageTracker:
         except Exception as e:
             return f"记录使用反馈时出错：{str(e)}"
     
+    def _record_usage_json(self, enhanced_usage_entry: Dict[str, Any], feedback_entry: Optional[Dict[str, Any]]) -> None:
+        """把AI编程效果数据和反馈写入统计文件"""
+        data = self._read_usage_data(include_logs=False)
+        tool_name = enhanced_usage_entry["tool_name"]
+        today = enhanced_usage_entry["date"]
+        
+        # 添加到增强使用日志
+        if "enhanced_usage_logs" not in data:
+            data["enhanced_usage_logs"] = []
+        data["enhanced_usage_logs"].append(enhanced_usage_entry)
+        
+        # 更新每日AI编程统计
+        if "daily_ai_stats" not in data:
+            data["daily_ai_stats"] = {}
+        
+        if today not in data["daily_ai_stats"]:
+            data["daily_ai_stats"][today] = {
+                "total_sessions": 0,
+                "total_lines_generated": 0,
+                "total_files_modified": 0,
+                "avg_ai_probability": 0,
+                "avg_quality_score": 0,
+                "avg_productivity": 0,
+                "tool_breakdown": {}
+            }
+        
+        # 更新当日统计
+        daily_stats = data["daily_ai_stats"][today]
+        daily_stats["total_sessions"] += 1
+        daily_stats["total_lines_generated"] += enhanced_usage_entry["ai_metrics"]["lines_generated"]
+        daily_stats["total_files_modified"] += enhanced_usage_entry["ai_metrics"]["files_modified"]
+        
+        # 计算平均值
+        current_sessions = daily_stats["total_sessions"]
+        daily_stats["avg_ai_probability"] = self._update_average(
+            daily_stats["avg_ai_probability"], 
+            enhanced_usage_entry["ai_metrics"]["ai_probability"], 
+            current_sessions
+        )
+        daily_stats["avg_quality_score"] = self._update_average(
+            daily_stats["avg_quality_score"], 
+            enhanced_usage_entry["ai_metrics"]["quality_score"], 
+            current_sessions
+        )
+        daily_stats["avg_productivity"] = self._update_average(
+            daily_stats["avg_productivity"], 
+            enhanced_usage_entry["ai_metrics"]["productivity_score"], 
+            current_sessions
+        )
+        
+        # 工具分解统计
+        if tool_name not in daily_stats["tool_breakdown"]:
+            daily_stats["tool_breakdown"][tool_name] = 0
+        daily_stats["tool_breakdown"][tool_name] += 1
+        
+        # 当天和全部时间的计数（统计报告直接读取）
+        counters = data.setdefault("counters", new_counters())
+        record(counters, today, add_ai, enhanced_usage_entry)
+        
+        # 添加传统反馈记录（保持兼容性）
+        if feedback_entry is not None:
+            data["user_feedback"].append(feedback_entry)
+            record(counters, today, add_feedback, tool_name, feedback_entry["feedback"])
+            
+            # 更新工具的反馈分数
+            usage = data["tool_usage"].get(tool_name)
+            if usage is not None:
+                usage["feedback_scores"].append(FEEDBACK_SCORES.get(feedback_entry["feedback"], 3))
+                
+                # 添加使用上下文
+                usage_context = feedback_entry["context"]
+                if usage_context and usage_context not in usage["contexts"]:
+                    usage["contexts"].append(usage_context)
+        
+        self._save_usage_data(data)
+    
     async def get_stats(self, date_range: str = "all") -> str:
         """获取AI编程效果统计数据"""
         try:
-            data = self._load_usage_data()
-            
-            # 获取增强的AI编程数据
-            enhanced_logs = data.get("enhanced_usage_logs", [])
-            ai_daily_stats = data.get("daily_ai_stats", {})
-            
-            # 过滤AI编程数据
-            filtered_enhanced_logs = self._filter_logs_by_date(enhanced_logs, date_range)
-            filtered_ai_stats = self._filter_daily_stats_by_date(ai_daily_stats, date_range)
+            await self._writer.wait_idle_async()
+            # 归档会读取、压缩和重写文件，在线程池中进行，不阻塞其他工具调用
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._maybe_compact)
+            # 由写入时累加的每日计数合并：今日、近7天、近30天最多合并30天的计数，全部时间直接读取总计
+            since_date = self._range_start_date(date_range)
+            if self.store is not None:
+                summary = self._summarize_sqlite(since_date, date_range)
+            else:
+                summary = self._summarize_counters(since_date, date_range)
+            ai_summary = summary["ai"]
+            has_enhanced_logs = summary["has_ai"]
             
             # 生成AI编程效果报告
-            ai_report = self._generate_ai_programming_report(filtered_enhanced_logs, filtered_ai_stats, date_range)
+            ai_report = self._generate_ai_programming_report(ai_summary, date_range)
             
             # 生成传统统计报告（保持兼容性）
-            filtered_logs = self._filter_logs_by_date(data.get("usage_logs", []), date_range)
-            filtered_daily_stats = self._filter_daily_stats_by_date(data.get("daily_stats", {}), date_range)
-            traditional_report = self._generate_stats_report(data, filtered_logs, filtered_daily_stats, date_range)
+            traditional_report = self._generate_stats_report(summary, date_range)
             
             # 合并报告
-            if enhanced_logs:  # 如果有AI编程数据，优先显示
+            if has_enhanced_logs:  # 如果有AI编程数据，优先显示
                 combined_report = f"""
 🤖 AI编程效果分析报告 ({date_range})
 {'='*60}
@@ -347,8 +684,107 @@ class UsageTracker:
         except Exception as e:
             return f"获取统计数据时出错：{str(e)}"
     
-    def _load_usage_data(self) -> Dict[str, Any]:
-        """加载使用数据"""
+    def _summarize_counters(self, since_date: Optional[str], date_range: str) -> Dict[str, Any]:
+        """
+        由 JSON 存储的计数统计日期范围内的调用、反馈和AI编程效果
+        （调用次数在汇总中，反馈和AI编程效果在统计文件中；since_date 为 None 表示全部时间）
+        """
+        with self._aggregates_lock:
+            aggregates = self._refresh_aggregates()
+            calls = range_bucket(aggregates["counters"], since_date)
+            daily_stats = self._daily_stats(aggregates["counters"], since_date)
+        
+        counters = self._read_stats_file().get("counters") or new_counters()
+        usage = range_bucket(counters, since_date)
+        return {
+            "tool_counts": calls.get("tools", {}),
+            "user_activity": calls.get("users", {}),
+            "daily_stats": self._filter_daily_stats_by_date(daily_stats, date_range),
+            "feedback": usage.get("feedback", {}),
+            "all_feedback": counters["total"].get("feedback", {}),
+            "ai": usage.get("ai") or new_ai_summary(),
+            "has_ai": bool(counters["total"].get("ai", {}).get("sessions"))
+        }
+    
+    def _summarize_sqlite(self, since_date: Optional[str], date_range: str) -> Dict[str, Any]:
+        """由 SQLite 中的每日计数统计日期范围内的调用、反馈和AI编程效果（since_date 为 None 表示全部时间）"""
+        tool_counts, user_activity = self.store.call_counts(since_date or "")
+        feedback = self.store.feedback_counts(since_date or "")
+        total_ai = self.store.ai_summary()
+        return {
+            "tool_counts": tool_counts,
+            "user_activity": user_activity,
+            "daily_stats": self._filter_daily_stats_by_date(self.store.daily_stats(since_date or ""), date_range),
+            "feedback": feedback,
+            "all_feedback": feedback if since_date is None else self.store.feedback_counts(),
+            "ai": total_ai if since_date is None else self.store.ai_summary(since_date),
+            "has_ai": bool(total_ai["sessions"])
+        }
+    
+    @staticmethod
+    def _daily_stats(counters: Dict[str, Any], since_date: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """由每日计数得到 since_date 及之后的每日统计（格式与旧版统计文件中的 daily_stats 相同）"""
+        return {
+            date: {"total_calls": sum(bucket.get("tools", {}).values()), "tool_breakdown": dict(bucket.get("tools", {}))}
+            for date, bucket in sorted(counters["days"].items())
+            if since_date is None or date >= since_date
+        }
+    
+    def _load_usage_data(self, include_logs: bool = True) -> Dict[str, Any]:
+        """加载使用数据（与旧版统计文件格式相同，导出脚本也使用；先等待队列中的记录写入）"""
+        self._writer.wait_idle()
+        return self._read_usage_data(include_logs)
+    
+    def _read_usage_data(self, include_logs: bool = True) -> Dict[str, Any]:
+        """读取使用数据（不等待写入队列，事件循环中由调用方先 await wait_idle_async）"""
+        if self.store is not None:
+            return self.store.export_data()
+        return self._load_json_data(include_logs)
+    
+    def _load_json_data(self, include_logs: bool = True) -> Dict[str, Any]:
+        """
+        加载 JSON 存储的使用数据：统计文件中的数据，
+        加上由事件日志汇总出的 daily_stats、工具使用次数，
+        以及 include_logs 时尚未归档的全部调用记录 usage_logs 和已归档日期的每日汇总 daily_rollups
+        """
+        data = self._read_stats_file()
+        if not data:
+            return {}
+        
+        with self._aggregates_lock:
+            aggregates = self._refresh_aggregates()
+            tool_usage = {
+                tool_name: {**counts, "feedback_scores": [], "contexts": []}
+                for tool_name, counts in aggregates["tool_usage"].items()
+            }
+            daily_stats = self._daily_stats(aggregates["counters"])
+        for tool_name, usage in data.get("tool_usage", {}).items():
+            tool_usage.setdefault(tool_name, {"feedback_scores": [], "contexts": []}).update(usage)
+        
+        data["tool_usage"] = tool_usage
+        data["daily_stats"] = daily_stats
+        if include_logs:
+            data["usage_logs"] = list(self.event_log.iter_events())
+            data["daily_rollups"] = self._settled_rollups(data)
+        return data
+    
+    def _save_usage_data(self, data: Dict[str, Any]) -> None:
+        """保存使用数据（调用记录和由它汇总出的字段不写入统计文件）"""
+        stored = {
+            key: value for key, value in data.items() if key not in ("usage_logs", "daily_stats", "daily_rollups")
+        }
+        stored["tool_usage"] = {
+            tool_name: {key: value for key, value in usage.items() if key not in CALL_USAGE_FIELDS}
+            for tool_name, usage in data.get("tool_usage", {}).items()
+            if usage.get("feedback_scores") or usage.get("contexts")
+        }
+        try:
+            self._write_json(self.usage_file, stored, indent=2)
+        except Exception as e:
+            print(f"保存使用数据失败: {e}")
+    
+    def _read_stats_file(self) -> Dict[str, Any]:
+        """读取统计文件"""
         try:
             with open(self.usage_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
@@ -356,42 +792,163 @@ class UsageTracker:
             print(f"加载使用数据失败: {e}")
             return {}
     
-    def _save_usage_data(self, data: Dict[str, Any]) -> None:
-        """保存使用数据"""
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any], indent: Optional[int] = None) -> None:
+        """先写临时文件再替换，写入中断时不会留下半个文件"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        os.replace(tmp_path, path)
+    
+    def _load_aggregates(self) -> Dict[str, Any]:
+        """读取汇总文件（不存在、损坏或为旧版格式时从每日汇总和事件日志重新汇总）"""
         try:
-            with open(self.usage_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(self.aggregates_file, 'r', encoding='utf-8') as f:
+                aggregates = json.load(f)
+        except FileNotFoundError:
+            return self._empty_aggregates()
         except Exception as e:
-            print(f"保存使用数据失败: {e}")
+            print(f"加载汇总数据失败，将重新汇总: {e}")
+            return self._empty_aggregates()
+        
+        if isinstance(aggregates.get("offsets"), dict) and isinstance(aggregates.get("counters"), dict):
+            aggregates.setdefault("tool_usage", {})
+            return aggregates
+        
+        # 旧版汇总没有每日用户计数：重新汇总，保留已记录的首次、最近使用时间
+        rebuilt = self._empty_aggregates()
+        for tool_name, usage in aggregates.get("tool_usage", {}).items():
+            if tool_name in rebuilt["tool_usage"]:
+                for field in ("first_used", "last_used"):
+                    if usage.get(field):
+                        rebuilt["tool_usage"][tool_name][field] = usage[field]
+        return rebuilt
+    
+    def _empty_aggregates(self) -> Dict[str, Any]:
+        """尚未计入任何分段的汇总：已归档日期的调用次数和工具使用次数由每日汇总得到"""
+        aggregates = {"offsets": {}, "tool_usage": {}, "counters": new_counters()}
+        for date, bucket in sorted(self._settled_rollups().items()):
+            tools = bucket.get("tools", {})
+            if not tools:
+                continue
+            record(aggregates["counters"], date, merge_bucket, {"tools": tools, "users": bucket.get("users", {})})
+            for tool_name, count in tools.items():
+                usage = aggregates["tool_usage"].setdefault(
+                    tool_name, {"total_uses": 0, "first_used": date, "last_used": date}
+                )
+                usage["total_uses"] += count
+                usage["last_used"] = date
+        return aggregates
+    
+    def _save_aggregates(self, aggregates: Dict[str, Any]) -> None:
+        """保存汇总数据"""
+        try:
+            self._write_json(self.aggregates_file, aggregates)
+        except Exception as e:
+            print(f"保存汇总数据失败: {e}")
+    
+    def _refresh_aggregates(self, force_save: bool = False) -> Dict[str, Any]:
+        """
+        把各分段中尚未计入的调用记录计入内存中的汇总：每个分段只读取已计入的偏移量之后的内容，
+        其他服务进程写入的记录同样会被计入；分段被截断或替换时从头汇总。
+        汇总距上次保存超过保存间隔（或 force_save）时保存到汇总文件；
+        返回的汇总会被写入线程继续修改，读取其中的数据需持有 _aggregates_lock
+        """
+        with self._aggregates_lock:
+            aggregates = self._aggregates if self._aggregates is not None else self._load_aggregates()
+            sizes = self._segment_sizes()
+            if any(sizes.get(key, 0) < offset for key, offset in aggregates["offsets"].items() if key in sizes):
+                aggregates = self._empty_aggregates()
+                self._aggregates_dirty = True
+            
+            offsets = aggregates["offsets"]
+            for key, size in sizes.items():
+                offset = offsets.get(key, 0)
+                if size == offset:
+                    continue
+                events, offsets[key] = self.event_log.segment(key).read_from(offset)
+                for event in events:
+                    self._apply_call_event(aggregates, event)
+                self._aggregates_dirty = True
+            self._aggregates = aggregates
+            
+            now = time.monotonic()
+            if self._aggregates_dirty and (force_save or now - self._aggregates_saved_at >= AGGREGATES_SAVE_INTERVAL):
+                self._save_aggregates(aggregates)
+                self._aggregates_dirty = False
+                self._aggregates_saved_at = now
+            return aggregates
+    
+    def _load_rollups(self) -> Dict[str, Dict[str, Any]]:
+        """读取每日汇总（已归档日期的调用次数和AI编程效果合计）"""
+        try:
+            with open(self.rollups_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"加载每日汇总失败: {e}")
+            return {}
+    
+    def _settled_rollups(self, data: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        原始记录已经删除的每日汇总：归档中途退出时已计入每日汇总、但分段或AI编程效果记录还没有删除的日期，
+        去掉对应的计数（由原始记录计数，避免重复）
+        
+        Args:
+            data: 已读取的统计文件内容（不传时读取统计文件）
+        """
+        rollups = self._load_rollups()
+        segments = set(self.event_log.keys())
+        if data is None:
+            data = self._read_stats_file()
+        log_dates = {self._log_date(log) for log in data.get("enhanced_usage_logs", [])}
+        
+        settled = {}
+        for date, bucket in rollups.items():
+            bucket = dict(bucket)
+            if date[:10] in segments or date[:7] in segments:
+                bucket.pop("tools", None)
+                bucket.pop("users", None)
+            if date in log_dates:
+                bucket.pop("ai", None)
+            settled[date] = bucket
+        return settled
+    
+    def _save_rollups(self, rollups: Dict[str, Dict[str, Any]]) -> None:
+        """保存每日汇总"""
+        self._write_json(self.rollups_file, dict(sorted(rollups.items())))
+    
+    @staticmethod
+    def _apply_call_event(aggregates: Dict[str, Any], event: Dict[str, Any]) -> None:
+        """把一条调用记录计入当天和全部时间的调用次数，以及工具使用次数"""
+        tool_name = event.get("tool_name", "unknown")
+        timestamp = event.get("timestamp", "")
+        date = event.get("date") or timestamp[:10]
+        
+        record(aggregates["counters"], date, add_call, event)
+        
+        usage = aggregates["tool_usage"].setdefault(
+            tool_name, {"total_uses": 0, "first_used": timestamp, "last_used": timestamp}
+        )
+        usage["total_uses"] += 1
+        usage["first_used"] = min(usage["first_used"], timestamp) if usage["first_used"] else timestamp
+        usage["last_used"] = max(usage["last_used"], timestamp)
     
     def _get_user_id(self) -> str:
         """获取用户标识（简单实现）"""
         # 这里可以后续扩展为更复杂的用户识别机制
         return os.environ.get('USER', 'unknown_user')
     
-    def _filter_logs_by_date(self, logs: List[Dict], date_range: str) -> List[Dict]:
-        """根据日期范围过滤日志"""
-        if date_range == "all":
-            return logs
-        
-        end_date = datetime.now()
-        
-        if date_range == "today":
-            start_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif date_range == "week":
-            start_date = end_date - timedelta(days=7)
-        elif date_range == "month":
-            start_date = end_date - timedelta(days=30)
-        else:
-            return logs
-        
-        filtered_logs = []
-        for log in logs:
-            log_date = datetime.fromisoformat(log["timestamp"])
-            if log_date >= start_date:
-                filtered_logs.append(log)
-        
-        return filtered_logs
+    def _range_start_date(self, date_range: str) -> Optional[str]:
+        """
+        日期范围的起始日期（YYYY-MM-DD）：今日为今天，近7天、近30天包含今天，
+        与每日使用趋势中列出的日期相同；all 或无法识别的范围为 None
+        """
+        days = RANGE_DAYS.get(date_range)
+        if days is None:
+            return None
+        return (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
     
     def _filter_daily_stats_by_date(self, daily_stats: Dict, date_range: str) -> Dict:
         """根据日期范围过滤每日统计"""
@@ -421,39 +978,30 @@ class UsageTracker:
         
         return filtered_stats
     
-    def _generate_stats_report(
-        self, 
-        full_data: Dict, 
-        filtered_logs: List[Dict], 
-        filtered_daily_stats: Dict, 
-        date_range: str
-    ) -> str:
-        """生成统计报告"""
+    def _generate_stats_report(self, summary: Dict[str, Any], date_range: str) -> str:
+        """
+        生成统计报告
+        
+        Args:
+            summary: 日期范围内的统计（_summarize_counters / _summarize_sqlite 的结果）
+            date_range: 日期范围
+        """
         
         # 计算基础统计
-        total_calls = len(filtered_logs)
-        unique_tools = len(set(log["tool_name"] for log in filtered_logs))
-        unique_users = len(set(log.get("user_id", "unknown") for log in filtered_logs))
+        tool_counts = summary["tool_counts"]
+        user_activity = summary["user_activity"]
+        total_calls = sum(tool_counts.values())
+        unique_tools = len(tool_counts)
+        unique_users = len(user_activity)
         
         # 工具使用排行
-        tool_counts = {}
-        for log in filtered_logs:
-            tool_name = log["tool_name"]
-            tool_counts[tool_name] = tool_counts.get(tool_name, 0) + 1
-        
         sorted_tools = sorted(tool_counts.items(), key=lambda x: x[1], reverse=True)
         
-        # 用户活跃度
-        user_activity = {}
-        for log in filtered_logs:
-            user_id = log.get("user_id", "unknown")
-            user_activity[user_id] = user_activity.get(user_id, 0) + 1
-        
         # 每日使用趋势
-        daily_trends = self._calculate_daily_trends(filtered_daily_stats)
+        daily_trends = self._calculate_daily_trends(summary["daily_stats"])
         
         # 反馈分析
-        feedback_analysis = self._analyze_feedback(full_data["user_feedback"], date_range)
+        feedback_analysis = self._analyze_feedback(summary["feedback"])
         
         # 生成报告文本
         date_range_text = {
@@ -497,7 +1045,7 @@ class UsageTracker:
         report += f"\n{feedback_analysis}"
         
         # 效率提升建议
-        report += self._generate_efficiency_suggestions(full_data, sorted_tools)
+        report += self._generate_efficiency_suggestions(summary["all_feedback"], sorted_tools)
         
         return report
     
@@ -513,31 +1061,17 @@ class UsageTracker:
         
         return dict(sorted(trends.items()))
     
-    def _analyze_feedback(self, feedback_data: List[Dict], date_range: str) -> str:
-        """分析用户反馈"""
+    def _analyze_feedback(self, tool_feedback: Dict[str, Dict[str, int]]) -> str:
+        """分析用户反馈（tool_feedback 为日期范围内各工具的反馈分布）"""
         
-        # 根据日期范围过滤反馈
-        filtered_feedback = self._filter_logs_by_date(feedback_data, date_range)
-        
-        if not filtered_feedback:
+        if not tool_feedback:
             return "\n## 📝 用户反馈\n\n暂无反馈数据\n"
         
         # 统计反馈分布
-        feedback_counts = {}
-        tool_feedback = {}
-        
-        for feedback in filtered_feedback:
-            score = feedback.get("feedback", "")
-            tool_name = feedback.get("tool_name", "unknown")
-            
-            feedback_counts[score] = feedback_counts.get(score, 0) + 1
-            
-            if tool_name not in tool_feedback:
-                tool_feedback[tool_name] = []
-            tool_feedback[tool_name].append(score)
+        feedback_counts = self._merge_feedback_counts(tool_feedback)
         
         # 计算满意度
-        total_feedback = len(filtered_feedback)
+        total_feedback = sum(feedback_counts.values())
         excellent_count = feedback_counts.get("excellent", 0)
         good_count = feedback_counts.get("good", 0)
         satisfaction_rate = ((excellent_count + good_count) / total_feedback * 100) if total_feedback > 0 else 0
@@ -555,25 +1089,27 @@ class UsageTracker:
         # 工具反馈分析
         if tool_feedback:
             report += "\n### 各工具反馈情况\n\n"
-            for tool_name, feedbacks in tool_feedback.items():
-                avg_score = self._calculate_average_feedback_score(feedbacks)
+            for tool_name, counts in tool_feedback.items():
+                avg_score = self._calculate_average_feedback_score(counts)
                 report += f"- **{tool_name}**: 平均分 {avg_score:.1f}/5.0\n"
         
         return report
     
-    def _calculate_average_feedback_score(self, feedbacks: List[str]) -> float:
-        """计算平均反馈分数"""
-        score_map = {
-            "excellent": 5,
-            "good": 4,
-            "average": 3,
-            "poor": 2
-        }
-        
-        scores = [score_map.get(feedback, 3) for feedback in feedbacks]
-        return sum(scores) / len(scores) if scores else 3.0
+    def _merge_feedback_counts(self, tool_feedback: Dict[str, Dict[str, int]]) -> Dict[str, int]:
+        """合并各工具的反馈分布"""
+        feedback_counts = {}
+        for counts in tool_feedback.values():
+            for feedback, count in counts.items():
+                feedback_counts[feedback] = feedback_counts.get(feedback, 0) + count
+        return feedback_counts
+    
+    def _calculate_average_feedback_score(self, counts: Dict[str, int]) -> float:
+        """由反馈分布计算平均反馈分数"""
+        total = sum(counts.values())
+        scores = sum(FEEDBACK_SCORES.get(feedback, 3) * count for feedback, count in counts.items())
+        return scores / total if total else 3.0
     
-    def _generate_efficiency_suggestions(self, data: Dict, tool_usage: List[tuple]) -> str:
+    def _generate_efficiency_suggestions(self, all_feedback: Dict[str, Dict[str, int]], tool_usage: List[tuple]) -> str:
         """生成效率提升建议"""
         suggestions = ["\n## 💡 效率提升建议\n"]
         
@@ -597,10 +1133,10 @@ class UsageTracker:
             suggestions.append("- 🏗️ **组件生成活跃**：团队在组件开发上效率提升明显")
         
         # 基于反馈的建议
-        feedback_data = data.get("user_feedback", [])
-        if feedback_data:
-            poor_feedback = [f for f in feedback_data if f.get("feedback") == "poor"]
-            if len(poor_feedback) > len(feedback_data) * 0.2:  # 超过20%差评
+        feedback_counts = self._merge_feedback_counts(all_feedback)
+        total_feedback = sum(feedback_counts.values())
+        if total_feedback:
+            if feedback_counts.get("poor", 0) > total_feedback * 0.2:  # 超过20%差评
                 suggestions.append("- ⚠️ **改进需求**：有较多差评反馈，需要分析和改进工具功能")
         
         # 使用模式建议
@@ -614,7 +1150,8 @@ class UsageTracker:
     async def export_usage_data(self, format_type: str = "json") -> str:
         """导出使用数据"""
         try:
-            data = self._load_usage_data()
+            await self._writer.wait_idle_async()
+            data = self._read_usage_data()
             
             if format_type == "json":
                 export_file = self.data_dir / f"usage_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -707,39 +1244,39 @@ class UsageTracker:
             return new_value
         return round((current_avg * (count - 1) + new_value) / count, 3)
     
-    def _generate_ai_programming_report(self, enhanced_logs: List[Dict], ai_stats: Dict, date_range: str) -> str:
-        """生成AI编程效果报告"""
-        if not enhanced_logs:
+    def _generate_ai_programming_report(self, ai_summary: Dict[str, Any], date_range: str) -> str:
+        """
+        生成AI编程效果报告
+        
+        Args:
+            ai_summary: 日期范围内AI编程效果记录的合计（由每日计数合并）
+            date_range: 日期范围
+        """
+        total_sessions = ai_summary["sessions"]
+        if not total_sessions:
             return "📭 暂无AI编程数据"
         
         # 基础统计
-        total_sessions = len(enhanced_logs)
-        total_lines = sum(log['ai_metrics']['lines_generated'] for log in enhanced_logs)
-        total_files = sum(log['ai_metrics']['files_modified'] for log in enhanced_logs)
+        total_lines = ai_summary["lines_generated"]
+        total_files = ai_summary["files_modified"]
         
         # 平均指标
-        avg_ai_probability = sum(log['ai_metrics']['ai_probability'] for log in enhanced_logs) / total_sessions
-        avg_quality_score = sum(log['ai_metrics']['quality_score'] for log in enhanced_logs) / total_sessions
-        avg_productivity = sum(log['ai_metrics']['productivity_score'] for log in enhanced_logs) / total_sessions
+        avg_ai_probability = ai_summary["ai_probability"] / total_sessions
+        avg_quality_score = ai_summary["quality_score"] / total_sessions
+        avg_productivity = ai_summary["productivity_score"] / total_sessions
         
         # 效率分布
-        efficiency_ratings = [log['ai_metrics']['efficiency_rating'] for log in enhanced_logs]
-        rating_counts = {}
-        for rating in efficiency_ratings:
-            rating_counts[rating] = rating_counts.get(rating, 0) + 1
+        rating_counts = ai_summary["ratings"]
         
         # 代码质量分析
         quality_indicators = {
-            'with_comments': sum(1 for log in enhanced_logs if log['ai_metrics']['has_comments']),
-            'with_error_handling': sum(1 for log in enhanced_logs if log['ai_metrics']['has_error_handling']),
-            'with_type_annotations': sum(1 for log in enhanced_logs if log['ai_metrics']['has_type_annotations'])
+            'with_comments': ai_summary["has_comments"],
+            'with_error_handling': ai_summary["has_error_handling"],
+            'with_type_annotations': ai_summary["has_type_annotations"]
         }
         
         # 工具使用分布
-        tool_usage = {}
-        for log in enhanced_logs:
-            tool = log['tool_name']
-            tool_usage[tool] = tool_usage.get(tool, 0) + 1
+        tool_usage = ai_summary["tools"]
         
         # 生成报告
         report = f"""
@@ -747,7 +1284,7 @@ class UsageTracker:
   • 编程会话总数：{total_sessions} 次
   • 代码行数生成：{total_lines} 行
   • 文件修改总数：{total_files} 个
-  • 平均会话时长：{sum(log['ai_metrics']['session_duration'] for log in enhanced_logs) / total_sessions:.1f} 分钟
+  • 平均会话时长：{ai_summary["session_duration"] / total_sessions:.1f} 分钟
 
 🎯 AI使用效果
   • AI辅助概率：{avg_ai_probability:.1%}
@@ -775,7 +1312,7 @@ class UsageTracker:
             report += f"  • {tool}：{count} 次 ({percentage:.1%})\n"
         
         # 添加改进建议
-        suggestions = self._generate_ai_programming_suggestions(enhanced_logs, avg_quality_score, avg_ai_probability)
+        suggestions = self._generate_ai_programming_suggestions(ai_summary, avg_quality_score, avg_ai_probability)
         if suggestions:
             report += f"""
 💡 改进建议
@@ -784,7 +1321,7 @@ class UsageTracker:
         
         return report
     
-    def _generate_ai_programming_suggestions(self, enhanced_logs: List[Dict], avg_quality: float, avg_ai_prob: float) -> str:
+    def _generate_ai_programming_suggestions(self, ai_summary: Dict[str, Any], avg_quality: float, avg_ai_prob: float) -> str:
         """生成AI编程改进建议"""
         suggestions = []
         
@@ -799,13 +1336,11 @@ class UsageTracker:
             suggestions.append("  • AI使用率较低，可以尝试更多AI辅助功能")
         
         # 效率建议
-        low_productivity_sessions = [log for log in enhanced_logs if log['ai_metrics']['productivity_score'] < 0.3]
-        if len(low_productivity_sessions) > len(enhanced_logs) * 0.3:
+        if ai_summary["low_productivity"] > ai_summary["sessions"] * 0.3:
             suggestions.append("  • 部分会话生产力较低，建议优化开发流程")
         
         # 复杂度建议
-        high_complexity_sessions = [log for log in enhanced_logs if log['ai_metrics']['complexity_added'] > 20]
-        if high_complexity_sessions:
+        if ai_summary["high_complexity"]:
             suggestions.append("  • 注意控制代码复杂度，考虑重构复杂的代码块")
         
         return "\n".join(suggestions) if suggestions else "  • 当前开发效果良好，继续保持！" 
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Monorepo workspace 识别模块
+从 pnpm-workspace.yaml、package.json 的 workspaces 字段和 lerna.json 中读取包的匹配模式，
+展开为各个 workspace 包目录；组件索引按包分片，各包可以并发扫描，也可以只查询部分包
+"""
+
+import os
+import json
+import fnmatch
+import logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Iterable, NamedTuple, Optional, Set, Tuple
+
+from .component_scanner import walk_component_files, walk_directories, is_excluded_dir
+
+logger = logging.getLogger(__name__)
+
+# 并发扫描各个包的最大线程数
+WORKSPACE_SCAN_THREADS = 8
+
+# lerna.json 未写 packages 时的默认值
+LERNA_DEFAULT_PACKAGES = ["packages/*"]
+
+
+class WorkspacePackage(NamedTuple):
+    """单个 workspace 包：包名（package.json 的 name，缺省为相对路径）、相对路径、目录"""
+    name: str
+    rel_path: str
+    path: Path
+
+
+def _parse_pnpm_workspace(text: str) -> List[str]:
+    """解析 pnpm-workspace.yaml 中的 packages 列表（只支持该文件常见的简单写法）"""
+    patterns: List[str] = []
+    in_packages = False
+    for raw_line in text.splitlines():
+        line = raw_line.split(" #", 1)[0].rstrip()
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        if not line[0].isspace():
+            key, _, value = stripped.partition(":")
+            in_packages = key.strip() == "packages"
+            value = value.strip()
+            # 行内写法：packages: ['packages/*', 'apps/*']
+            if in_packages and value.startswith("["):
+                patterns.extend(item.strip().strip("'\"") for item in value.strip("[]").split(","))
+                in_packages = False
+            continue
+
+        if in_packages and stripped.startswith("-"):
+            patterns.append(stripped[1:].strip().strip("'\""))
+
+    return [pattern for pattern in patterns if pattern]
+
+
+def _read_json(file_path: Path) -> Optional[dict]:
+    """读取 JSON 文件，不存在或格式错误时返回 None"""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"无法读取 {file_path}: {e}")
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def workspace_patterns(root: Path) -> List[str]:
+    """收集项目根目录下各种 workspace 配置中的包匹配模式（去重并保持顺序）"""
+    patterns: List[str] = []
+
+    try:
+        text = (root / "pnpm-workspace.yaml").read_text(encoding="utf-8")
+        patterns.extend(_parse_pnpm_workspace(text))
+    except FileNotFoundError:
+        pass
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"无法读取 pnpm-workspace.yaml: {e}")
+
+    package_json = _read_json(root / "package.json") or {}
+    workspaces = package_json.get("workspaces")
+    if isinstance(workspaces, dict):
+        # yarn 的写法：{"packages": [...], "nohoist": [...]}
+        workspaces = workspaces.get("packages")
+    if isinstance(workspaces, list):
+        patterns.extend(item for item in workspaces if isinstance(item, str))
+
+    lerna_json = _read_json(root / "lerna.json")
+    if lerna_json is not None:
+        lerna_packages = lerna_json.get("packages", LERNA_DEFAULT_PACKAGES)
+        if isinstance(lerna_packages, list):
+            patterns.extend(item for item in lerna_packages if isinstance(item, str))
+
+    return list(dict.fromkeys(pattern.strip().rstrip("/") for pattern in patterns if pattern.strip()))
+
+
+def _expand_pattern(root: Path, pattern: str) -> Set[Path]:
+    """展开单个目录匹配模式（支持 *、? 等通配符和 **），跳过 node_modules 等排除目录"""
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+
+    candidates = [root]
+    for segment in pattern.split("/"):
+        if not segment or segment == ".":
+            continue
+
+        expanded: List[Path] = []
+        for base in candidates:
+            if segment == "**":
+                expanded.extend(walk_directories(base))
+            elif any(char in segment for char in "*?["):
+                try:
+                    with os.scandir(base) as it:
+                        for entry in it:
+                            if (entry.is_dir() and not is_excluded_dir(entry.name)
+                                    and fnmatch.fnmatchcase(entry.name, segment)):
+                                expanded.append(Path(entry.path))
+                except OSError:
+                    continue
+            else:
+                candidate = base / segment
+                if candidate.is_dir():
+                    expanded.append(candidate)
+        candidates = expanded
+
+    return set(candidates)
+
+
+def detect_workspace_packages(root: Path) -> List[WorkspacePackage]:
+    """
+    识别项目中的 workspace 包
+
+    Returns:
+        按相对路径排序的包列表；不是 monorepo（没有 workspace 配置或没有匹配的包）时为空列表
+    """
+    patterns = workspace_patterns(root)
+    if not patterns:
+        return []
+
+    included: Set[Path] = set()
+    excluded: Set[Path] = set()
+    for pattern in patterns:
+        if pattern.startswith("!"):
+            excluded |= _expand_pattern(root, pattern[1:])
+        else:
+            included |= _expand_pattern(root, pattern)
+
+    packages = []
+    for path in included - excluded:
+        if path == root or not (path / "package.json").is_file():
+            continue
+        rel_path = path.relative_to(root).as_posix()
+        name = (_read_json(path / "package.json") or {}).get("name")
+        packages.append(WorkspacePackage(name if isinstance(name, str) and name else rel_path, rel_path, path))
+
+    packages.sort(key=lambda package: package.rel_path)
+    return packages
+
+
+def select_packages(
+    packages: List[WorkspacePackage], selectors: Iterable[str]
+) -> Tuple[List[WorkspacePackage], List[str]]:
+    """
+    按包名或相对路径选择包（支持通配符，如 "@scope/*"、"apps/*"）
+
+    Returns:
+        (选中的包, 没有匹配任何包的选择条件)
+    """
+    selected: Dict[str, WorkspacePackage] = {}
+    unknown = []
+    for selector in selectors:
+        selector = selector.strip().rstrip("/")
+        matches = [
+            package for package in packages
+            if fnmatch.fnmatchcase(package.name, selector) or fnmatch.fnmatchcase(package.rel_path, selector)
+        ]
+        if not matches:
+            unknown.append(selector)
+        for package in matches:
+            selected[package.rel_path] = package
+
+    return sorted(selected.values(), key=lambda package: package.rel_path), unknown
+
+
+def nested_package_dirs(root: Path, package_dirs: Iterable[Path]) -> Set[str]:
+    """root 之下（不含 root 自身）的其他包目录，扫描 root 时需要跳过"""
+    prefix = str(root).rstrip(os.sep) + os.sep
+    return {str(path) for path in package_dirs if str(path).startswith(prefix)}
+
+
+def walk_workspace_files(
+    root: Path,
+    packages: List[WorkspacePackage],
+    scope: Optional[List[WorkspacePackage]] = None,
+    stats: Optional[Dict[str, int]] = None
+) -> List[Path]:
+    """
+    并发扫描各个包中的组件文件
+
+    Args:
+        root: monorepo 根目录
+        packages: 全部 workspace 包
+        scope: 只扫描这些包（默认扫描全部包以及不属于任何包的根目录文件）
+        stats: 传入时累加扫描计数
+
+    Returns:
+        排序后的组件文件路径列表
+    """
+    package_dirs = [package.path for package in packages]
+    targets = [package.path for package in (scope if scope is not None else packages)]
+    if scope is None:
+        targets.append(root)
+
+    def walk(target: Path) -> Tuple[List[Path], Dict[str, int]]:
+        target_stats: Dict[str, int] = {}
+        files = walk_component_files(
+            target, skip_paths=nested_package_dirs(target, package_dirs), stats=target_stats
+        )
+        return files, target_stats
+
+    results: List[Path] = []
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(WORKSPACE_SCAN_THREADS, len(targets))), thread_name_prefix="workspace-scan"
+    ) as executor:
+        for files, target_stats in executor.map(walk, targets):
+            results.extend(files)
+            if stats is not None:
+                for name, value in target_stats.items():
+                    stats[name] = stats.get(name, 0) + value
+
+    results.sort()
+    return results
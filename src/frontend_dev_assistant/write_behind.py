@@ -0,0 +1,300 @@
+"""
+后台批量写入模块
+使用统计和调用记录先放入有界的内存队列，由后台写入线程攒成一批
+（达到批量大小或超过刷新间隔）后一次写入，工具调用不再等待文件或数据库写入；
+队列满时按配置丢弃、阻塞等待或溢出到磁盘文件，退出时写完队列中剩余的记录
+"""
+
+import os
+import json
+import queue
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 队列容量、满时的处理方式
+WRITE_QUEUE_SIZE_ENV = 'FRONTEND_DEV_ASSISTANT_WRITE_QUEUE_SIZE'
+WRITE_QUEUE_POLICY_ENV = 'FRONTEND_DEV_ASSISTANT_WRITE_QUEUE_POLICY'
+DEFAULT_QUEUE_SIZE = 1000
+QUEUE_POLICIES = ('drop', 'block', 'spill')
+DEFAULT_QUEUE_POLICY = 'spill'
+
+# 每批最多写入的记录数，以及第一条记录入队后最多等待多久写入（秒）
+WRITE_BATCH_SIZE = 100
+WRITE_INTERVAL = 0.2
+
+# 退出时等待写入线程写完的最长时间（秒）
+CLOSE_TIMEOUT = 10.0
+
+# 队列结束标记
+_STOP = object()
+
+
+def resolve_queue_size(size: Optional[int] = None) -> int:
+    """确定队列容量：参数 > 环境变量 > 默认值"""
+    if size is not None:
+        return max(int(size), 1)
+    env_value = os.environ.get(WRITE_QUEUE_SIZE_ENV, '').strip()
+    if not env_value:
+        return DEFAULT_QUEUE_SIZE
+    try:
+        return max(int(env_value), 1)
+    except ValueError:
+        logger.warning(f"{WRITE_QUEUE_SIZE_ENV}={env_value} 不是有效的容量，使用默认值")
+        return DEFAULT_QUEUE_SIZE
+
+
+def resolve_queue_policy(policy: Optional[str] = None) -> str:
+    """确定队列满时的处理方式：参数 > 环境变量 > 默认值"""
+    if policy is None:
+        policy = os.environ.get(WRITE_QUEUE_POLICY_ENV, '')
+    policy = str(policy).strip().lower()
+    if not policy:
+        return DEFAULT_QUEUE_POLICY
+    if policy not in QUEUE_POLICIES:
+        logger.warning(f"{WRITE_QUEUE_POLICY_ENV}={policy} 无效，使用 {DEFAULT_QUEUE_POLICY}")
+        return DEFAULT_QUEUE_POLICY
+    return policy
+
+
+class WriteBehindQueue:
+    def __init__(
+        self,
+        name: str,
+        write_batch: Callable[[List[Dict[str, Any]]], None],
+        spill_path: Optional[Path] = None,
+        max_size: Optional[int] = None,
+        policy: Optional[str] = None
+    ):
+        """
+        初始化写入队列（写入线程在第一条记录入队时才启动）
+
+        Args:
+            name: 队列名称（线程名和日志中使用）
+            write_batch: 写入一批记录的函数，在写入线程中调用
+            spill_path: 溢出文件路径（policy 为 spill 时使用，记录需可 JSON 序列化）
+            max_size: 队列容量，默认读取环境变量 FRONTEND_DEV_ASSISTANT_WRITE_QUEUE_SIZE
+            policy: 队列满时的处理方式（drop / block / spill），默认读取环境变量 FRONTEND_DEV_ASSISTANT_WRITE_QUEUE_POLICY
+        """
+        self.name = name
+        self.policy = resolve_queue_policy(policy)
+        if self.policy == 'spill' and spill_path is None:
+            self.policy = 'block'
+        self.spill_path = Path(spill_path) if spill_path is not None else None
+
+        self._write_batch = write_batch
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=resolve_queue_size(max_size))
+        self._lock = threading.Lock()
+        # 补写溢出文件时持有，写入线程和 wait_idle 不会重复补写
+        self._replay_lock = threading.Lock()
+        # 每次调用 write_batch 时持有：写入线程、补写溢出文件和关闭后的同步写入不会同时写入
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # 丢弃和溢出到磁盘的记录数
+        self.dropped = 0
+        self.spilled = 0
+
+    def put(self, item: Dict[str, Any]) -> bool:
+        """
+        放入一条记录（不等待写入）
+
+        Returns:
+            记录是否会被写入（drop 策略下队列满时为 False）
+        """
+        if self._closed:
+            # 已经关闭：直接同步写入，不丢失记录
+            self._write([item])
+            return True
+
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+
+        if self.policy == 'block':
+            self._queue.put(item)
+            return True
+        if self.policy == 'spill' and self._spill(item):
+            return True
+
+        self.dropped += 1
+        if self.dropped == 1 or self.dropped % 1000 == 0:
+            logger.warning(f"{self.name} 写入队列已满，已丢弃 {self.dropped} 条记录")
+        return False
+
+    async def put_async(self, item: Dict[str, Any]) -> bool:
+        """
+        在事件循环中放入一条记录：block 策略下队列满时在线程池中等待写入线程腾出空间，
+        不阻塞事件循环（其他策略不会等待，直接调用 put）
+        """
+        if self.policy != 'block':
+            return self.put(item)
+        if not self._closed:
+            self._ensure_thread()
+            try:
+                self._queue.put_nowait(item)
+                return True
+            except queue.Full:
+                pass
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.put, item)
+
+    def wait_idle(self) -> None:
+        """等待已入队的记录全部写入（读取统计前调用，保证能看到刚记录的数据）"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+        self._replay_spill()
+
+    async def wait_idle_async(self) -> None:
+        """在事件循环中等待已入队的记录全部写入（在线程池中等待，不阻塞其他工具调用）"""
+        if self._queue.unfinished_tasks == 0 and not self._has_spill():
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.wait_idle)
+
+    def close(self, timeout: float = CLOSE_TIMEOUT) -> None:
+        """写完队列中剩余的记录（包括溢出文件）并停止写入线程"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(f"{self.name} 写入线程未能在 {timeout} 秒内写完剩余记录")
+        self._replay_spill()
+
+    def _ensure_thread(self) -> None:
+        """按需启动写入线程"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name=f"{self.name}-writer", daemon=True)
+                self._thread.start()
+                # 进程正常退出时写完剩余记录（服务退出时会先显式关闭）
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        """写入线程：攒够一批或超过刷新间隔后写入，空闲时补写溢出文件中的记录"""
+        stop = False
+        while not stop:
+            try:
+                item = self._queue.get(timeout=WRITE_INTERVAL)
+            except queue.Empty:
+                self._replay_spill()
+                continue
+
+            batch: List[Dict[str, Any]] = []
+            deadline = time.monotonic() + WRITE_INTERVAL
+            while True:
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= WRITE_BATCH_SIZE:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        """写入一批记录（失败时记录日志并返回 False，不影响之后的写入）"""
+        try:
+            with self._write_lock:
+                self._write_batch(batch)
+            return True
+        except Exception as e:
+            logger.warning(f"{self.name} 写入 {len(batch)} 条记录失败: {e}")
+            return False
+
+    def _spill(self, item: Dict[str, Any]) -> bool:
+        """队列满时把记录追加到溢出文件"""
+        try:
+            line = json.dumps(item, ensure_ascii=False, default=str) + "\n"
+            with self._lock:
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                self.spilled += 1
+            return True
+        except Exception as e:
+            logger.warning(f"{self.name} 写入溢出文件失败: {e}")
+            return False
+
+    def _replay_path(self) -> Path:
+        """补写时溢出文件改名后的路径（带进程号）"""
+        return self.spill_path.with_name(f"{self.spill_path.name}.{os.getpid()}.replay")
+
+    def _has_spill(self) -> bool:
+        """是否有溢出到磁盘、尚未补写的记录"""
+        if self.spill_path is None:
+            return False
+        return self.spill_path.exists() or self._replay_path().exists()
+
+    def _replay_spill(self) -> None:
+        """把溢出文件中的记录分批写入并删除溢出文件"""
+        if self.spill_path is None:
+            return
+
+        # 先改名再读取，读取期间新溢出的记录写入新的溢出文件；
+        # 改名后的文件名带进程号，多个服务进程共用数据目录时不会重复补写
+        replay_path = self._replay_path()
+        with self._replay_lock:
+            if not replay_path.exists():
+                with self._lock:
+                    try:
+                        os.replace(self.spill_path, replay_path)
+                    except FileNotFoundError:
+                        return
+
+            # 某一批写入失败时停止补写，这一批和之后的记录留在补写文件中，下次再补写
+            batch: List[Dict[str, Any]] = []
+            lines: List[str] = []
+            remaining: Optional[List[str]] = None
+            try:
+                with open(replay_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            batch.append(json.loads(line))
+                        except ValueError:
+                            continue
+                        lines.append(line)
+                        if len(batch) >= WRITE_BATCH_SIZE:
+                            if not self._write(batch):
+                                remaining = lines + list(f)
+                                break
+                            batch, lines = [], []
+                    else:
+                        if batch and not self._write(batch):
+                            remaining = lines
+
+                if remaining is None:
+                    replay_path.unlink()
+                    return
+                tmp_path = replay_path.with_name(replay_path.name + ".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.writelines(remaining)
+                os.replace(tmp_path, replay_path)
+                logger.warning(f"{self.name} 补写溢出文件中断，{len(remaining)} 条记录保留在 {replay_path.name}")
+            except OSError as e:
+                logger.warning(f"{self.name} 补写溢出文件失败: {e}")
@@ -20,6 +20,7 @@ from frontend_dev_assistant.prompt_manager import PromptManager
 from frontend_dev_assistant.component_finder import ComponentFinder
 from frontend_dev_assistant.usage_tracker import UsageTracker
 from frontend_dev_assistant.call_tracker import call_tracker
+from frontend_dev_assistant.scan_diagnostics import ScanDiagnostics
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
@@ -153,12 +154,66 @@ class FrontendDevMCP:
                                 "type": "array",
                                 "items": {"type": "string"},
                                 "description": "搜索关键词"
+                            },
+                            "workers": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "description": "并行分析组件的进程数（可选，默认读取 FRONTEND_DEV_ASSISTANT_WORKERS，未设置则串行）"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "maximum": 50,
+                                "description": "每页返回的组件数（可选，默认有过滤条件时8个、否则10个）"
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "minimum": 0,
+                                "description": "跳过前多少个结果（可选）"
+                            },
+                            "cursor": {
+                                "type": "string",
+                                "description": "上一页结果中给出的翻页游标（可选，优先于 offset）"
+                            },
+                            "packages": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "monorepo 中只查询这些 workspace 包（包名或相对路径，支持通配符如 @scope/*、apps/*；可选）"
+                            },
+                            "diagnostics": {
+                                "type": "boolean",
+                                "description": "是否在结果末尾附加诊断信息（各阶段耗时、文件计数、最慢的文件）",
+                                "default": False
                             }
                         },
                         "required": ["project_path"]
                     }
                 ),
                 
+                types.Tool(
+                    name="find_component_usages",
+                    description="查找项目中使用了某个组件的文件（import 语句和模板中的组件标签）",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "project_path": {
+                                "type": "string",
+                                "description": "项目根目录路径"
+                            },
+                            "component": {
+                                "type": "string",
+                                "description": "组件名（如 UserCard、user-card）或组件文件路径（可以只写结尾部分，如 components/UserCard.vue）"
+                            },
+                            "packages": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "monorepo 中只在这些 workspace 包里查找该组件（引用方不受限制；可选）"
+                            }
+                        },
+                        "required": ["project_path", "component"]
+                    }
+                ),
+                
                 types.Tool(
                     name="track_usage",
                     description="记录MCP工具使用情况",
@@ -243,10 +298,36 @@ class FrontendDevMCP:
                     )
                     
                 elif name == "find_reusable_components":
+                    diagnostics = ScanDiagnostics()
                     result = await self.component_finder.find_reusable_components(
                         project_path=arguments.get("project_path"),
                         component_type=arguments.get("component_type"),
-                        search_keywords=arguments.get("search_keywords", [])
+                        search_keywords=arguments.get("search_keywords", []),
+                        workers=arguments.get("workers"),
+                        limit=arguments.get("limit"),
+                        offset=arguments.get("offset"),
+                        cursor=arguments.get("cursor"),
+                        packages=arguments.get("packages"),
+                        diagnostics=diagnostics
+                    )
+                    if arguments.get("diagnostics"):
+                        result = f"{result}\n\n{diagnostics.format()}"
+                    
+                    # 各阶段耗时和计数写入调用追踪记录
+                    await call_tracker.record_call(
+                        tool_name=name,
+                        arguments=arguments,
+                        execution_time=diagnostics.total_seconds,
+                        success=not str(result).startswith("❌"),
+                        result_size=len(str(result).encode('utf-8')),
+                        diagnostics=diagnostics.to_dict()
+                    )
+                    
+                elif name == "find_component_usages":
+                    result = await self.component_finder.find_component_usages(
+                        project_path=arguments.get("project_path"),
+                        component=arguments.get("component", ""),
+                        packages=arguments.get("packages")
                     )
                     
                 elif name == "track_usage":
@@ -270,7 +351,7 @@ class FrontendDevMCP:
                     )
                     
                 else:
-                    result = f"❌ 未知工具: {name}\n\n可用工具：get_prompt_template, find_reusable_components, track_usage, get_usage_stats"
+                    result = f"❌ 未知工具: {name}\n\n可用工具：get_prompt_template, find_reusable_components, find_component_usages, track_usage, get_usage_stats"
                 
                 # 记录工具使用
                 await self.usage_tracker.log_tool_call(name, arguments)
@@ -292,18 +373,25 @@ async def main():
     mcp_app = FrontendDevMCP()
     
     # 使用stdio传输
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await mcp_app.server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="frontend-dev-assistant",
-                server_version="1.0.0",
-                capabilities=types.ServerCapabilities(
-                    tools=types.ToolsCapability(listChanged=False)
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await mcp_app.server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="frontend-dev-assistant",
+                    server_version="1.0.0",
+                    capabilities=types.ServerCapabilities(
+                        tools=types.ToolsCapability(listChanged=False)
+                    )
                 )
             )
-        )
+    finally:
+        # 释放组件扫描使用的线程池和进程池
+        mcp_app.component_finder.shutdown()
+        # 写完队列中尚未写入的使用统计和调用记录
+        mcp_app.usage_tracker.close()
+        call_tracker.close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
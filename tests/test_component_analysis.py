@@ -0,0 +1,56 @@
+"""
+组件文件分析测试
+.vue 单文件组件同时包含 <template> 和 <script>（包括 <script setup>）时才计为UI组件
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from frontend_dev_assistant.component_finder import ComponentFinder
+
+SCRIPT_SETUP_TS = """<script setup lang="ts">
+import { h } from 'vue'
+defineProps<{ title: string }>()
+</script>
+"""
+
+TEMPLATE_ONLY = """<template>
+  <div class="empty-state">暂无数据</div>
+</template>
+"""
+
+TEMPLATE_WITH_SCRIPT_SETUP_TS = TEMPLATE_ONLY + SCRIPT_SETUP_TS
+
+
+@pytest.fixture
+def finder(tmp_path):
+    finder = ComponentFinder(data_dir=tmp_path / "data", watch="0")
+    yield finder
+    finder.shutdown()
+
+
+def _analyze(finder: ComponentFinder, directory: Path, name: str, source: str):
+    path = directory / "src" / "components" / f"{name}.vue"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source, encoding="utf-8")
+    return finder._analyze_component_file(path)
+
+
+def test_script_setup_only_sfc_is_not_a_component(finder, tmp_path):
+    assert _analyze(finder, tmp_path, "title-renderer", SCRIPT_SETUP_TS) is None
+
+
+def test_template_only_sfc_is_not_a_component(finder, tmp_path):
+    assert _analyze(finder, tmp_path, "empty-state", TEMPLATE_ONLY) is None
+
+
+def test_template_with_script_setup_ts_is_a_component(finder, tmp_path):
+    component = _analyze(finder, tmp_path, "empty-state", TEMPLATE_WITH_SCRIPT_SETUP_TS)
+    assert component is not None
+    assert component.name == "EmptyState"
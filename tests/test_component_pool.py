@@ -0,0 +1,52 @@
+"""
+并行分析进程池测试
+并发的扫描使用不同的进程数时，各自的进程池互不影响
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from frontend_dev_assistant.component_finder import ComponentFinder, PARALLEL_MIN_FILES
+
+VUE_SOURCE = "<template><div class=\"{name}\"/></template>\n<script>export default {{ name: '{name}' }}</script>\n"
+
+
+def _write_components(project: Path, count: int) -> list:
+    directory = project / "src" / "components"
+    directory.mkdir(parents=True)
+    files = []
+    for i in range(count):
+        path = directory / f"Widget{i}.vue"
+        path.write_text(VUE_SOURCE.format(name=f"Widget{i}"), encoding="utf-8")
+        files.append((path, path.stat()))
+    return files
+
+
+def test_concurrent_scans_with_different_worker_counts(tmp_path, caplog):
+    files = _write_components(tmp_path / "project", PARALLEL_MIN_FILES * 2)
+    finder = ComponentFinder(data_dir=tmp_path / "data", watch="0")
+    results = {}
+
+    def scan(workers):
+        results[workers] = finder._analyze_files(files, workers)
+
+    try:
+        threads = [threading.Thread(target=scan, args=(workers,)) for workers in (2, 3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+        pools = dict(finder._pools)
+    finally:
+        finder.shutdown()
+
+    assert "并行分析失败" not in caplog.text
+    # 两个进程池都保留下来（没有因为进程数不同而关闭另一个扫描正在使用的进程池）
+    assert sorted(pools) == [2, 3]
+    for workers in (2, 3):
+        assert [component.name for component in results[workers]] == [f"Widget{i}" for i in range(len(files))]
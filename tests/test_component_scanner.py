@@ -0,0 +1,30 @@
+"""
+组件文件查找测试
+git ls-files 没有找到组件文件时，也要计入看过和排除的文件数
+"""
+
+import sys
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from frontend_dev_assistant.component_scanner import git_component_files
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="需要 git")
+def test_git_stats_counted_without_components(tmp_path):
+    (tmp_path / "README.md").write_text("# demo\n", encoding="utf-8")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    subprocess.run(["git", "init", "-q"], cwd=str(tmp_path), check=True)
+
+    stats = {}
+    assert git_component_files(tmp_path, stats) == []
+    assert stats["files_seen"] == 2
+    assert stats["files_excluded"] == 2
@@ -0,0 +1,91 @@
+"""
+组件文件监听测试
+监听中的项目在文件变化后立即查询，结果应当反映刚才的变化
+"""
+
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from frontend_dev_assistant.component_finder import ComponentFinder
+from frontend_dev_assistant.component_watcher import ComponentWatcher
+
+VUE_SOURCE = "<template><div class=\"{name}\"/></template>\n<script>export default {{ name: '{name}' }}</script>\n"
+
+
+def _write_component(project: Path, name: str) -> Path:
+    path = project / "src" / "components" / f"{name}.vue"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(VUE_SOURCE.format(name=name), encoding="utf-8")
+    return path
+
+
+def _wait_hot(finder: ComponentFinder, project: Path, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not finder._watcher.is_hot(project):
+        assert time.monotonic() < deadline, "监听未能在限定时间内完成首次同步"
+        time.sleep(0.05)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify 仅在 Linux 上可用")
+def test_query_right_after_delete_does_not_return_deleted_component(tmp_path):
+    project = tmp_path / "project"
+    _write_component(project, "UserCard")
+    doomed = _write_component(project, "OrderTable")
+    finder = ComponentFinder(data_dir=tmp_path / "data", watch="1")
+
+    # 带过滤条件的查询才会建立监听（不过滤的浏览只分析一页）
+    keywords = ["UserCard", "OrderTable"]
+
+    async def run():
+        await finder.find_reusable_components(str(project), search_keywords=keywords)
+        _wait_hot(finder, project)
+        doomed.unlink()
+        return await finder.find_reusable_components(str(project), search_keywords=keywords)
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        finder.shutdown()
+
+    assert "UserCard" in result
+    assert "OrderTable" not in result
+
+
+def test_flush_waits_for_in_flight_update(tmp_path):
+    started = threading.Event()
+    release = threading.Event()
+    applied = []
+
+    def on_change(root, paths):
+        started.set()
+        release.wait(5)
+        applied.append(paths)
+
+    watcher = ComponentWatcher(on_change, use_inotify=False)
+    try:
+        watcher.watch(tmp_path)
+        # 监听线程建立监听后进行首次整体同步，在回调中停住
+        assert started.wait(5)
+
+        flushed = threading.Event()
+        thread = threading.Thread(target=lambda: (watcher.flush(tmp_path), flushed.set()))
+        thread.start()
+        # 首次同步还没有完成，flush 必须等待
+        assert not flushed.wait(0.3)
+
+        release.set()
+        thread.join(5)
+        assert flushed.is_set()
+        assert applied == [None]
+    finally:
+        release.set()
+        watcher.stop()
@@ -0,0 +1,140 @@
+"""
+使用统计存储方式一致性测试
+同样的使用记录分别写入 JSON 和 SQLite 存储，统计报告应当相同
+"""
+
+import re
+import sys
+import json
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from frontend_dev_assistant.usage_tracker import UsageTracker
+from frontend_dev_assistant.usage_event_log import SegmentedEventLog
+
+
+def _write_legacy_stats(data_dir: Path, calls: int, step_hours: int = 1) -> None:
+    """写入旧版格式的统计文件（调用记录保存在 usage_logs 中，每条间隔 step_hours 小时）"""
+    now = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+    logs = []
+    for i in range(calls):
+        timestamp = now - timedelta(hours=i * step_hours)
+        logs.append({
+            "id": str(i), "tool_name": f"tool{min(i % 7, 3)}", "timestamp": timestamp.isoformat(),
+            "date": timestamp.strftime('%Y-%m-%d'), "arguments": {}, "user_id": f"user{min(i % 5, 2)}"
+        })
+    logs.reverse()
+    data_dir.mkdir(parents=True, exist_ok=True)
+    (data_dir / "usage_stats.json").write_text(json.dumps({
+        "metadata": {"created_at": logs[0]["timestamp"], "version": "1.0.0"},
+        "tool_usage": {}, "user_feedback": [], "usage_logs": logs, "daily_stats": {}
+    }), encoding="utf-8")
+
+
+def _normalize(report: str) -> list:
+    """去掉排名序号后按行排序（次数相同的条目、每日的工具明细在两种存储中的顺序可能不同）"""
+    return sorted(re.sub(r"^\d+\. ", "", line.strip()) for line in report.splitlines())
+
+
+def _report(backend: str, date_range: str = "all", retention_days: int = 0) -> str:
+    async def run():
+        tracker = UsageTracker(backend=backend, retention_days=retention_days, segment_period="day")
+        try:
+            return await tracker.get_stats(date_range)
+        finally:
+            tracker.close()
+
+    return asyncio.run(run())
+
+
+def _record_sessions(backend: str, feedbacks) -> str:
+    """按顺序记录AI编程会话（feedbacks 中每一项对应一次会话的反馈），返回全部时间的统计报告"""
+    async def run():
+        tracker = UsageTracker(backend=backend, retention_days=0)
+        try:
+            for feedback in feedbacks:
+                await tracker.track_usage(
+                    "generate_vue_component",
+                    feedback,
+                    "表格组件",
+                    {"duration_minutes": 10, "files_modified": 2},
+                    {"lines_added": 40, "ai_probability": 0.5},
+                    {"quality_score": 70, "has_comments": True}
+                )
+            return await tracker.get_stats("all")
+        finally:
+            tracker.close()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("feedbacks", [
+    [None, None],
+    ["good", None, "excellent"],
+])
+def test_json_and_sqlite_report_same_sessions(tmp_path, monkeypatch, feedbacks):
+    reports = {}
+    for backend in ("json", "sqlite"):
+        monkeypatch.setenv("FRONTEND_DEV_ASSISTANT_DATA_DIR", str(tmp_path / backend))
+        reports[backend] = _record_sessions(backend, feedbacks)
+
+    sessions = f"编程会话总数：{len(feedbacks)} 次"
+    assert sessions in reports["json"]
+    assert sessions in reports["sqlite"]
+    # AI编程效果部分应当完全相同（基础统计中次数相同的条目顺序可能不同）
+    ai_reports = {backend: report.split("📊 工具使用基础统计")[0] for backend, report in reports.items()}
+    assert ai_reports["json"] == ai_reports["sqlite"]
+
+
+def test_sessions_without_feedback_survive_restart(tmp_path, monkeypatch):
+    monkeypatch.setenv("FRONTEND_DEV_ASSISTANT_DATA_DIR", str(tmp_path))
+    _record_sessions("json", [None, None])
+
+    report = _record_sessions("json", [])
+    assert "编程会话总数：2 次" in report
+
+
+def test_sqlite_imports_legacy_stats_without_event_segments(tmp_path, monkeypatch, capsys):
+    reports = {}
+    for backend in ("json", "sqlite"):
+        data_dir = tmp_path / backend
+        _write_legacy_stats(data_dir, 120)
+        monkeypatch.setenv("FRONTEND_DEV_ASSISTANT_DATA_DIR", str(data_dir))
+        reports[backend] = _report(backend)
+
+    output = capsys.readouterr().out
+    assert "已将 120 条调用记录迁移到 usage_events" in output
+    assert "已将 120 条调用记录迁移到 usage.db" in output
+    assert output.count("已将 120 条调用记录迁移") == 2
+    assert not (tmp_path / "sqlite" / "usage_events").exists()
+    assert "**总调用次数**: 120" in reports["sqlite"]
+    assert _normalize(reports["json"]) == _normalize(reports["sqlite"])
+
+
+def test_interrupted_compaction_does_not_double_count(tmp_path, monkeypatch):
+    monkeypatch.setenv("FRONTEND_DEV_ASSISTANT_DATA_DIR", str(tmp_path))
+    # 120 条调用记录分布在最近60天，保留30天时约一半需要归档
+    _write_legacy_stats(tmp_path, 120, step_hours=12)
+
+    def fail(self, key, archive_path):
+        raise OSError("disk full")
+
+    # 每日汇总已经保存，归档分段时中途退出
+    with monkeypatch.context() as patch:
+        patch.setattr(SegmentedEventLog, "archive_segment", fail)
+        interrupted = _report("json", retention_days=30)
+    assert (tmp_path / "usage_rollups.json").exists()
+    assert "**总调用次数**: 120" in interrupted
+
+    # 下次启动重新归档，已计入每日汇总的日期不再重复计数
+    report = _report("json", retention_days=30)
+    assert "**总调用次数**: 120" in report
+    assert _normalize(report) == _normalize(interrupted)
+    assert len(list((tmp_path / "usage_events").iterdir())) <= 31
@@ -0,0 +1,145 @@
+"""
+后台批量写入队列测试
+在事件循环中等待写入（队列满、等待写完）时，其他协程应当照常运行；
+补写溢出文件不会与正常的批量写入同时进行，写入失败的记录不会丢失
+"""
+
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+# 添加项目路径到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from frontend_dev_assistant.write_behind import WriteBehindQueue
+
+
+def _slow_queue(written, policy="block", max_size=1, delay=0.1):
+    """每批写入耗时 delay 秒的队列"""
+    def write_batch(batch):
+        time.sleep(delay)
+        written.extend(batch)
+
+    return WriteBehindQueue("test", write_batch, max_size=max_size, policy=policy)
+
+
+async def _count_ticks(stop: asyncio.Event, ticks: list) -> None:
+    """事件循环没有被阻塞时每10毫秒计数一次"""
+    while not stop.is_set():
+        ticks.append(time.monotonic())
+        await asyncio.sleep(0.01)
+
+
+def test_async_waits_do_not_block_event_loop():
+    written = []
+    writer = _slow_queue(written)
+
+    async def run():
+        stop = asyncio.Event()
+        ticks = []
+        ticker = asyncio.create_task(_count_ticks(stop, ticks))
+        start = time.monotonic()
+        for i in range(5):
+            await writer.put_async({"i": i})
+        await writer.wait_idle_async()
+        elapsed = time.monotonic() - start
+        stop.set()
+        await ticker
+        return elapsed, ticks
+
+    try:
+        elapsed, ticks = asyncio.run(run())
+    finally:
+        writer.close()
+
+    assert [item["i"] for item in written] == list(range(5))
+    # 写入期间事件循环一直在运行：计数次数与等待时长相当，没有长时间的间隔
+    assert len(ticks) >= elapsed / 0.01 / 2
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.08
+
+
+def test_wait_idle_async_returns_immediately_when_idle():
+    writer = _slow_queue([])
+
+    async def run():
+        start = time.monotonic()
+        await writer.wait_idle_async()
+        return time.monotonic() - start
+
+    try:
+        assert asyncio.run(run()) < 0.05
+    finally:
+        writer.close()
+
+
+def test_spill_replay_never_overlaps_batch_writes(tmp_path):
+    written = []
+    active = []
+    overlaps = []
+    guard = threading.Lock()
+
+    def write_batch(batch):
+        with guard:
+            active.append(1)
+            if len(active) > 1:
+                overlaps.append(len(batch))
+        # 写入比写入线程凑一批的等待时间更慢，补写期间写入线程会开始写下一批
+        time.sleep(0.25)
+        written.extend(batch)
+        with guard:
+            active.pop()
+
+    writer = WriteBehindQueue(
+        "test", write_batch, spill_path=tmp_path / "calls.spill.jsonl", max_size=2, policy="spill"
+    )
+    # 另一个线程一阵一阵地写入（队列满时溢出到磁盘），同时在当前线程等待写完（会补写溢出文件）；
+    # 每阵写入之间的停顿让等待返回并开始补写，补写期间下一阵写入已经开始
+    def produce():
+        for burst in range(6):
+            for i in range(burst * 50, burst * 50 + 50):
+                writer.put({"i": i})
+            time.sleep(0.3)
+
+    producer = threading.Thread(target=produce)
+    try:
+        producer.start()
+        while producer.is_alive():
+            writer.wait_idle()
+        producer.join()
+        writer.wait_idle()
+    finally:
+        writer.close()
+
+    assert writer.spilled > 0
+    assert overlaps == []
+    assert sorted(item["i"] for item in written) == list(range(300))
+
+
+def test_failed_replay_keeps_unwritten_records(tmp_path):
+    written = []
+    failing = [True]
+
+    def write_batch(batch):
+        if failing[0] and any(item["i"] >= 150 for item in batch):
+            raise OSError("disk full")
+        written.extend(batch)
+
+    spill_path = tmp_path / "calls.spill.jsonl"
+    spill_path.write_text("".join(f'{{"i": {i}}}\n' for i in range(300)), encoding="utf-8")
+    writer = WriteBehindQueue("test", write_batch, spill_path=spill_path, policy="spill")
+    try:
+        writer.wait_idle()
+        # 前一批写入成功，失败的一批及之后的记录保留下来
+        assert [item["i"] for item in written] == list(range(100))
+        assert writer._has_spill()
+
+        failing[0] = False
+        writer.wait_idle()
+    finally:
+        writer.close()
+
+    assert [item["i"] for item in written] == list(range(300))
+    assert not writer._has_spill()